@@ -1,13 +1,20 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Optional, List
-from app.core.video_generator import VideoGenerator
-from app.core.notion_client import NotionClient
-from app.core.google_sheets import GoogleSheetsClient
-from app.core.openai_client import OpenAIClient
-from app.core.elevenlabs_client import ElevenLabsClient
-from app.core.youtube_client import YouTubeClient
-from app.core.content_generator import ContentGenerator
+from typing import Any, Awaitable, Callable, Dict, Optional, List, Tuple
+from app.core.job_store import JOB_FAILED, JOB_QUEUED, get_job_store
+from app.core.script_package import ScriptPackage
+from app.core.youtube_quota import get_quota_ledger
+from app.core.stage_pipeline import PipelineStage, StageError, StageHandler, StagedPipeline, create_queue_backend
+from app.config import get_settings
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# 외부 API 클라이언트 모듈(googleapiclient, notion_client, openai, elevenlabs, ffmpeg, PIL)은
+# 가져오는 데 시간이 걸리므로 워커 기동을 늦추지 않도록 각 단계에서 처음 사용할 때 가져옴
 
 router = APIRouter()
 
@@ -18,68 +25,285 @@ class GenerateRequest(BaseModel):
     voice_id: Optional[str] = None
     style: Optional[str] = None
 
+class UploadRequest(BaseModel):
+    video_file: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    tags: List[str] = []
+
 class StatusResponse(BaseModel):
     job_id: str
     status: str
     progress: float
     message: Optional[str] = None
+    stage: Optional[str] = None
+    stages: List[Dict[str, Any]] = []
+    artifacts: Dict[str, Any] = {}
+    elapsed: Optional[float] = None
+
+# 단계 처리 함수: (다음 단계로 넘길 항목, 작업 저장소에 기록할 산출물) 반환
+StepHandler = Callable[[Dict[str, Any]], Awaitable[Tuple[Dict[str, Any], Dict[str, Any]]]]
+
+def _tracked(stage: str, handler: StepHandler) -> StageHandler:
+    """단계 처리 함수의 시작/완료/실패를 작업 저장소에 기록하도록 감쌉니다."""
+    async def run(item: Dict[str, Any]) -> Dict[str, Any]:
+        store = get_job_store(get_settings().job_store_path)
+        store.start_stage(item['job_id'], stage)
+        try:
+            item, artifacts = await handler(item)
+        except asyncio.CancelledError:
+            # 파이프라인이 멈추면서 처리 중이던 단계가 취소된 경우
+            logger.error(f"영상 생성 작업 취소: {item['job_id']}")
+            store.fail(item['job_id'], "Cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"영상 생성 작업 실패: {item['job_id']} - {str(e)}")
+            store.fail(item['job_id'], str(e))
+            raise
+        store.finish_stage(item['job_id'], stage, artifacts)
+        return item
+    return run
+
+async def fetch_content(item: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """콘텐츠 데이터를 가져옵니다."""
+    request = GenerateRequest(**item['request'])
+    content_data = None
+    if request.use_notion:
+        from app.core.notion_client import NotionClient
+        notion_client = NotionClient()
+        content_data = await notion_client.get_content(request.content_id)
+    elif request.use_google_sheets:
+        from app.core.google_sheets import GoogleSheetsClient
+        sheets_client = GoogleSheetsClient()
+        content_data = await sheets_client.get_content(request.content_id)
+
+    if not content_data:
+        raise ValueError("Content not found")
+    return {**item, 'content_data': content_data}, {'title': content_data.get('title', '')}
+
+async def generate_package(item: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """스크립트, 해시태그, 제목, 설명을 한 번의 요청으로 생성합니다."""
+    from app.core.openai_client import OpenAIClient
+    openai_client = OpenAIClient()
+    package = await openai_client.agenerate_package(item['content_data'])
+    return {**item, 'package': package.to_dict()}, {'package': package.to_dict()}
+
+async def synthesize_voice(item: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """스크립트를 음성으로 합성합니다."""
+    from app.core.elevenlabs_client import ElevenLabsClient
+    package = ScriptPackage.from_dict(item['package'])
+    elevenlabs_client = ElevenLabsClient()
+    # 자막을 입히면 문장별 재생 시간이 필요하므로 문장 단위로 합성
+    audio_file, durations = await elevenlabs_client.generate_timed_voice(
+        package.narration,
+        item['request'].get('voice_id'),
+        chunked=True if get_settings().captions_enabled else None
+    )
+    return {**item, 'audio_file': audio_file, 'sentence_durations': durations}, {'audio_file': audio_file}
+
+async def render_video(item: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """음성과 콘텐츠로 자막이 들어간 영상을 만듭니다."""
+    from app.core.video_generator import VideoGenerator
+    package = ScriptPackage.from_dict(item['package'])
+    video_generator = VideoGenerator()
+    # 내레이션은 자막으로 같은 인코딩 패스에서 입힘
+    video_file = await video_generator.generate_video(
+        item['audio_file'],
+        {**item['content_data'], 'script': package.narration, 'sentence_durations': item.get('sentence_durations')}
+    )
+    return {**item, 'video_file': video_file}, {'video_file': video_file}
+
+async def upload_video(item: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """영상을 YouTube에 업로드하고 작업을 완료합니다."""
+    from app.core.youtube_client import YouTubeClient
+    package = ScriptPackage.from_dict(item['package'])
+    store = get_job_store(get_settings().job_store_path)
+    youtube_client = YouTubeClient()
+    video_url = await youtube_client.upload_video(
+        item['video_file'],
+        title=package.title,
+        description=f"{package.description}\n\n{' '.join(package.hashtags)}",
+        tags=[tag.lstrip('#') for tag in package.hashtags],
+        progress=lambda sent, total: store.report_progress(item['job_id'], 'upload', sent / total if total else 1.0)
+    )
+    return {**item, 'video_url': video_url}, {'video_url': video_url}
+
+async def script_stage(item: Dict[str, Any]) -> Dict[str, Any]:
+    """스크립트 단계: 콘텐츠 조회와 스크립트 패키지 생성 (둘 다 I/O 위주)"""
+    item = await _tracked('fetch', fetch_content)(item)
+    return await _tracked('script', generate_package)(item)
+
+async def upload_stage(item: Dict[str, Any]) -> Dict[str, Any]:
+    """업로드 단계: 업로드 후 작업을 완료 상태로 기록"""
+    item = await _tracked('upload', upload_video)(item)
+    get_job_store(get_settings().job_store_path).complete(item['job_id'], item['video_url'])
+    logger.info(f"영상 생성 작업 완료: {item['job_id']}")
+    return item
+
+def build_generate_pipeline() -> StagedPipeline:
+    """스크립트 → 음성 → 렌더링 → 업로드 단계를 각자의 대기열과 워커로 연결한 파이프라인을 만듭니다."""
+    settings = get_settings()
+    return StagedPipeline(
+        [
+            PipelineStage('script', script_stage, settings.pipeline_script_workers),
+            PipelineStage('voice', _tracked('voice', synthesize_voice), settings.pipeline_voice_workers),
+            PipelineStage(
+                'render', _tracked('video', render_video),
+                settings.pipeline_render_workers or settings.render_workers or os.cpu_count() or 1
+            ),
+            PipelineStage('upload', upload_stage, settings.pipeline_upload_workers),
+        ],
+        create_queue_backend(settings.pipeline_backend, settings.pipeline_queue_size, settings.pipeline_redis_url)
+    )
+
+# 프로세스 전체에서 공유하는 영상 생성 파이프라인 (처음 사용한 이벤트 루프에서 워커 시작)
+_generate_pipeline: Optional[StagedPipeline] = None
+
+def get_generate_pipeline() -> StagedPipeline:
+    """프로세스 전체에서 공유하는 영상 생성 파이프라인을 가져옵니다.
+
+    모든 요청이 같은 단계별 대기열과 워커를 쓰므로 단계별 워커 수는 요청마다가 아니라
+    프로세스 전체에서 ElevenLabs, ffmpeg, 업로드에 동시에 보내는 작업 수의 한도가 됩니다.
+
+    Returns:
+        StagedPipeline: 워커가 실행 중인 파이프라인
+    """
+    global _generate_pipeline
+    loop = asyncio.get_running_loop()
+    if _generate_pipeline is None or _generate_pipeline.loop is not loop:
+        _generate_pipeline = build_generate_pipeline()
+        _generate_pipeline.start()
+    return _generate_pipeline
+
+async def shutdown_generate_pipeline() -> None:
+    """공유 파이프라인의 워커를 멈추고 대기열 백엔드를 닫습니다."""
+    global _generate_pipeline
+    pipeline, _generate_pipeline = _generate_pipeline, None
+    if pipeline is not None:
+        await pipeline.stop()
+
+async def run_generate_jobs(job_ids: List[str], requests: List[GenerateRequest]) -> None:
+    """여러 영상 생성 작업을 공유 파이프라인에 넣고 끝날 때까지 기다립니다. 진행 상황은 작업 저장소에 기록됩니다."""
+    results = await get_generate_pipeline().submit([
+        {'job_id': job_id, 'request': request.model_dump()}
+        for job_id, request in zip(job_ids, requests)
+    ])
+    # 단계에 들어가기 전에 파이프라인이 멈췄거나 대기열에 넣지 못한 작업은 단계가 실패를 기록하지 않았으므로 여기서 기록
+    store = get_job_store(get_settings().job_store_path)
+    for job_id, result in zip(job_ids, results):
+        if isinstance(result, StageError):
+            job = await run_in_threadpool(store.get, job_id)
+            if job and job['status'] != JOB_FAILED:
+                await run_in_threadpool(store.fail, job_id, str(result))
+
+async def run_generate_job(job_id: str, request: GenerateRequest) -> None:
+    """영상 생성 작업 하나를 실행합니다."""
+    await run_generate_jobs([job_id], [request])
 
 @router.post("/generate")
 async def generate_shorts(request: GenerateRequest, background_tasks: BackgroundTasks):
     try:
-        # 콘텐츠 데이터 가져오기
-        content_data = None
-        if request.use_notion:
-            notion_client = NotionClient()
-            content_data = await notion_client.get_content(request.content_id)
-        elif request.use_google_sheets:
-            sheets_client = GoogleSheetsClient()
-            content_data = await sheets_client.get_content(request.content_id)
-        
-        if not content_data:
-            raise HTTPException(status_code=404, detail="Content not found")
-
-        # 스크립트 생성
-        openai_client = OpenAIClient()
-        script = await openai_client.generate_script(content_data)
-
-        # 음성 합성
-        elevenlabs_client = ElevenLabsClient()
-        audio_file = await elevenlabs_client.generate_voice(script, request.voice_id)
-
-        # 영상 생성
-        video_generator = VideoGenerator()
-        video_file = await video_generator.generate_video(audio_file, content_data)
-
-        # YouTube 업로드
-        youtube_client = YouTubeClient()
-        video_url = await youtube_client.upload_video(video_file)
-
-        return {"status": "success", "video_url": video_url}
+        # 작업을 등록하고 파이프라인은 백그라운드에서 실행
+        store = get_job_store(get_settings().job_store_path)
+        job_id = await run_in_threadpool(store.create, request.model_dump())
+        background_tasks.add_task(run_generate_job, job_id, request)
+        return {"status": JOB_QUEUED, "job_id": job_id}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/generate-batch")
+async def generate_shorts_batch(requests: List[GenerateRequest], background_tasks: BackgroundTasks):
+    try:
+        # 작업들을 등록하고 공유 단계별 파이프라인에서 함께 처리
+        store = get_job_store(get_settings().job_store_path)
+        job_ids = [await run_in_threadpool(store.create, request.model_dump()) for request in requests]
+        background_tasks.add_task(run_generate_jobs, job_ids, requests)
+        return {"status": JOB_QUEUED, "job_ids": job_ids}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/status/{job_id}")
 async def get_status(job_id: str):
-    # 작업 상태 조회 로직 구현
+    store = get_job_store(get_settings().job_store_path)
+    job = await run_in_threadpool(store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
     return StatusResponse(
-        job_id=job_id,
-        status="completed",
-        progress=100.0
+        job_id=job['job_id'],
+        status=job['status'],
+        progress=job['progress'],
+        message=job['message'],
+        stage=job['stage'],
+        stages=job['stages'],
+        artifacts=job['artifacts'],
+        elapsed=job['elapsed']
     )
 
 @router.get("/history")
-async def get_history():
-    # 생성된 영상 목록 조회 로직 구현
-    return []
+async def get_history(limit: int = 50, before: Optional[float] = None, status: Optional[str] = None):
+    # 생성 시각 역순, before 커서로 다음 페이지 조회
+    store = get_job_store(get_settings().job_store_path)
+    return await run_in_threadpool(store.history, min(limit, 500), before, status)
 
 @router.post("/process-topics")
 async def process_topics():
     """Process all pending topics and generate scripts."""
+    from app.core.content_generator import ContentGenerator
     try:
-        generator = ContentGenerator()
-        await generator.process_pending_topics()
-        return {"message": "Topics processed successfully"}
+        # 동기 처리 루프는 스레드에서 실행하여 이벤트 루프를 막지 않음
+        generator = await run_in_threadpool(ContentGenerator)
+        summary = await run_in_threadpool(generator.process_pending_topics)
+        return {"message": "Topics processed successfully", "summary": summary.to_dict()}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+async def run_scheduled_uploads(job_id: str, requests: List[UploadRequest]) -> None:
+    """대기 중인 영상들을 게시 시간대와 할당량에 맞춰 업로드하고 영상별 결과를 작업 저장소에 기록합니다."""
+    from app.core.upload_scheduler import (
+        UPLOAD_DEFERRED, UPLOAD_FAILED, UPLOAD_UPLOADED, UploadTask, create_upload_scheduler
+    )
+    store = get_job_store(get_settings().job_store_path)
+    tasks = [UploadTask(**request.model_dump()) for request in requests]
+    store.start_stage(job_id, 'schedule')
+    try:
+        scheduler = create_upload_scheduler()
+        results = await scheduler.run(tasks)
+    except Exception as e:
+        logger.error(f"예약 업로드 작업 실패: {job_id} - {str(e)}")
+        store.fail(job_id, str(e))
+        return
+
+    uploads = scheduler.report(tasks, results)
+    counts = {status: sum(upload['status'] == status for upload in uploads)
+              for status in (UPLOAD_UPLOADED, UPLOAD_FAILED, UPLOAD_DEFERRED)}
+    store.finish_stage(job_id, 'schedule', {'uploads': uploads, **counts})
+    store.complete(
+        job_id,
+        f"uploaded {counts[UPLOAD_UPLOADED]}, failed {counts[UPLOAD_FAILED]}, deferred {counts[UPLOAD_DEFERRED]}"
+    )
+
+@router.post("/uploads/schedule")
+async def schedule_uploads(requests: List[UploadRequest], background_tasks: BackgroundTasks):
+    """Upload a backlog of rendered videos within the publishing window and daily quota.
+
+    Poll /status/{job_id} for the per-video results (uploaded, failed or deferred for quota).
+    """
+    store = get_job_store(get_settings().job_store_path)
+    job_id = await run_in_threadpool(store.create, {'uploads': [request.model_dump() for request in requests]})
+    background_tasks.add_task(run_scheduled_uploads, job_id, requests)
+    return {"status": JOB_QUEUED, "job_id": job_id, "videos": len(requests)}
+
+@router.get("/uploads/quota")
+async def get_upload_quota():
+    """Report today's YouTube Data API quota usage."""
+    settings = get_settings()
+    ledger = get_quota_ledger(settings.youtube_quota_path, settings.youtube_daily_quota)
+    return {
+        "day": ledger.today(),
+        "limit": ledger.daily_limit,
+        "used": await run_in_threadpool(ledger.used),
+        "usage": await run_in_threadpool(ledger.usage),
+        "resets_in": round(ledger.seconds_until_reset())
+    }
@@ -30,11 +30,88 @@ class Settings(BaseSettings):
     # YouTube Settings
     youtube_channel_id: str = os.getenv("YOUTUBE_CHANNEL_ID", "")
     youtube_playlist_id: str = os.getenv("YOUTUBE_PLAYLIST_ID", "")
+    youtube_upload_chunk_size: int = int(os.getenv("YOUTUBE_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))  # 256KiB 배수
+    youtube_upload_max_retries: int = int(os.getenv("YOUTUBE_UPLOAD_MAX_RETRIES", "10"))
+    youtube_upload_session_dir: str = os.getenv("YOUTUBE_UPLOAD_SESSION_DIR", os.path.join("data", ".cache", "uploads"))
+    youtube_upload_session_ttl: float = float(os.getenv("YOUTUBE_UPLOAD_SESSION_TTL", str(6 * 24 * 3600)))
+    youtube_daily_quota: int = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+    youtube_quota_path: str = os.getenv("YOUTUBE_QUOTA_PATH", os.path.join("data", "youtube_quota.sqlite3"))
+    youtube_upload_concurrency: int = int(os.getenv("YOUTUBE_UPLOAD_CONCURRENCY", "1"))
+    youtube_publish_window: str = os.getenv("YOUTUBE_PUBLISH_WINDOW", "09-21")  # 시작-종료 시각(시), 예: 22-02
+    youtube_publish_timezone: str = os.getenv("YOUTUBE_PUBLISH_TIMEZONE", "Asia/Seoul")
+    youtube_playlist_batch_size: int = int(os.getenv("YOUTUBE_PLAYLIST_BATCH_SIZE", "50"))
     
+    # Job Store
+    job_store_path: str = os.getenv("JOB_STORE_PATH", os.path.join("data", "jobs.sqlite3"))
+
     # Video Generation Settings
     video_width: int = int(os.getenv("VIDEO_WIDTH", "1080"))
     video_height: int = int(os.getenv("VIDEO_HEIGHT", "1920"))
     fps: int = int(os.getenv("FPS", "30"))
+    background_style: str = os.getenv("BACKGROUND_STYLE", "vertical")
+    video_font: str = os.getenv("VIDEO_FONT", "Arial")
+    video_font_size: int = int(os.getenv("VIDEO_FONT_SIZE", "60"))
+    video_profile: str = os.getenv("VIDEO_PROFILE", "publish")  # draft, publish, archive
+    render_workers: int = int(os.getenv("RENDER_WORKERS", "0"))  # 0이면 CPU 수
+    render_queue_size: int = int(os.getenv("RENDER_QUEUE_SIZE", "32"))
+    render_timeout: float = float(os.getenv("RENDER_TIMEOUT", "600"))
+    video_asset_cache_dir: str = os.getenv("VIDEO_ASSET_CACHE_DIR", os.path.join("data", ".cache", "video"))
+    video_asset_cache_max_entries: int = int(os.getenv("VIDEO_ASSET_CACHE_MAX_ENTRIES", "256"))  # 0이면 제한 없음
+
+    # Caption Settings (스크립트 자막을 인코딩 패스에서 함께 입힘)
+    # libass가 포함된 ffmpeg와 한글 폰트(CAPTION_FONT)가 필요함
+    # 켜면 API 파이프라인은 문장 단위로 합성하여 문장별 재생 시간에 자막을 맞춤
+    captions_enabled: bool = os.getenv("CAPTIONS_ENABLED", "False").lower() == "true"
+    caption_font: str = os.getenv("CAPTION_FONT", "Noto Sans CJK KR")  # 글꼴 이름 또는 한글 폰트 파일 경로
+    caption_font_size: int = int(os.getenv("CAPTION_FONT_SIZE", "72"))
+    caption_max_chars: int = int(os.getenv("CAPTION_MAX_CHARS", "16"))
+    caption_margin: int = int(os.getenv("CAPTION_MARGIN", "320"))  # 하단 여백(px)
+    caption_format: str = os.getenv("CAPTION_FORMAT", "ass")  # ass, srt
+
+    # ElevenLabs TTS Cache Settings
+    tts_cache_dir: str = os.getenv("TTS_CACHE_DIR", os.path.join("data", ".cache", "tts"))
+    tts_cache_max_mb: int = int(os.getenv("TTS_CACHE_MAX_MB", "512"))
+    tts_streaming: bool = os.getenv("TTS_STREAMING", "True").lower() == "true"
+    tts_stream_chunk_size: int = int(os.getenv("TTS_STREAM_CHUNK_SIZE", "4096"))
+    tts_chunked: bool = os.getenv("TTS_CHUNKED", "False").lower() == "true"  # 문장 단위 병렬 합성
+    tts_chunk_concurrency: int = int(os.getenv("TTS_CHUNK_CONCURRENCY", "4"))  # 프로세스 전체 동시 합성 요청 수
+    tts_requests_per_minute: float = float(os.getenv("TTS_REQUESTS_PER_MINUTE", "100"))  # 0이면 제한 없음
+
+    # Pipeline Concurrency Settings
+    pipeline_max_workers: int = int(os.getenv("PIPELINE_MAX_WORKERS", "4"))
+    openai_concurrency: int = int(os.getenv("OPENAI_CONCURRENCY", "4"))
+    elevenlabs_concurrency: int = int(os.getenv("ELEVENLABS_CONCURRENCY", "2"))
+
+    # Staged Pipeline Settings (script → voice → render → upload)
+    pipeline_backend: str = os.getenv("PIPELINE_BACKEND", "memory")  # memory, redis
+    pipeline_redis_url: str = os.getenv("PIPELINE_REDIS_URL", "redis://localhost:6379/0")
+    pipeline_queue_size: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "100"))
+    pipeline_script_workers: int = int(os.getenv("PIPELINE_SCRIPT_WORKERS", "20"))
+    pipeline_voice_workers: int = int(os.getenv("PIPELINE_VOICE_WORKERS", "4"))
+    pipeline_render_workers: int = int(os.getenv("PIPELINE_RENDER_WORKERS", "0"))  # 0이면 render_workers 또는 CPU 수
+    pipeline_upload_workers: int = int(os.getenv("PIPELINE_UPLOAD_WORKERS", "2"))
+
+    # OpenAI Async Client Settings
+    openai_batch_concurrency: int = int(os.getenv("OPENAI_BATCH_CONCURRENCY", "50"))
+    openai_max_connections: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+    openai_requests_per_minute: int = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))  # 0이면 제한 없음
+    openai_tokens_per_minute: int = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "300000"))  # 0이면 제한 없음
+
+    # OpenAI Batch API Settings
+    openai_batch_dir: str = os.getenv("OPENAI_BATCH_DIR", os.path.join("data", "batches"))
+    openai_batch_poll_interval: float = float(os.getenv("OPENAI_BATCH_POLL_INTERVAL", "60"))
+    openai_batch_timeout: float = float(os.getenv("OPENAI_BATCH_TIMEOUT", str(24 * 3600)))
+
+    # OpenAI Script Cache Settings
+    script_cache_enabled: bool = os.getenv("SCRIPT_CACHE_ENABLED", "True").lower() == "true"
+    script_cache_path: str = os.getenv("SCRIPT_CACHE_PATH", os.path.join("data", ".cache", "scripts.sqlite3"))
+    script_cache_ttl: float = float(os.getenv("SCRIPT_CACHE_TTL", str(7 * 24 * 3600)))  # 초, 0이면 만료 없음
+    script_cache_max_entries: int = int(os.getenv("SCRIPT_CACHE_MAX_ENTRIES", "10000"))
+
+    # Google Sheets Write Buffer Settings
+    sheets_flush_interval: float = float(os.getenv("SHEETS_FLUSH_INTERVAL", "5"))
+    sheets_batch_max_ranges: int = int(os.getenv("SHEETS_BATCH_MAX_RANGES", "500"))
+    sheets_page_size: int = int(os.getenv("SHEETS_PAGE_SIZE", "500"))
 
     # OpenAI Prompt Template
     openai_prompt_template: str = """
@@ -0,0 +1,224 @@
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 정리할 때 상한의 이 비율까지 줄여, 상한 근처에서 기록할 때마다 디렉토리를 다시 훑지 않게 함
+LOW_WATER_RATIO = 0.9
+
+class AudioCache:
+    """합성 요청 내용으로 주소를 매기는 디스크 기반 TTS 오디오 캐시
+
+    키는 텍스트, 음성 ID, 모델, 음성 설정의 안정적인 SHA-256 해시이므로
+    프로세스가 달라도 같은 요청이면 같은 파일을 가리킵니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 삭제합니다.
+
+    전체 크기는 메모리에서 누적하므로 기록할 때마다 디렉토리를 훑지 않고,
+    누적 크기가 상한을 넘었을 때만 디렉토리를 훑어 실제 크기로 다시 맞춥니다.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """AudioCache 인스턴스를 초기화합니다.
+
+        Args:
+            cache_dir: 캐시 디렉토리 경로
+            max_bytes: 캐시 최대 크기(바이트)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # 캐시 파일 전체 크기 (처음 기록할 때 디렉토리를 한 번 훑어 채움)
+        self._total_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(text: str, voice_id: str, model: str, voice_settings: Dict[str, Any]) -> str:
+        """합성 요청의 캐시 키를 만듭니다.
+
+        Args:
+            text: 변환할 텍스트
+            voice_id: 음성 ID
+            model: 모델 이름
+            voice_settings: 음성 설정
+
+        Returns:
+            str: 16진수 SHA-256 해시
+        """
+        payload = json.dumps(
+            {
+                'text': text,
+                'voice_id': voice_id,
+                'model': model,
+                'voice_settings': voice_settings
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        """캐시 키에 해당하는 파일 경로를 반환합니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            str: 캐시 파일 경로
+        """
+        return os.path.join(self.cache_dir, key[:2], f"{key}.mp3")
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 오디오 파일 경로를 가져옵니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            Optional[str]: 캐시 파일 경로 (없으면 None)
+        """
+        path = self.path_for(key)
+        try:
+            # LRU 순서를 위해 사용 시각 갱신
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def copy_to(self, key: str, output_path: str) -> bool:
+        """캐시된 오디오를 지정한 경로로 복사합니다.
+
+        Args:
+            key: 캐시 키
+            output_path: 복사할 파일 경로
+
+        Returns:
+            bool: 캐시 적중 여부
+        """
+        path = self.get(key)
+        if path is None:
+            return False
+        try:
+            shutil.copyfile(path, output_path)
+        except FileNotFoundError:
+            # 복사 직전에 다른 프로세스가 삭제한 경우
+            return False
+        return True
+
+    @contextmanager
+    def open_writer(self, key: str) -> Iterator[BinaryIO]:
+        """캐시 항목을 원자적으로 기록할 파일 객체를 엽니다.
+
+        임시 파일에 기록한 뒤 블록이 정상 종료되면 최종 경로로 이름을 바꿉니다.
+        블록 안에서 예외가 발생하면 임시 파일은 삭제되고 캐시는 변경되지 않습니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            Iterator[BinaryIO]: 기록용 파일 객체
+        """
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                yield f
+            size = os.path.getsize(temp_path)
+            replaced = self._file_size(path)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan()[1]
+            else:
+                self._total_bytes += size - replaced
+            over_limit = self._total_bytes > self.max_bytes
+        if over_limit:
+            self.evict(keep=path)
+
+    def put(self, key: str, audio: bytes) -> str:
+        """오디오 데이터를 캐시에 저장합니다.
+
+        Args:
+            key: 캐시 키
+            audio: 오디오 데이터
+
+        Returns:
+            str: 캐시 파일 경로
+        """
+        with self.open_writer(key) as f:
+            f.write(audio)
+        return self.path_for(key)
+
+    @staticmethod
+    def _file_size(path: str) -> int:
+        """파일 크기를 반환합니다 (없으면 0)."""
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def _scan(self) -> Tuple[List[Tuple[float, int, str]], int]:
+        """캐시 디렉토리의 파일들을 훑습니다.
+
+        Returns:
+            Tuple[List[Tuple[float, int, str]], int]: ((사용 시각, 크기, 경로) 목록, 전체 크기)
+        """
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.mp3'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """캐시 크기가 상한을 넘으면 오래 사용하지 않은 파일부터 상한의 LOW_WATER_RATIO까지 삭제합니다.
+
+        디렉토리를 훑어 다른 프로세스가 기록한 파일까지 포함한 실제 크기로 누적 크기를 다시 맞춥니다.
+
+        Args:
+            keep: 삭제하지 않을 파일 경로 (방금 기록한 항목)
+
+        Returns:
+            int: 삭제된 파일 수
+        """
+        with self._lock:
+            entries, total = self._scan()
+
+            removed = 0
+            target = self.max_bytes * LOW_WATER_RATIO if total > self.max_bytes else total
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+
+            self._total_bytes = total
+            if removed:
+                logger.info(f"TTS 캐시 정리 - {removed}개 파일 삭제")
+            return removed
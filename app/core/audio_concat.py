@@ -0,0 +1,66 @@
+from typing import Sequence
+import ffmpeg
+import logging
+import os
+import shutil
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+def _concat_entry(path: str) -> str:
+    """concat 목록 파일의 한 줄을 만듭니다 (작은따옴표는 '\\'' 로 이스케이프)."""
+    escaped = os.path.abspath(path).replace("'", "'\\''")
+    return f"file '{escaped}'\n"
+
+def concat_audio(segment_paths: Sequence[str], output_path: str, cmd: str = 'ffmpeg') -> str:
+    """같은 형식의 오디오 조각들을 다시 인코딩하지 않고 이어 붙입니다.
+
+    ffmpeg concat 디먹서와 스트림 복사(-c copy)를 사용하므로 조각 수와 관계없이
+    디스크 복사 수준의 시간만 걸립니다. 결과는 임시 파일에 쓴 뒤 이름을 바꿔
+    중간에 실패해도 불완전한 파일이 남지 않습니다.
+
+    Args:
+        segment_paths: 순서대로 이어 붙일 오디오 파일 경로 (코덱과 샘플레이트가 같아야 함)
+        output_path: 결과 파일 경로
+        cmd: ffmpeg 실행 파일
+
+    Returns:
+        str: 결과 파일 경로
+
+    Raises:
+        ValueError: 조각이 없는 경우
+        Exception: ffmpeg 실행 실패 시
+    """
+    if not segment_paths:
+        raise ValueError("No audio segments to concatenate")
+
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    if len(segment_paths) == 1:
+        shutil.copyfile(segment_paths[0], output_path)
+        return output_path
+
+    with tempfile.TemporaryDirectory(prefix='concat_') as work_dir:
+        list_path = os.path.join(work_dir, 'segments.txt')
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.writelines(_concat_entry(path) for path in segment_paths)
+
+        # 같은 디렉토리의 임시 파일에 쓴 뒤 원자적으로 교체
+        temp_output = os.path.join(output_dir, f".{os.path.basename(output_path)}.{os.getpid()}.part")
+        try:
+            (
+                ffmpeg
+                .input(list_path, f='concat', safe=0)
+                .output(temp_output, c='copy', f=os.path.splitext(output_path)[1].lstrip('.') or 'mp3')
+                .overwrite_output()
+                .run(cmd=cmd, quiet=True)
+            )
+            os.replace(temp_output, output_path)
+        except ffmpeg.Error as e:
+            raise Exception(f"Failed to concatenate audio: {e.stderr.decode('utf-8', 'replace')[-500:]}")
+        finally:
+            if os.path.exists(temp_output):
+                os.remove(temp_output)
+
+    logger.info(f"오디오 조각 {len(segment_paths)}개 이어 붙이기 완료: {output_path}")
+    return output_path
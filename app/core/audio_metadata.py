@@ -0,0 +1,270 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+import ffmpeg
+import logging
+import mmap
+import struct
+
+logger = logging.getLogger(__name__)
+
+# MPEG 오디오 버전 비트 → 버전 (1: MPEG-1, 2: MPEG-2, 25: MPEG-2.5, None: 예약)
+MPEG_VERSIONS = {0b00: 25, 0b01: None, 0b10: 2, 0b11: 1}
+
+# 레이어 비트 → 레이어 번호 (None: 예약)
+MPEG_LAYERS = {0b00: None, 0b01: 3, 0b10: 2, 0b11: 1}
+
+# (버전 계열, 레이어) → 비트레이트 인덱스별 kbps (0: free format, 15: 예약)
+BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# 버전 → 샘플레이트 인덱스별 Hz
+SAMPLE_RATES = {
+    1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    25: (11025, 12000, 8000),
+}
+
+# 프레임 헤더 크기(바이트)와 형식
+FRAME_HEADER_SIZE = 4
+HEADER = struct.Struct('>I')
+
+# 첫 프레임에서 확인할 VBR 헤더 위치 (VBRI는 항상 헤더 뒤 32바이트)
+VBRI_OFFSET = FRAME_HEADER_SIZE + 32
+
+# Xing 헤더의 프레임 수 필드 플래그
+XING_FRAMES_FLAG = 0x1
+
+# 첫 프레임을 찾을 최대 범위(바이트): 다른 형식의 데이터에서 우연히 동기 비트를 찾지 않도록 제한
+MAX_SYNC_SEARCH = 64 * 1024
+
+# MPEG 오디오가 아닌 컨테이너의 시작 바이트 (ffprobe로 조회)
+CONTAINER_SIGNATURES = (b'RIFF', b'OggS', b'fLaC', b'FORM', b'\x1aE\xdf\xa3')
+
+class FrameHeader:
+    """MPEG 오디오 프레임 헤더 하나의 해석 결과"""
+
+    __slots__ = ('version', 'layer', 'sample_rate', 'samples', 'length', 'mono')
+
+    def __init__(self, version: int, layer: int, sample_rate: int, samples: int, length: int, mono: bool):
+        self.version = version
+        self.layer = layer
+        self.sample_rate = sample_rate
+        self.samples = samples
+        self.length = length
+        self.mono = mono
+
+    @property
+    def side_info_size(self) -> int:
+        """레이어 3 사이드 정보 크기(바이트) (Xing 헤더 위치 계산용)"""
+        if self.version == 1:
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+@lru_cache(maxsize=256)
+def decode_frame_header(header: int) -> Optional[FrameHeader]:
+    """32비트 MPEG 오디오 프레임 헤더를 해석합니다.
+
+    한 파일의 프레임들은 몇 가지 헤더 값(패딩 여부, VBR 비트레이트)만 반복하므로 결과를 캐시합니다.
+
+    Args:
+        header: 빅엔디언으로 읽은 헤더 값
+
+    Returns:
+        Optional[FrameHeader]: 유효한 헤더이면 해석 결과, 아니면 None
+            (free format 비트레이트는 프레임 길이를 알 수 없으므로 지원하지 않음)
+    """
+    if header & 0xFFE00000 != 0xFFE00000:
+        return None
+
+    version = MPEG_VERSIONS[(header >> 19) & 0b11]
+    layer = MPEG_LAYERS[(header >> 17) & 0b11]
+    bitrate_index = (header >> 12) & 0b1111
+    sample_rate_index = (header >> 10) & 0b11
+    if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    bitrate = BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+    padding = (header >> 9) & 0b1
+    mono = (header >> 6) & 0b11 == 0b11
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 576 if layer == 3 and version != 1 else 1152
+        length = samples // 8 * bitrate // sample_rate + padding
+    return FrameHeader(version, layer, sample_rate, samples, length, mono)
+
+def parse_frame_header(data, offset: int) -> Optional[FrameHeader]:
+    """offset 위치의 4바이트를 MPEG 오디오 프레임 헤더로 해석합니다.
+
+    Args:
+        data: 파일 내용 (bytes 또는 mmap)
+        offset: 헤더 시작 위치
+
+    Returns:
+        Optional[FrameHeader]: 유효한 헤더이면 해석 결과, 아니면 None
+    """
+    if offset + FRAME_HEADER_SIZE > len(data):
+        return None
+    return decode_frame_header(HEADER.unpack_from(data, offset)[0])
+
+def skip_id3v2(data) -> int:
+    """파일 앞의 ID3v2 태그(여러 개일 수 있음)를 건너뛴 위치를 반환합니다.
+
+    Args:
+        data: 파일 내용 (bytes 또는 mmap)
+
+    Returns:
+        int: 첫 번째 ID3v2 태그 뒤의 위치 (태그가 없으면 0)
+    """
+    offset = 0
+    while data[offset:offset + 3] == b'ID3' and offset + 10 <= len(data):
+        flags = data[offset + 5]
+        # 태그 크기는 7비트씩 나눠 저장된 동기 안전 정수
+        size = 0
+        for byte in data[offset + 6:offset + 10]:
+            size = (size << 7) | (byte & 0x7F)
+        offset += 10 + size + (10 if flags & 0x10 else 0)
+    return offset
+
+def find_first_frame(data, offset: int) -> Optional[Tuple[int, FrameHeader]]:
+    """offset부터 MAX_SYNC_SEARCH 안에서 연속된 두 프레임이 확인되는 첫 번째 프레임을 찾습니다.
+
+    Args:
+        data: 파일 내용 (bytes 또는 mmap)
+        offset: 검색 시작 위치
+
+    Returns:
+        Optional[Tuple[int, FrameHeader]]: (프레임 위치, 헤더) 또는 None
+    """
+    end = offset + MAX_SYNC_SEARCH
+    while True:
+        offset = data.find(b'\xff', offset, end)
+        if offset < 0:
+            return None
+        frame = parse_frame_header(data, offset)
+        if frame:
+            following = offset + frame.length
+            # 우연히 동기 비트와 같은 바이트를 피하기 위해 다음 프레임도 확인 (파일 끝이면 통과)
+            if following + FRAME_HEADER_SIZE > len(data) or parse_frame_header(data, following):
+                return offset, frame
+        offset += 1
+
+def vbr_header_frames(data, offset: int, frame: FrameHeader) -> Optional[int]:
+    """첫 프레임의 Xing/Info 또는 VBRI 헤더에서 전체 프레임 수를 읽습니다.
+
+    Args:
+        data: 파일 내용 (bytes 또는 mmap)
+        offset: 첫 프레임 위치
+        frame: 첫 프레임 헤더
+
+    Returns:
+        Optional[int]: 프레임 수 (VBR 헤더가 없거나 프레임 수가 없으면 None)
+    """
+    xing = offset + FRAME_HEADER_SIZE + frame.side_info_size
+    if data[xing:xing + 4] in (b'Xing', b'Info'):
+        flags, = struct.unpack_from('>I', data, xing + 4)
+        if flags & XING_FRAMES_FLAG:
+            return struct.unpack_from('>I', data, xing + 8)[0]
+        return None
+
+    vbri = offset + VBRI_OFFSET
+    if data[vbri:vbri + 4] == b'VBRI':
+        return struct.unpack_from('>I', data, vbri + 14)[0]
+    return None
+
+def scan_frames(data, offset: int) -> Tuple[int, int]:
+    """프레임 헤더를 따라가며 전체 샘플 수를 셉니다.
+
+    헤더가 아닌 위치(ID3v1/APE 태그, 잘린 마지막 프레임 등)를 만나면 멈춥니다.
+
+    Args:
+        data: 파일 내용 (bytes 또는 mmap)
+        offset: 첫 프레임 위치
+
+    Returns:
+        Tuple[int, int]: (전체 샘플 수, 샘플레이트)
+    """
+    samples = 0
+    sample_rate = 0
+    size = len(data)
+    unpack_from = HEADER.unpack_from
+    while offset + FRAME_HEADER_SIZE <= size:
+        frame = decode_frame_header(unpack_from(data, offset)[0])
+        if frame is None or offset + frame.length > size:
+            break
+        samples += frame.samples
+        sample_rate = frame.sample_rate
+        offset += frame.length
+    return samples, sample_rate
+
+def mp3_duration_us(path: str) -> Optional[int]:
+    """MP3 파일의 재생 시간을 프로세스 안에서 계산합니다.
+
+    파일을 메모리 매핑하여 ID3v2 태그를 건너뛰고, 첫 프레임의 Xing/Info 또는 VBRI 헤더가
+    있으면 그 프레임 수(정보 프레임 제외)를, 없으면 모든 프레임 헤더를 따라가며 샘플 수를 셉니다.
+
+    Args:
+        path: 오디오 파일 경로
+
+    Returns:
+        Optional[int]: 재생 시간(마이크로초) (MPEG 오디오가 아니면 None)
+
+    Raises:
+        OSError: 파일을 열 수 없는 경우
+    """
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 빈 파일은 매핑할 수 없음
+            return None
+    with data:
+        if data[:4] in CONTAINER_SIGNATURES or data[4:8] == b'ftyp':
+            return None
+        found = find_first_frame(data, skip_id3v2(data))
+        if found is None:
+            return None
+        offset, frame = found
+
+        frames = vbr_header_frames(data, offset, frame)
+        if frames is not None:
+            samples, sample_rate = frames * frame.samples, frame.sample_rate
+        else:
+            samples, sample_rate = scan_frames(data, offset)
+        if not sample_rate:
+            return None
+        return samples * 1_000_000 // sample_rate
+
+def get_audio_duration_us(path: str) -> int:
+    """오디오 파일의 재생 시간을 마이크로초로 가져옵니다.
+
+    MP3는 프로세스 안에서 헤더만 읽어 계산하고, 그 밖의 형식은 ffprobe로 조회합니다.
+
+    Args:
+        path: 오디오 파일 경로
+
+    Returns:
+        int: 재생 시간(마이크로초)
+
+    Raises:
+        Exception: ffprobe 조회 실패 시
+    """
+    duration = mp3_duration_us(path)
+    if duration is not None:
+        return duration
+
+    logger.info(f"MP3가 아니므로 ffprobe로 재생 시간 조회: {path}")
+    try:
+        probe = ffmpeg.probe(path)
+        return round(float(probe['format']['duration']) * 1_000_000)
+    except (ffmpeg.Error, KeyError, ValueError) as e:
+        raise Exception(f"Failed to probe audio duration: {str(e)}")
@@ -0,0 +1,104 @@
+from typing import List, Sequence, Tuple
+from PIL import Image
+import numpy as np
+import random
+
+RGB = Tuple[int, int, int]
+
+# 지원하는 그라데이션 스타일
+GRADIENT_STYLES = ('vertical', 'diagonal', 'radial')
+
+# 2차원 그라데이션 색상 표의 단계 수
+LUT_SIZE = 1024
+
+def random_colors(count: int = 2) -> List[RGB]:
+    """무작위 색상 목록을 만듭니다.
+
+    Args:
+        count: 색상 수
+
+    Returns:
+        List[RGB]: RGB 색상 목록
+    """
+    return [
+        (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
+        for _ in range(count)
+    ]
+
+def _color_table(colors: Sequence[RGB], positions: np.ndarray) -> np.ndarray:
+    """그라데이션 위치(0~1)마다 정지점 사이를 선형 보간한 색상 표를 만듭니다.
+
+    색상이 세 개 이상이면 균등한 간격의 정지점(multi-stop) 사이를 보간합니다.
+
+    Args:
+        colors: 정지점 색상 목록
+        positions: 1차원 그라데이션 위치 배열
+
+    Returns:
+        np.ndarray: (len(positions), 3) 크기의 uint8 색상 배열
+    """
+    stops = np.asarray(colors, dtype=np.float64)
+    segments = len(stops) - 1
+
+    # 각 위치가 속한 구간과 구간 내 위치 계산
+    scaled = positions * segments
+    index = np.minimum(scaled.astype(np.intp), segments - 1)
+    local = (scaled - index)[:, None]
+    return (stops[index] * (1 - local) + stops[index + 1] * local).astype(np.uint8)
+
+def _gradient_positions(width: int, height: int, style: str) -> np.ndarray:
+    """2차원 그라데이션에서 각 픽셀의 위치(0~1)를 계산합니다.
+
+    Args:
+        width: 이미지 너비
+        height: 이미지 높이
+        style: 그라데이션 스타일 ('diagonal', 'radial')
+
+    Returns:
+        np.ndarray: (height, width) 크기의 위치 배열
+
+    Raises:
+        ValueError: 지원하지 않는 스타일인 경우
+    """
+    y = np.arange(height, dtype=np.float32)[:, None] / height
+    x = np.arange(width, dtype=np.float32)[None, :] / width
+    if style == 'diagonal':
+        return (x + y) / 2
+    if style == 'radial':
+        # 중심에서 가장 먼 모서리까지의 거리를 1로 정규화
+        dx = x - 0.5
+        dy = (y - 0.5) * (height / width)
+        distance = np.sqrt(dx * dx + dy * dy)
+        return distance / distance.max()
+
+    raise ValueError(f"Unsupported gradient style: {style}")
+
+def render_gradient(width: int, height: int, colors: Sequence[RGB], style: str = 'vertical') -> Image.Image:
+    """그라데이션 배경 이미지를 배열 연산으로 생성합니다.
+
+    세로 그라데이션은 한 열의 색상만 계산한 뒤 가로로 복제하고,
+    대각선·원형 그라데이션은 색상 표(LUT)에서 한 번에 픽셀을 가져옵니다.
+
+    Args:
+        width: 이미지 너비
+        height: 이미지 높이
+        colors: 정지점 색상 목록 (두 개 이상)
+        style: 그라데이션 스타일 ('vertical', 'diagonal', 'radial')
+
+    Returns:
+        Image.Image: RGB 이미지
+
+    Raises:
+        ValueError: 색상이 두 개 미만이거나 지원하지 않는 스타일인 경우
+    """
+    if len(colors) < 2:
+        raise ValueError("At least two colors are required for a gradient")
+
+    if style == 'vertical':
+        column = _color_table(colors, np.arange(height) / height)
+        return Image.fromarray(column[:, None, :]).resize((width, height), Image.NEAREST)
+
+    positions = _gradient_positions(width, height, style)
+    table = _color_table(colors, np.arange(LUT_SIZE) / (LUT_SIZE - 1))
+    index = (positions * (LUT_SIZE - 1)).astype(np.uint16)
+    return Image.fromarray(np.take(table, index, axis=0))
@@ -0,0 +1,234 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+from app.utils.text_utils import spoken_length, split_sentences
+import logging
+import os
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CaptionCue:
+    """화면에 한 번에 표시되는 자막 한 조각"""
+    start_us: int
+    end_us: int
+    text: str
+
+@dataclass(frozen=True)
+class CaptionStyle:
+    """ASS 자막 스타일 (좌표는 영상 해상도 기준)"""
+    font: str
+    font_size: int
+    width: int
+    height: int
+    margin_v: int = 320
+    outline: int = 4
+
+def chunk_words(words: Sequence[str], max_chars: int) -> List[List[str]]:
+    """단어들을 공백 포함 max_chars 글자 이하의 묶음으로 나눕니다.
+
+    Args:
+        words: 단어 목록
+        max_chars: 자막 한 조각의 최대 글자 수 (한 단어가 더 길면 그 단어만 한 조각)
+
+    Returns:
+        List[List[str]]: 단어 묶음 목록
+    """
+    chunks: List[List[str]] = []
+    length = 0
+    for word in words:
+        if chunks and length + 1 + len(word) <= max_chars:
+            chunks[-1].append(word)
+            length += 1 + len(word)
+        else:
+            chunks.append([word])
+            length = len(word)
+    return chunks
+
+def cues_from_sentences(sentences: Sequence[str], durations_us: Sequence[int], max_chars: int) -> List[CaptionCue]:
+    """문장별 재생 시간으로 자막 조각의 시각을 정합니다.
+
+    문장 안에서는 각 조각의 발화 글자 수에 비례하여 시간을 나눕니다.
+
+    Args:
+        sentences: 문장 목록
+        durations_us: 문장별 재생 시간(마이크로초)
+        max_chars: 자막 한 조각의 최대 글자 수
+
+    Returns:
+        List[CaptionCue]: 자막 조각 목록
+    """
+    cues: List[CaptionCue] = []
+    start = 0
+    for sentence, duration in zip(sentences, durations_us):
+        chunks = [' '.join(words) for words in chunk_words(sentence.split(), max_chars)]
+        total = sum(spoken_length(chunk) for chunk in chunks)
+        spoken = 0
+        for chunk in chunks:
+            chunk_start = start + duration * spoken // total
+            spoken += spoken_length(chunk)
+            cues.append(CaptionCue(chunk_start, start + duration * spoken // total, chunk))
+        start += duration
+    return cues
+
+def cues_from_script(script: str, duration_us: int, max_chars: int) -> List[CaptionCue]:
+    """스크립트만으로 자막 시각을 추정합니다.
+
+    전체 재생 시간을 문장별 발화 글자 수에 비례하여 나눕니다.
+
+    Args:
+        script: 내레이션 스크립트
+        duration_us: 음성 재생 시간(마이크로초)
+        max_chars: 자막 한 조각의 최대 글자 수
+
+    Returns:
+        List[CaptionCue]: 자막 조각 목록
+    """
+    sentences = split_sentences(script)
+    if not sentences:
+        return []
+    weights = [spoken_length(sentence) for sentence in sentences]
+    total = sum(weights)
+    bounds = [0]
+    for weight in weights:
+        bounds.append(bounds[-1] + weight)
+    durations = [
+        duration_us * bounds[index + 1] // total - duration_us * bounds[index] // total
+        for index in range(len(sentences))
+    ]
+    return cues_from_sentences(sentences, durations, max_chars)
+
+def _ass_time(us: int) -> str:
+    """ASS 시각 형식 (H:MM:SS.cc)"""
+    centiseconds = us // 10_000
+    hours, centiseconds = divmod(centiseconds, 360_000)
+    minutes, centiseconds = divmod(centiseconds, 6_000)
+    seconds, centiseconds = divmod(centiseconds, 100)
+    return f"{hours}:{minutes:02d}:{seconds:02d}.{centiseconds:02d}"
+
+def _srt_time(us: int) -> str:
+    """SRT 시각 형식 (HH:MM:SS,mmm)"""
+    milliseconds = us // 1_000
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1_000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
+
+def _ass_text(text: str) -> str:
+    """ASS 재정의 태그로 해석되지 않도록 자막 텍스트를 이스케이프합니다."""
+    return text.replace('\\', '＼').replace('{', '\\{').replace('}', '\\}').replace('\n', '\\N')
+
+def format_ass(cues: Sequence[CaptionCue], style: CaptionStyle) -> str:
+    """자막 조각들을 ASS 자막으로 만듭니다.
+
+    Args:
+        cues: 자막 조각 목록
+        style: 자막 스타일
+
+    Returns:
+        str: ASS 자막 내용
+    """
+    lines = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {style.width}",
+        f"PlayResY: {style.height}",
+        "WrapStyle: 0",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+        "Alignment, MarginL, MarginR, MarginV, Encoding",
+        # 흰 글자 + 검은 외곽선, 하단 가운데 정렬
+        f"Style: Default,{style.font},{style.font_size},&H00FFFFFF,&H000000FF,&H00000000,&H80000000,"
+        f"-1,0,0,0,100,100,0,0,1,{style.outline},0,2,60,60,{style.margin_v},1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+    for cue in cues:
+        lines.append(f"Dialogue: 0,{_ass_time(cue.start_us)},{_ass_time(cue.end_us)},Default,,0,0,0,,{_ass_text(cue.text)}")
+    return '\n'.join(lines) + '\n'
+
+def format_srt(cues: Sequence[CaptionCue]) -> str:
+    """자막 조각들을 SRT 자막으로 만듭니다.
+
+    Args:
+        cues: 자막 조각 목록
+
+    Returns:
+        str: SRT 자막 내용
+    """
+    return ''.join(
+        f"{index}\n{_srt_time(cue.start_us)} --> {_srt_time(cue.end_us)}\n{cue.text}\n\n"
+        for index, cue in enumerate(cues, start=1)
+    )
+
+def write_captions(path: str, cues: Sequence[CaptionCue], style: CaptionStyle) -> str:
+    """확장자(.ass 또는 .srt)에 맞는 형식으로 자막 파일을 씁니다.
+
+    Args:
+        path: 자막 파일 경로
+        cues: 자막 조각 목록
+        style: 자막 스타일 (ASS에만 적용)
+
+    Returns:
+        str: 자막 파일 경로
+    """
+    content = format_srt(cues) if path.lower().endswith('.srt') else format_ass(cues, style)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+@lru_cache(maxsize=None)
+def subtitles_filter_available(ffmpeg_cmd: str = 'ffmpeg') -> bool:
+    """ffmpeg에 자막을 그리는 subtitles 필터(libass)가 있는지 확인합니다.
+
+    프로세스 안에서 ffmpeg 실행 파일별로 한 번만 확인합니다.
+
+    Args:
+        ffmpeg_cmd: ffmpeg 실행 파일
+
+    Returns:
+        bool: subtitles 필터를 쓸 수 있으면 True
+    """
+    try:
+        result = subprocess.run(
+            [ffmpeg_cmd, '-hide_banner', '-filters'],
+            capture_output=True, text=True, timeout=30
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"ffmpeg 필터 목록을 확인할 수 없어 자막을 끕니다: {str(e)}")
+        return False
+    available = any(
+        len(columns) > 1 and columns[1] == 'subtitles'
+        for columns in (line.split() for line in result.stdout.splitlines())
+    )
+    if not available:
+        logger.warning("ffmpeg에 subtitles 필터(libass)가 없어 자막 없이 렌더링합니다")
+    return available
+
+@lru_cache(maxsize=None)
+def resolve_caption_font(font: str) -> Tuple[str, Optional[str]]:
+    """자막 폰트 설정을 (글꼴 이름, 폰트 디렉토리)로 바꿉니다.
+
+    폰트 파일 경로이면 파일의 글꼴 이름과 그 디렉토리를 libass에 넘기고,
+    글꼴 이름이면 fontconfig가 찾도록 디렉토리 없이 넘깁니다.
+
+    Args:
+        font: 글꼴 이름(예: 'Noto Sans CJK KR') 또는 한글을 지원하는 폰트 파일 경로
+
+    Returns:
+        Tuple[str, Optional[str]]: (글꼴 이름, 폰트 디렉토리)
+    """
+    if not os.path.isfile(font):
+        return font, None
+    from PIL import ImageFont
+    try:
+        family = ImageFont.truetype(font, 12).getname()[0]
+    except OSError:
+        logger.warning(f"자막 폰트를 읽을 수 없어 파일 이름을 글꼴 이름으로 사용합니다: {font}")
+        family = os.path.splitext(os.path.basename(font))[0]
+    return family, os.path.dirname(os.path.abspath(font))
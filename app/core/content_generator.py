@@ -1,27 +1,121 @@
 from app.utils.sheets_utils import SheetsUtils, TopicData
-from app.core.openai_client import OpenAIClient
-from app.core.elevenlabs_client import ElevenLabsClient
-from typing import Dict, Any
+from app.utils.sheets_write_buffer import SheetsFlushError
+from app.config import get_settings
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cached_property
+import threading
+import time
 import re
 import os
 import logging
 from googleapiclient.errors import HttpError
-from openai import OpenAIError
+
+# openai, elevenlabs 클라이언트 모듈은 가져오는 데 시간이 걸리므로 처음 사용할 때 가져옴
+if TYPE_CHECKING:
+    from app.core.openai_client import OpenAIClient
+    from app.core.elevenlabs_client import ElevenLabsClient
+    from app.core.script_batch import BatchManifest, OpenAIBatchBackend
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+# 처리 단계 이름
+STAGE_SCRIPT = 'script'
+STAGE_VOICE = 'voice'
+
+@dataclass
+class TopicFailure:
+    """처리에 실패한 주제 정보를 저장하는 데이터 클래스"""
+    row: int
+    topic: str
+    stage: str
+    error: str
+
+@dataclass
+class ProcessingSummary:
+    """한 번의 주제 처리 실행 결과를 요약하는 데이터 클래스"""
+    total: int = 0
+    scripts_generated: int = 0
+    voices_generated: int = 0
+    skipped: int = 0
+    failures: List[TopicFailure] = field(default_factory=list)
+    elapsed: float = 0.0
+    max_workers: int = 1
+    script_cache_hits: int = 0
+    script_requests_coalesced: int = 0
+
+    @property
+    def succeeded(self) -> int:
+        """성공적으로 처리된 주제 수"""
+        return self.scripts_generated + self.voices_generated
+
+    @property
+    def failed(self) -> int:
+        """처리에 실패한 주제 수"""
+        return len(self.failures)
+
+    @property
+    def throughput(self) -> float:
+        """분당 처리된 주제 수 (성공 + 실패)"""
+        if self.elapsed <= 0:
+            return 0.0
+        return (self.succeeded + self.failed) / self.elapsed * 60
+
+    def to_dict(self) -> Dict[str, Any]:
+        """요약 정보를 딕셔너리로 변환합니다.
+
+        Returns:
+            Dict[str, Any]: 요약 정보
+        """
+        return {
+            'total': self.total,
+            'succeeded': self.succeeded,
+            'scripts_generated': self.scripts_generated,
+            'voices_generated': self.voices_generated,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'failures': [failure.__dict__ for failure in self.failures],
+            'elapsed': round(self.elapsed, 3),
+            'throughput_per_minute': round(self.throughput, 2),
+            'max_workers': self.max_workers,
+            'script_cache_hits': self.script_cache_hits,
+            'script_requests_coalesced': self.script_requests_coalesced
+        }
+
 class ContentGenerator:
     """콘텐츠 생성을 관리하는 클래스"""
     
     def __init__(self):
         """ContentGenerator 인스턴스를 초기화합니다."""
-        self.sheets_utils = SheetsUtils()
-        self.openai_client = OpenAIClient()
-        self.elevenlabs_client = ElevenLabsClient()
+        settings = get_settings()
         self.data_dir = "data"
         os.makedirs(self.data_dir, exist_ok=True)
 
+        # 워커 풀 크기 및 외부 API별 동시 호출 제한
+        # (시트 쓰기는 버퍼에 모았다가 SheetsWriteBuffer.flush에서 한 번에 하나씩 기록하므로 따로 제한하지 않음)
+        self.max_workers = max(1, settings.pipeline_max_workers)
+        self._openai_limit = threading.BoundedSemaphore(max(1, settings.openai_concurrency))
+        self._elevenlabs_limit = threading.BoundedSemaphore(max(1, settings.elevenlabs_concurrency))
+
+    @cached_property
+    def sheets_utils(self) -> SheetsUtils:
+        """Google Sheets 유틸리티 (처음 사용할 때 인증하고 시트 정보를 조회)"""
+        return SheetsUtils()
+
+    @cached_property
+    def openai_client(self) -> 'OpenAIClient':
+        """OpenAI 클라이언트 (처음 사용할 때 생성)"""
+        from app.core.openai_client import OpenAIClient
+        return OpenAIClient()
+
+    @cached_property
+    def elevenlabs_client(self) -> 'ElevenLabsClient':
+        """ElevenLabs 클라이언트 (처음 사용할 때 생성)"""
+        from app.core.elevenlabs_client import ElevenLabsClient
+        return ElevenLabsClient()
+
     def _remove_section_tags(self, script: str) -> str:
         """스크립트에서 섹션 태그를 제거합니다.
 
@@ -58,12 +152,14 @@ class ContentGenerator:
             voice_file = os.path.join(topic_dir, "voice.mp3")
             logger.info(f"음성 파일 경로: {voice_file}")
 
-            # 음성 생성
+            # 음성 생성 (문장 단위로 합성하고 주제 디렉토리의 조각을 재사용하여 바뀐 문장만 합성)
             logger.info("ElevenLabs API 호출 시작")
-            self.elevenlabs_client.generate_audio(
-                text=topic_data.script,
-                output_path=voice_file
-            )
+            with self._elevenlabs_limit:
+                self.elevenlabs_client.generate_audio(
+                    text=topic_data.script,
+                    output_path=voice_file,
+                    segment_dir=topic_dir
+                )
             logger.info("음성 파일 생성 완료")
 
             # 스프레드시트 업데이트
@@ -75,12 +171,106 @@ class ContentGenerator:
             logger.error(f"음성 생성 실패: {str(e)}")
             raise Exception(f"Failed to generate voice: {str(e)}")
 
-    def process_pending_topics(self) -> None:
-        """대기 중인 모든 주제를 처리하고 스크립트를 생성합니다.
+    def _get_stage(self, topic_data: TopicData) -> Optional[str]:
+        """주제에 필요한 처리 단계를 결정합니다.
+
+        Args:
+            topic_data: 주제 데이터
+
+        Returns:
+            Optional[str]: 처리 단계 이름 (처리 조건 미충족 시 None)
+        """
+        # 스크립트가 없고 Data가 ✅인 경우 스크립트 생성
+        if not topic_data.script and topic_data.data_status == "✅":
+            return STAGE_SCRIPT
+        # 스크립트가 있고 Data가 ✅이고 Voice가 비어있는 경우 음성 생성
+        if topic_data.script and topic_data.data_status == "✅" and not topic_data.voice:
+            return STAGE_VOICE
+        return None
+
+    def _generate_script(self, topic_data: TopicData) -> None:
+        """주제에 대한 스크립트를 생성하고 스프레드시트에 기록합니다.
+
+        Args:
+            topic_data: 주제 데이터
 
         Raises:
-            ValueError: Google Sheets API 호출 실패 시
             Exception: OpenAI API 호출 실패 시
+            ValueError: Google Sheets API 호출 실패 시
+        """
+        from openai import OpenAIError
+
+        logger.info(f"스크립트 생성 시작: {topic_data.topic}")
+        content_data = {
+            'title': topic_data.topic,
+            'content': '',
+            'tags': []
+        }
+        try:
+            with self._openai_limit:
+                script = self.openai_client.generate_script(content_data)
+            cleaned_script = self._remove_section_tags(script)
+            self.sheets_utils.update_row(topic_data, cleaned_script)
+            logger.info(f"스크립트 생성 및 업데이트 완료: {topic_data.topic}")
+        except OpenAIError as e:
+            logger.error(f"Failed to generate script: {str(e)}")
+            raise Exception(f"Failed to generate script: {str(e)}")
+
+    def _process_topic(self, topic_data: TopicData, stage: str) -> None:
+        """단일 주제를 지정된 단계로 처리합니다.
+
+        Args:
+            topic_data: 주제 데이터
+            stage: 처리 단계 이름
+        """
+        logger.info(f"주제 처리 시작: {topic_data.topic}")
+        logger.info(f"현재 상태 - Script: {bool(topic_data.script)}, Data: {topic_data.data_status}, Voice: {topic_data.voice}")
+
+        if stage == STAGE_SCRIPT:
+            self._generate_script(topic_data)
+        elif stage == STAGE_VOICE:
+            logger.info("음성 생성 조건 충족")
+            self._generate_voice(topic_data)
+
+    def _record_flush_failure(self, summary: ProcessingSummary, error: SheetsFlushError,
+                              succeeded: List[Tuple[TopicData, str]]) -> None:
+        """시트 일괄 기록에 실패한 행의 주제를 요약에서 성공 대신 실패로 기록합니다.
+
+        Args:
+            summary: 처리 결과 요약
+            error: 일괄 기록 실패 (기록되지 않은 행 번호 포함)
+            succeeded: 처리에 성공한 (주제 데이터, 처리 단계) 목록
+        """
+        logger.error(f"시트 일괄 기록 실패 - 행 {len(error.rows)}개: {str(error)}")
+        unwritten = set(error.rows)
+        for topic_data, stage in succeeded:
+            if topic_data.row not in unwritten:
+                continue
+            if stage == STAGE_SCRIPT:
+                summary.scripts_generated -= 1
+            else:
+                summary.voices_generated -= 1
+            summary.failures.append(TopicFailure(
+                row=topic_data.row,
+                topic=topic_data.topic,
+                stage=stage,
+                error=str(error)
+            ))
+
+    def process_pending_topics(self, max_workers: Optional[int] = None) -> ProcessingSummary:
+        """대기 중인 모든 주제를 워커 풀에서 동시에 처리합니다.
+
+        한 주제의 실패는 나머지 주제의 처리를 중단시키지 않으며,
+        실패 내역은 반환되는 요약에 기록됩니다.
+
+        Args:
+            max_workers: 워커 풀 크기 (기본값: 설정값 pipeline_max_workers)
+
+        Returns:
+            ProcessingSummary: 처리량 및 실패 내역 요약
+
+        Raises:
+            ValueError: 대기 중인 주제 조회 실패 시 (시트 일괄 기록 실패는 해당 주제의 실패로 요약에 기록)
         """
         try:
             pending_topics = self.sheets_utils.get_pending_topics()
@@ -88,42 +278,229 @@ class ContentGenerator:
         except HttpError as e:
             logger.error(f"Failed to get pending topics: {str(e)}")
             raise ValueError(f"Failed to get pending topics: {str(e)}")
-        
+
+        workers = max(1, max_workers or self.max_workers)
+        summary = ProcessingSummary(total=len(pending_topics), max_workers=workers)
+        started_at = time.perf_counter()
+
+        jobs = []
         for topic_data in pending_topics:
-            try:
-                logger.info(f"주제 처리 시작: {topic_data.topic}")
-                logger.info(f"현재 상태 - Script: {bool(topic_data.script)}, Data: {topic_data.data_status}, Voice: {topic_data.voice}")
-
-                # 스크립트가 없고 Data가 ✅인 경우 스크립트 생성
-                if not topic_data.script and topic_data.data_status == "✅":
-                    logger.info("스크립트 생성 시작")
-                    content_data = {
-                        'title': topic_data.topic,
-                        'content': '',
-                        'tags': []
-                    }
+            stage = self._get_stage(topic_data)
+            if stage is None:
+                logger.info(f"처리 조건 미충족: {topic_data.topic}")
+                summary.skipped += 1
+            else:
+                jobs.append((topic_data, stage))
+
+        # 스크립트를 생성할 때만 OpenAI 클라이언트를 만들어 캐시 통계를 읽음 (음성만 만들 때는 만들지 않음)
+        cache_stats = None
+        if any(stage == STAGE_SCRIPT for _, stage in jobs):
+            cache_stats = self.openai_client.cache_stats()
+
+        # 워커들의 시트 쓰기는 버퍼에 모았다가 일괄 기록
+        succeeded: List[Tuple[TopicData, str]] = []
+        try:
+            with self.sheets_utils.batch(), \
+                    ThreadPoolExecutor(max_workers=workers, thread_name_prefix="topic") as executor:
+                futures = {
+                    executor.submit(self._process_topic, topic_data, stage): (topic_data, stage)
+                    for topic_data, stage in jobs
+                }
+                for future in as_completed(futures):
+                    topic_data, stage = futures[future]
                     try:
-                        script = self.openai_client.generate_script(content_data)
-                        cleaned_script = self._remove_section_tags(script)
-                        self.sheets_utils.update_row(topic_data, cleaned_script)
-                        logger.info("스크립트 생성 및 업데이트 완료")
-                    except OpenAIError as e:
-                        logger.error(f"Failed to generate script: {str(e)}")
-                        raise Exception(f"Failed to generate script: {str(e)}")
-                    except HttpError as e:
-                        logger.error(f"Failed to update row: {str(e)}")
-                        raise ValueError(f"Failed to update row: {str(e)}")
-
-                # 스크립트가 있고 Data가 ✅이고 Voice가 비어있는 경우 음성 생성
-                elif topic_data.script and topic_data.data_status == "✅" and not topic_data.voice:
-                    logger.info("음성 생성 조건 충족")
-                    self._generate_voice(topic_data)
-                else:
-                    logger.info("처리 조건 미충족")
-                
-            except Exception as e:
-                logger.error(f"Error processing topic {topic_data.topic}: {str(e)}")
-                raise
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing topic {topic_data.topic}: {str(e)}")
+                        summary.failures.append(TopicFailure(
+                            row=topic_data.row,
+                            topic=topic_data.topic,
+                            stage=stage,
+                            error=str(e)
+                        ))
+                        continue
+
+                    succeeded.append((topic_data, stage))
+                    if stage == STAGE_SCRIPT:
+                        summary.scripts_generated += 1
+                    else:
+                        summary.voices_generated += 1
+        except SheetsFlushError as e:
+            # 버퍼에 남은 변경만 실패로 기록하고 요약은 그대로 반환
+            self._record_flush_failure(summary, e, succeeded)
+
+        summary.elapsed = time.perf_counter() - started_at
+        if cache_stats is not None:
+            finished_stats = self.openai_client.cache_stats()
+            summary.script_cache_hits = finished_stats['hits'] - cache_stats['hits']
+            summary.script_requests_coalesced = finished_stats['coalesced'] - cache_stats['coalesced']
+        logger.info(
+            f"주제 처리 완료 - 전체: {summary.total}, 성공: {summary.succeeded}, "
+            f"실패: {summary.failed}, 건너뜀: {summary.skipped}, "
+            f"소요 시간: {summary.elapsed:.2f}초, 처리량: {summary.throughput:.1f}개/분, "
+            f"워커 수: {summary.max_workers}, 스크립트 캐시 적중: {summary.script_cache_hits}"
+        )
+        return summary
+
+    def submit_script_batch(self, backend: Optional['OpenAIBatchBackend'] = None) -> Optional[str]:
+        """스크립트가 필요한 모든 주제의 요청을 JSONL 배치 파일로 만들어 Batch API에 제출합니다.
+
+        제출 정보는 매니페스트 파일에 기록되므로 다른 프로세스에서도 apply_script_batch로
+        결과를 적용할 수 있습니다.
+
+        Args:
+            backend: 배치 백엔드 (기본값: OpenAI Batch API)
+
+        Returns:
+            Optional[str]: 매니페스트 파일 경로 (제출할 주제가 없으면 None)
+
+        Raises:
+            ValueError: 대기 중인 주제 조회 실패 시
+        """
+        from app.core.script_batch import BatchManifest, BatchRequest, OpenAIBatchBackend, batch_line
+
+        settings = get_settings()
+        backend = backend or OpenAIBatchBackend(self.openai_client.client)
+        try:
+            pending_topics = self.sheets_utils.get_pending_topics()
+        except HttpError as e:
+            logger.error(f"Failed to get pending topics: {str(e)}")
+            raise ValueError(f"Failed to get pending topics: {str(e)}")
+
+        topics = [topic_data for topic_data in pending_topics if self._get_stage(topic_data) == STAGE_SCRIPT]
+        if not topics:
+            logger.info("배치로 제출할 주제가 없습니다")
+            return None
+
+        os.makedirs(settings.openai_batch_dir, exist_ok=True)
+        name = time.strftime('scripts_%Y%m%d_%H%M%S')
+        manifest = BatchManifest(name=name, input_path=os.path.join(settings.openai_batch_dir, f"{name}.jsonl"))
+        with open(manifest.input_path, 'w', encoding='utf-8') as f:
+            for topic_data in topics:
+                key, body = self.openai_client.build_script_request({
+                    'title': topic_data.topic,
+                    'content': '',
+                    'tags': []
+                })
+                request = BatchRequest(
+                    custom_id=f"row-{topic_data.row}",
+                    row=topic_data.row,
+                    topic=topic_data.topic,
+                    cache_key=key
+                )
+                f.write(batch_line(request.custom_id, body) + '\n')
+                manifest.requests.append(request)
+
+        manifest.batch_id = backend.submit(manifest.input_path)
+        manifest_path = os.path.join(settings.openai_batch_dir, f"{name}.json")
+        manifest.save(manifest_path)
+        logger.info(f"스크립트 배치 제출 완료: {manifest.batch_id} - {len(manifest.requests)}개 요청")
+        return manifest_path
+
+    def _load_batch_output(self, manifest: 'BatchManifest', manifest_path: str,
+                           backend: 'OpenAIBatchBackend', wait: bool) -> str:
+        """배치 결과 파일 내용을 가져옵니다. 이미 받은 결과가 있으면 네트워크 없이 재사용합니다."""
+        if manifest.output_path and os.path.exists(manifest.output_path):
+            logger.info(f"저장된 배치 결과 재사용: {manifest.output_path}")
+            with open(manifest.output_path, encoding='utf-8') as f:
+                return f.read()
+
+        settings = get_settings()
+        if wait:
+            batch = backend.wait(manifest.batch_id, settings.openai_batch_poll_interval, settings.openai_batch_timeout)
+        else:
+            batch = backend.retrieve(manifest.batch_id)
+        if batch.get('status') != 'completed' or not batch.get('output_file_id'):
+            raise ValueError(f"Batch {manifest.batch_id} is not completed: {batch.get('status')}")
+
+        output = backend.download(batch['output_file_id'])
+        manifest.output_path = os.path.splitext(manifest.input_path)[0] + ".output.jsonl"
+        with open(manifest.output_path, 'w', encoding='utf-8') as f:
+            f.write(output)
+        manifest.save(manifest_path)
+        return output
+
+    def apply_script_batch(self, manifest_path: str, backend: Optional['OpenAIBatchBackend'] = None,
+                           wait: bool = True) -> ProcessingSummary:
+        """완료된 배치 결과를 시트에 일괄 기록합니다.
+
+        결과를 받는 동안 시트가 바뀌었을 수 있으므로, 같은 행에 같은 주제가 있고
+        아직 스크립트가 없는 경우에만 기록합니다.
+
+        Args:
+            manifest_path: submit_script_batch가 만든 매니페스트 파일 경로
+            backend: 배치 백엔드 (기본값: OpenAI Batch API)
+            wait: 배치가 끝날 때까지 기다릴지 여부
+
+        Returns:
+            ProcessingSummary: 처리 결과 요약
+
+        Raises:
+            ValueError: 배치가 완료되지 않았거나 시트 조회 실패 시 (시트 일괄 기록 실패는 요약에 기록)
+        """
+        from app.core.script_batch import BatchManifest, OpenAIBatchBackend, parse_batch_output
+
+        started_at = time.perf_counter()
+        manifest = BatchManifest.load(manifest_path)
+        output = self._load_batch_output(
+            manifest, manifest_path, backend or OpenAIBatchBackend(self.openai_client.client), wait
+        )
+        results = parse_batch_output(output)
+        summary = ProcessingSummary(total=len(manifest.requests))
+
+        try:
+            # 제출할 때 읽은 스냅샷은 오래되었을 수 있으므로 시트를 다시 읽은 뒤 비교
+            self.sheets_utils.refresh_snapshot()
+            topics = {topic_data.row: topic_data for topic_data in self.sheets_utils.get_pending_topics()}
+        except HttpError as e:
+            logger.error(f"Failed to get pending topics: {str(e)}")
+            raise ValueError(f"Failed to get pending topics: {str(e)}")
+
+        applied: List[Tuple[TopicData, str]] = []
+        try:
+            with self.sheets_utils.batch():
+                for request in manifest.requests:
+                    script, error = results.get(request.custom_id, (None, "No result in batch output"))
+                    if error:
+                        summary.failures.append(TopicFailure(request.row, request.topic, STAGE_SCRIPT, error))
+                        continue
+
+                    topic_data = topics.get(request.row)
+                    if topic_data is None or topic_data.topic != request.topic or topic_data.script:
+                        logger.info(f"시트가 변경되어 배치 결과를 건너뜀: {request.row}행 {request.topic}")
+                        summary.skipped += 1
+                        continue
+
+                    self.openai_client.store_script(request.cache_key, script)
+                    self.sheets_utils.update_row(topic_data, self._remove_section_tags(script))
+                    applied.append((topic_data, STAGE_SCRIPT))
+                    summary.scripts_generated += 1
+        except SheetsFlushError as e:
+            self._record_flush_failure(summary, e, applied)
+
+        summary.elapsed = time.perf_counter() - started_at
+        logger.info(
+            f"스크립트 배치 적용 완료 - 전체: {summary.total}, 성공: {summary.succeeded}, "
+            f"실패: {summary.failed}, 건너뜀: {summary.skipped}"
+        )
+        return summary
+
+    def process_pending_topics_batch(self, backend: Optional['OpenAIBatchBackend'] = None) -> ProcessingSummary:
+        """대기 중인 주제의 스크립트를 Batch API로 생성하고 결과를 시트에 일괄 기록합니다.
+
+        Args:
+            backend: 배치 백엔드 (기본값: OpenAI Batch API)
+
+        Returns:
+            ProcessingSummary: 처리 결과 요약
+
+        Raises:
+            ValueError: 시트 조회 실패 또는 배치가 완료되지 않은 경우
+        """
+        manifest_path = self.submit_script_batch(backend)
+        if manifest_path is None:
+            return ProcessingSummary()
+        return self.apply_script_batch(manifest_path, backend)
 
     def add_topic(self, topic: str) -> None:
         """새로운 주제를 스프레드시트에 추가합니다.
@@ -150,14 +527,16 @@ class ContentGenerator:
             logger.info("음성 상태 초기화 시작")
             pending_topics = self.sheets_utils.get_pending_topics()
             
-            for topic_data in pending_topics:
-                if topic_data.script and topic_data.data_status == "✅":
-                    logger.info(f"주제 음성 상태 초기화: {topic_data.topic}")
-                    try:
-                        self.sheets_utils.reset_voice_status(topic_data)
-                    except HttpError as e:
-                        logger.error(f"Failed to reset voice status: {str(e)}")
-                        raise Exception(f"Failed to reset voice status: {str(e)}")
+            try:
+                with self.sheets_utils.batch():
+                    for topic_data in pending_topics:
+                        if topic_data.script and topic_data.data_status == "✅":
+                            logger.info(f"주제 음성 상태 초기화: {topic_data.topic}")
+                            self.sheets_utils.reset_voice_status(topic_data)
+            except SheetsFlushError as e:
+                # 초기화는 버퍼에 쌓였다가 블록이 끝날 때 기록되므로 기록 실패는 여기서 발생
+                logger.error(f"Failed to reset voice status: {str(e)}")
+                raise Exception(f"Failed to reset voice status: {str(e)}")
             
             logger.info("음성 상태 초기화 완료")
             
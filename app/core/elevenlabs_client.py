@@ -1,95 +1,405 @@
 from elevenlabs import generate, set_api_key, Voice, VoiceSettings
 from app.config import get_settings
+from app.core.audio_cache import AudioCache
+from app.core.audio_concat import concat_audio
+from app.core.audio_metadata import mp3_duration_us
+from app.utils.rate_limiter import TokenBucket
+from app.core.voice_segments import VoiceSegment, VoiceSegmentStore
+from app.utils.text_utils import split_sentences
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+import asyncio
 import os
 import tempfile
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 음성 합성 모델 및 설정
+VOICE_MODEL = "eleven_multilingual_v2"
+VOICE_SETTINGS = {
+    'stability': 0.5,
+    'similarity_boost': 0.75,
+    'style': 0.0,
+    'use_speaker_boost': True,
+    'speed': 1.15  # 음성 속도 설정
+}
+
+# 비동기 스트리밍 시 생산자 스레드가 앞서 나갈 수 있는 최대 청크 수
+STREAM_QUEUE_SIZE = 32
+
+@lru_cache(maxsize=None)
+def get_tts_limits() -> Tuple[threading.BoundedSemaphore, TokenBucket]:
+    """프로세스 전체에서 공유하는 ElevenLabs 동시 요청 수 제한과 분당 요청 수 버킷을 가져옵니다.
+
+    여러 주제의 문장 조각이 동시에 합성되어도 계정의 동시 요청 한도를 넘지 않도록 합니다.
+
+    Returns:
+        Tuple[threading.BoundedSemaphore, TokenBucket]: (동시 요청 수 제한, 분당 요청 수 버킷)
+    """
+    settings = get_settings()
+    return (
+        threading.BoundedSemaphore(max(1, settings.tts_chunk_concurrency)),
+        TokenBucket(settings.tts_requests_per_minute)
+    )
+
 class ElevenLabsClient:
     def __init__(self):
         settings = get_settings()
         set_api_key(settings.elevenlabs_api_key)
         self.default_voice_id = "Xb7hH8MSUJpSbSDYk0k2"  # 기본 음성 ID (Rachel)
+        self.cache = AudioCache(settings.tts_cache_dir, settings.tts_cache_max_mb * 1024 * 1024)
+        self.streaming = settings.tts_streaming
+        self.stream_chunk_size = settings.tts_stream_chunk_size
+        self.chunked = settings.tts_chunked
+        self.chunk_concurrency = max(1, settings.tts_chunk_concurrency)
+
+    def _cache_key(self, text: str, voice_id: str = None) -> str:
+        """합성 요청의 캐시 키를 만듭니다.
+
+        Args:
+            text: 변환할 텍스트
+            voice_id: 사용할 음성 ID (기본값: None)
+
+        Returns:
+            str: 캐시 키
+        """
+        return AudioCache.make_key(text, voice_id or self.default_voice_id, VOICE_MODEL, VOICE_SETTINGS)
+
+    def _voice(self, voice_id: str = None) -> Voice:
+        """합성에 사용할 음성 객체를 만듭니다."""
+        return Voice(
+            voice_id=voice_id or self.default_voice_id,
+            settings=VoiceSettings(**VOICE_SETTINGS)
+        )
+
+    def _stream_to_cache(self, key: str, text: str, voice_id: str = None) -> Iterator[bytes]:
+        """ElevenLabs 스트리밍 응답을 받는 대로 캐시 임시 파일에 기록하며 청크를 반환합니다.
+
+        전체 응답을 받으면 임시 파일의 이름을 바꿔 캐시에 원자적으로 추가하고,
+        도중에 실패하거나 소비자가 순회를 멈추면 임시 파일을 삭제합니다.
+
+        Args:
+            key: 캐시 키
+            text: 변환할 텍스트
+            voice_id: 사용할 음성 ID (기본값: None)
+
+        Returns:
+            Iterator[bytes]: 오디오 청크
+        """
+        logger.info("ElevenLabs API 스트리밍 호출")
+        chunks = generate(
+            text=text,
+            voice=self._voice(voice_id),
+            model=VOICE_MODEL,
+            stream=True,
+            stream_chunk_size=self.stream_chunk_size
+        )
+        with self.cache.open_writer(key) as f:
+            for chunk in chunks:
+                if chunk:
+                    f.write(chunk)
+                    yield chunk
+
+    def iter_audio(self, text: str, voice_id: str = None) -> Iterator[bytes]:
+        """합성된 오디오를 청크 단위로 반환합니다.
+
+        캐시에 있으면 캐시 파일을, 없으면 ElevenLabs 스트리밍 응답을 그대로 전달합니다.
+
+        Args:
+            text: 변환할 텍스트
+            voice_id: 사용할 음성 ID (기본값: None)
+
+        Returns:
+            Iterator[bytes]: 오디오 청크
+        """
+        key = self._cache_key(text, voice_id)
+        path = self.cache.get(key)
+        if path:
+            logger.info(f"TTS 캐시 적중: {key[:12]}")
+            with open(path, 'rb') as f:
+                yield from iter(lambda: f.read(self.stream_chunk_size), b'')
+            return
+
+        yield from self._stream_to_cache(key, text, voice_id)
+
+    def _synthesize(self, text: str, voice_id: str = None, stream: Optional[bool] = None) -> str:
+        """텍스트를 음성으로 합성하여 캐시에 저장합니다.
+
+        같은 텍스트, 음성 ID, 모델, 음성 설정으로 합성한 적이 있으면 API를 호출하지 않습니다.
+
+        Args:
+            text: 변환할 텍스트
+            voice_id: 사용할 음성 ID (기본값: None)
+            stream: 스트리밍 모드 사용 여부 (기본값: 설정값 tts_streaming)
+
+        Returns:
+            str: 캐시 키
+        """
+        key = self._cache_key(text, voice_id)
+        if self.cache.get(key):
+            logger.info(f"TTS 캐시 적중: {key[:12]}")
+            return key
+
+        if self.streaming if stream is None else stream:
+            # 청크를 받는 대로 디스크에 기록하여 전체 오디오를 메모리에 올리지 않음
+            for _ in self._stream_to_cache(key, text, voice_id):
+                pass
+            return key
+
+        # 음성 생성
+        logger.info("ElevenLabs API 호출")
+        audio = generate(
+            text=text,
+            voice=self._voice(voice_id),
+            model=VOICE_MODEL
+        )
+        self.cache.put(key, audio)
+        return key
+
+    def _synthesize_limited(self, text: str, voice_id: str = None) -> str:
+        """동시 요청 수와 분당 요청 수 제한 안에서 텍스트를 합성합니다 (캐시 적중 시 제한 없이 반환).
+
+        Args:
+            text: 변환할 텍스트
+            voice_id: 사용할 음성 ID (기본값: None)
+
+        Returns:
+            str: 캐시 키
+        """
+        key = self._cache_key(text, voice_id)
+        if self.cache.get(key):
+            return key
+        concurrency, requests = get_tts_limits()
+        with concurrency:
+            requests.acquire()
+            return self._synthesize(text, voice_id)
+
+    def synthesize_sentences(self, sentences: List[str], voice_id: str = None) -> List[str]:
+        """문장들을 동시에 합성하여 캐시에 저장합니다.
+
+        문장마다 캐시 항목이 따로 있으므로, 일부 문장이 실패해도 다시 시도할 때는
+        실패한 문장만 합성합니다.
+
+        Args:
+            sentences: 합성할 문장 목록
+            voice_id: 사용할 음성 ID (기본값: None)
+
+        Returns:
+            List[str]: 입력 순서대로 문장별 캐시 파일 경로
+
+        Raises:
+            Exception: 문장 합성에 실패했거나 캐시 파일이 사라진 경우
+        """
+        workers = min(self.chunk_concurrency, len(sentences)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tts-chunk') as executor:
+            keys = list(executor.map(lambda sentence: self._synthesize_limited(sentence, voice_id), sentences))
+
+        paths = []
+        for key in keys:
+            path = self.cache.get(key)
+            if path is None:
+                raise Exception("Cached audio disappeared before it could be concatenated")
+            paths.append(path)
+        return paths
+
+    def synthesize_segments(self, sentences: List[str], segment_dir: str, voice_id: str = None) -> List[VoiceSegment]:
+        """주제 디렉토리의 문장 조각 중 바뀐 문장만 다시 합성합니다.
+
+        매니페스트에 같은 해시(문장 텍스트, 음성 ID, 모델, 음성 설정)의 조각이 있으면 그대로 쓰고,
+        없는 문장만 동시에 합성하여 조각으로 저장합니다. 스크립트에서 빠진 문장의 조각은 삭제합니다.
 
-    def generate_audio(self, text: str, output_path: str, voice_id: str = None) -> None:
+        Args:
+            sentences: 현재 스크립트의 문장 목록
+            segment_dir: 조각과 매니페스트를 저장할 주제 디렉토리
+            voice_id: 사용할 음성 ID (기본값: None)
+
+        Returns:
+            List[VoiceSegment]: 문장 순서대로 조각 정보
+
+        Raises:
+            Exception: 문장 합성에 실패한 경우 (이미 저장된 조각과 매니페스트는 바뀌지 않음)
+        """
+        store = VoiceSegmentStore(segment_dir)
+        stored = store.load()
+        keys = [self._cache_key(sentence, voice_id) for sentence in sentences]
+        missing = {key: sentence for key, sentence in zip(keys, sentences) if key not in stored}
+        logger.info(f"문장 조각 재사용 {len(keys) - len(missing)}개, 새로 합성 {len(missing)}개")
+
+        if missing:
+            paths = self.synthesize_sentences(list(missing.values()), voice_id)
+            for (key, sentence), path in zip(missing.items(), paths):
+                store.add(key, path)
+                stored[key] = VoiceSegment(key=key, text=sentence, duration_us=mp3_duration_us(path) or 0)
+
+        segments = [stored[key] for key in keys]
+        store.save(segments)
+        return segments
+
+    def generate_audio_chunked(self, text: str, output_path: str, voice_id: str = None,
+                               segment_dir: Optional[str] = None) -> List[int]:
+        """텍스트를 문장 단위로 나눠 동시에 합성한 뒤 다시 인코딩하지 않고 이어 붙여 저장합니다.
+
+        전체 소요 시간은 가장 긴 문장의 합성 시간에 가까워지고, 이어 붙이기는
+        스트림 복사이므로 음질 손실이나 인코딩 시간이 없습니다. segment_dir를 주면
+        문장 조각을 그 디렉토리에 보관하여, 스크립트를 고친 뒤에는 바뀐 문장만 다시 합성합니다.
+
+        Args:
+            text: 변환할 텍스트 (섹션 태그를 제거한 스크립트)
+            output_path: 저장할 파일 경로
+            voice_id: 사용할 음성 ID (기본값: None)
+            segment_dir: 문장 조각을 보관할 주제 디렉토리 (기본값: None, 공유 TTS 캐시만 사용)
+
+        Returns:
+            List[int]: 문장별 재생 시간(마이크로초) (자막 시각 계산용)
+
+        Raises:
+            Exception: 음성 생성 실패 시
+        """
+        try:
+            sentences = split_sentences(text)
+            if not sentences:
+                raise ValueError("Text has no sentences to synthesize")
+            logger.info(f"문장 단위 음성 생성 시작 - 문장 수: {len(sentences)}")
+
+            if segment_dir:
+                segments = self.synthesize_segments(sentences, segment_dir, voice_id)
+                store = VoiceSegmentStore(segment_dir)
+                concat_audio([store.path_for(segment.key) for segment in segments], output_path)
+                durations = [segment.duration_us for segment in segments]
+            else:
+                paths = self.synthesize_sentences(sentences, voice_id)
+                concat_audio(paths, output_path)
+                durations = [mp3_duration_us(path) or 0 for path in paths]
+
+            logger.info(f"음성 파일 생성 완료: {output_path}")
+            return durations
+
+        except Exception as e:
+            logger.error(f"음성 생성 실패: {str(e)}")
+            raise Exception(f"Failed to generate voice with ElevenLabs: {str(e)}")
+
+    def generate_audio(self, text: str, output_path: str, voice_id: str = None, stream: Optional[bool] = None,
+                       chunked: Optional[bool] = None, segment_dir: Optional[str] = None) -> Optional[List[int]]:
         """텍스트를 음성으로 변환하여 파일로 저장합니다.
 
         Args:
             text: 변환할 텍스트
             output_path: 저장할 파일 경로
             voice_id: 사용할 음성 ID (기본값: None)
+            stream: 스트리밍 모드 사용 여부 (기본값: 설정값 tts_streaming)
+            chunked: 문장 단위 병렬 합성 사용 여부 (기본값: segment_dir가 있으면 True, 없으면 설정값 tts_chunked)
+            segment_dir: 문장 조각을 보관할 주제 디렉토리 (주면 문장 단위로 합성하여 바뀐 문장만 다시 합성)
+
+        Returns:
+            Optional[List[int]]: 문장 단위로 합성한 경우 문장별 재생 시간(마이크로초), 아니면 None
 
         Raises:
             Exception: 음성 생성 실패 시
         """
+        if chunked is None:
+            chunked = bool(segment_dir) or self.chunked
+        elif segment_dir and not chunked:
+            logger.warning(f"문장 단위 합성을 끄면 문장 조각을 사용하지 않습니다: {segment_dir}")
+        if chunked:
+            return self.generate_audio_chunked(text, output_path, voice_id, segment_dir)
+
         try:
             logger.info(f"음성 생성 시작 - 텍스트 길이: {len(text)}")
-            
-            # 음성 설정
-            voice_settings = VoiceSettings(
-                stability=0.5,
-                similarity_boost=0.75,
-                style=0.0,
-                use_speaker_boost=True,
-                speed=1.15  # 음성 속도 설정
-            )
-
-            # 음성 생성
-            logger.info("ElevenLabs API 호출")
-            audio = generate(
-                text=text,
-                voice=Voice(
-                    voice_id=voice_id or self.default_voice_id,
-                    settings=voice_settings
-                ),
-                model="eleven_multilingual_v2"
-            )
+
+            key = self._synthesize(text, voice_id, stream)
 
             # 오디오 파일 저장
             logger.info(f"음성 파일 저장: {output_path}")
-            with open(output_path, "wb") as f:
-                f.write(audio)
+            if not self.cache.copy_to(key, output_path):
+                raise Exception("Cached audio disappeared before it could be copied")
             
             logger.info("음성 파일 생성 완료")
+            return None
 
         except Exception as e:
             logger.error(f"음성 생성 실패: {str(e)}")
             raise Exception(f"Failed to generate voice with ElevenLabs: {str(e)}")
 
     async def generate_voice(self, text: str, voice_id: str = None) -> str:
-        try:
-            # 임시 파일 생성
-            temp_dir = tempfile.gettempdir()
-            output_file = os.path.join(temp_dir, f"voice_{hash(text)}.mp3")
-
-            # 음성 설정
-            voice_settings = VoiceSettings(
-                stability=0.5,
-                similarity_boost=0.75,
-                style=0.0,
-                use_speaker_boost=True,
-                speed=1.15  # 음성 속도 설정
-            )
-
-            # 음성 생성
-            audio = generate(
-                text=text,
-                voice=Voice(
-                    voice_id=voice_id or self.default_voice_id,
-                    settings=voice_settings
-                ),
-                model="eleven_multilingual_v2"
-            )
+        output_file, _ = await self.generate_timed_voice(text, voice_id)
+        return output_file
 
-            # 오디오 파일 저장
-            with open(output_file, "wb") as f:
-                f.write(audio)
+    async def generate_timed_voice(self, text: str, voice_id: str = None,
+                                   chunked: Optional[bool] = None) -> Tuple[str, Optional[List[int]]]:
+        """음성 파일을 만들고, 문장 단위로 합성했으면 문장별 재생 시간도 함께 반환합니다.
 
-            return output_file
+        Args:
+            text: 변환할 텍스트
+            voice_id: 사용할 음성 ID (기본값: None)
+            chunked: 문장 단위 병렬 합성 사용 여부 (기본값: 설정값 tts_chunked)
 
-        except Exception as e:
-            raise Exception(f"Failed to generate voice with ElevenLabs: {str(e)}")
+        Returns:
+            Tuple[str, Optional[List[int]]]: (음성 파일 경로, 문장별 재생 시간(마이크로초) 또는 None)
+
+        Raises:
+            Exception: 음성 생성 실패 시
+        """
+        # 요청 내용 해시로 파일 이름을 정해 프로세스가 달라도 같은 경로를 사용
+        key = self._cache_key(text, voice_id)
+        output_file = os.path.join(tempfile.gettempdir(), f"voice_{key[:16]}.mp3")
+
+        # 합성과 파일 쓰기는 블로킹이므로 스레드에서 실행하여 이벤트 루프와 다른 음성 워커를 막지 않음
+        durations = await asyncio.to_thread(self.generate_audio, text, output_file, voice_id, None, chunked)
+
+        return output_file, durations
+
+    async def astream_audio(self, text: str, voice_id: str = None) -> AsyncIterator[bytes]:
+        """합성 중인 오디오 청크를 도착하는 대로 반환하는 비동기 이터레이터입니다.
+
+        합성이 끝나기 전에 영상 단계가 길이 확인이나 먹싱을 시작할 수 있도록
+        블로킹 스트리밍 호출은 별도 스레드에서 실행하고 이벤트 루프는 막지 않습니다.
+
+        Args:
+            text: 변환할 텍스트
+            voice_id: 사용할 음성 ID (기본값: None)
+
+        Returns:
+            AsyncIterator[bytes]: 오디오 청크
+
+        Raises:
+            Exception: 음성 생성 실패 시
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        cancelled = threading.Event()
+        finished = object()
+
+        def produce() -> None:
+            chunks = self.iter_audio(text, voice_id)
+            try:
+                for chunk in chunks:
+                    if cancelled.is_set():
+                        break
+                    asyncio.run_coroutine_threadsafe(queue.put(chunk), loop).result()
+            except Exception as e:
+                asyncio.run_coroutine_threadsafe(queue.put(e), loop).result()
+            finally:
+                chunks.close()
+                asyncio.run_coroutine_threadsafe(queue.put(finished), loop)
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    raise Exception(f"Failed to generate voice with ElevenLabs: {str(item)}")
+                yield item
+        finally:
+            # 소비자가 중간에 멈춘 경우 생산자 스레드가 막히지 않도록 큐를 비움
+            cancelled.set()
+            while not queue.empty():
+                queue.get_nowait()
+            await producer
 
     async def list_voices(self) -> list:
         try:
@@ -104,4 +414,4 @@ class ElevenLabsClient:
                 for voice in available_voices
             ]
         except Exception as e:
-            raise Exception(f"Failed to list voices from ElevenLabs: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Failed to list voices from ElevenLabs: {str(e)}")
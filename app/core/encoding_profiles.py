@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+@dataclass(frozen=True)
+class EncodingProfile:
+    """libx264/AAC 인코딩 설정 묶음
+
+    화질은 CRF로 정하고, 업로드용 프로필은 maxrate/bufsize로 순간 비트레이트만 제한합니다.
+    """
+    name: str
+    preset: str
+    crf: int
+    audio_bitrate: str
+    gop_seconds: float
+    maxrate: Optional[str] = None
+    bufsize: Optional[str] = None
+    b_frames: Optional[int] = None
+
+    def output_options(self, fps: int) -> Dict[str, Any]:
+        """ffmpeg.output에 넘길 인코딩 옵션을 만듭니다.
+
+        Args:
+            fps: 출력 프레임 레이트
+
+        Returns:
+            Dict[str, Any]: ffmpeg-python 출력 옵션
+        """
+        gop = max(1, round(fps * self.gop_seconds))
+        options: Dict[str, Any] = {
+            'vcodec': 'libx264',
+            'preset': self.preset,
+            'crf': self.crf,
+            # 정지 이미지 위주의 영상에 맞춘 x264 튜닝
+            'tune': 'stillimage',
+            'pix_fmt': 'yuv420p',
+            'g': gop,
+            'keyint_min': gop,
+            'sc_threshold': 0,
+            'acodec': 'aac',
+            'audio_bitrate': self.audio_bitrate,
+            'movflags': 'faststart',
+        }
+        if self.maxrate:
+            options['maxrate'] = self.maxrate
+            options['bufsize'] = self.bufsize or self.maxrate
+        if self.b_frames is not None:
+            options['bf'] = self.b_frames
+        return options
+
+# 미리 정의된 인코딩 프로필
+ENCODING_PROFILES: Dict[str, EncodingProfile] = {
+    # 미리보기용: 가장 빠른 프리셋, 키프레임 간격을 길게
+    'draft': EncodingProfile(
+        name='draft',
+        preset='ultrafast',
+        crf=30,
+        audio_bitrate='128k',
+        gop_seconds=10
+    ),
+    # 유튜브 쇼츠 업로드용: 유튜브 권장 인코딩(closed GOP, 프레임 레이트의 절반, B-프레임 2개)
+    'publish': EncodingProfile(
+        name='publish',
+        preset='veryfast',
+        crf=21,
+        audio_bitrate='192k',
+        gop_seconds=0.5,
+        maxrate='8M',
+        bufsize='16M',
+        b_frames=2
+    ),
+    # 보관용: 느린 프리셋과 낮은 CRF로 화질 우선
+    'archive': EncodingProfile(
+        name='archive',
+        preset='slow',
+        crf=16,
+        audio_bitrate='256k',
+        gop_seconds=5
+    ),
+}
+
+def get_profile(name: str) -> EncodingProfile:
+    """이름으로 인코딩 프로필을 가져옵니다.
+
+    Args:
+        name: 프로필 이름 ('draft', 'publish', 'archive')
+
+    Returns:
+        EncodingProfile: 인코딩 프로필
+
+    Raises:
+        ValueError: 알 수 없는 프로필인 경우
+    """
+    try:
+        return ENCODING_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown encoding profile: {name}")
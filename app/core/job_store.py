@@ -0,0 +1,318 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+
+# 영상 생성 단계와 진행률 가중치 (합계 100)
+JOB_STAGES = {
+    'fetch': 5.0,
+    'script': 15.0,
+    'voice': 20.0,
+    'video': 40.0,
+    'upload': 20.0,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    stage TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    request TEXT NOT NULL,
+    artifacts TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created_at ON jobs (status, created_at DESC);
+CREATE TABLE IF NOT EXISTS job_stages (
+    job_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    error TEXT,
+    PRIMARY KEY (job_id, stage)
+);
+"""
+
+class JobStore:
+    """영상 생성 작업의 상태, 단계별 진행률, 소요 시간, 산출물을 저장하는 SQLite 작업 저장소
+
+    WAL 모드를 사용하므로 상태 조회(읽기)가 파이프라인의 기록(쓰기)에 막히지 않으며,
+    여러 프로세스가 같은 파일을 공유할 수 있습니다. 조회는 모두 인덱스를 타는 쿼리입니다.
+    """
+
+    def __init__(self, path: str):
+        """JobStore 인스턴스를 초기화합니다.
+
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+        """
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """처음 사용할 때 데이터베이스를 열고 스키마를 만듭니다. 잠금을 잡은 상태에서 호출합니다."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        """쓰기 쿼리 하나를 트랜잭션으로 실행합니다."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(sql, params)
+
+    def create(self, request: Dict[str, Any]) -> str:
+        """대기 상태의 작업을 만듭니다.
+
+        Args:
+            request: 작업 요청 내용
+
+        Returns:
+            str: 작업 ID
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (job_id, status, request, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, JOB_QUEUED, json.dumps(request, ensure_ascii=False), now, now)
+        )
+        return job_id
+
+    def start_stage(self, job_id: str, stage: str) -> None:
+        """작업의 단계를 시작합니다.
+
+        Args:
+            job_id: 작업 ID
+            stage: 단계 이름
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO job_stages (job_id, stage, status, started_at) VALUES (?, ?, ?, ?)",
+                    (job_id, stage, JOB_RUNNING, now)
+                )
+                conn.execute(
+                    "UPDATE jobs SET status = ?, stage = ?, updated_at = ? WHERE job_id = ?",
+                    (JOB_RUNNING, stage, now, job_id)
+                )
+
+    def finish_stage(self, job_id: str, stage: str, artifacts: Optional[Dict[str, Any]] = None) -> None:
+        """작업의 단계를 완료하고 진행률과 산출물을 갱신합니다.
+
+        Args:
+            job_id: 작업 ID
+            stage: 단계 이름
+            artifacts: 이 단계에서 만든 산출물 (기존 산출물에 병합)
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE job_stages SET status = ?, finished_at = ? WHERE job_id = ? AND stage = ?",
+                    (JOB_COMPLETED, now, job_id, stage)
+                )
+                row = conn.execute("SELECT artifacts FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                merged = json.loads(row['artifacts']) if row else {}
+                merged.update(artifacts or {})
+                finished = [
+                    stage_row['stage'] for stage_row in conn.execute(
+                        "SELECT stage FROM job_stages WHERE job_id = ? AND status = ?", (job_id, JOB_COMPLETED)
+                    )
+                ]
+                progress = min(100.0, sum(JOB_STAGES.get(name, 0.0) for name in finished))
+                conn.execute(
+                    "UPDATE jobs SET progress = ?, artifacts = ?, updated_at = ? WHERE job_id = ?",
+                    (progress, json.dumps(merged, ensure_ascii=False), now, job_id)
+                )
+
+    def report_progress(self, job_id: str, stage: str, fraction: float) -> None:
+        """진행 중인 단계의 부분 진행률을 전체 진행률에 반영합니다.
+
+        Args:
+            job_id: 작업 ID
+            stage: 진행 중인 단계 이름
+            fraction: 단계 안에서의 진행률 (0~1)
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                finished = [
+                    row['stage'] for row in conn.execute(
+                        "SELECT stage FROM job_stages WHERE job_id = ? AND status = ?", (job_id, JOB_COMPLETED)
+                    )
+                ]
+                progress = sum(JOB_STAGES.get(name, 0.0) for name in finished)
+                progress += JOB_STAGES.get(stage, 0.0) * min(1.0, max(0.0, fraction))
+                conn.execute(
+                    "UPDATE jobs SET progress = ?, updated_at = ? WHERE job_id = ?",
+                    (min(100.0, progress), now, job_id)
+                )
+
+    def complete(self, job_id: str, message: Optional[str] = None) -> None:
+        """작업을 완료 상태로 바꿉니다.
+
+        Args:
+            job_id: 작업 ID
+            message: 완료 메시지
+        """
+        now = time.time()
+        self._execute(
+            "UPDATE jobs SET status = ?, progress = 100, message = ?, updated_at = ?, finished_at = ? "
+            "WHERE job_id = ?",
+            (JOB_COMPLETED, message, now, now, job_id)
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        """작업과 진행 중이던 단계를 실패 상태로 바꿉니다.
+
+        Args:
+            job_id: 작업 ID
+            error: 오류 메시지
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE job_stages SET status = ?, finished_at = ?, error = ? "
+                    "WHERE job_id = ? AND status = ?",
+                    (JOB_FAILED, now, error, job_id, JOB_RUNNING)
+                )
+                conn.execute(
+                    "UPDATE jobs SET status = ?, message = ?, updated_at = ?, finished_at = ? WHERE job_id = ?",
+                    (JOB_FAILED, error, now, now, job_id)
+                )
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """jobs 테이블의 행을 딕셔너리로 변환합니다."""
+        finished_at = row['finished_at']
+        return {
+            'job_id': row['job_id'],
+            'status': row['status'],
+            'stage': row['stage'],
+            'progress': row['progress'],
+            'message': row['message'],
+            'request': json.loads(row['request']),
+            'artifacts': json.loads(row['artifacts']),
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at'],
+            'finished_at': finished_at,
+            'elapsed': (finished_at or time.time()) - row['created_at']
+        }
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태와 단계별 소요 시간을 조회합니다.
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            Optional[Dict[str, Any]]: 작업 정보 (없으면 None)
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            stages = conn.execute(
+                "SELECT stage, status, started_at, finished_at, error FROM job_stages "
+                "WHERE job_id = ? ORDER BY started_at",
+                (job_id,)
+            ).fetchall()
+
+        job = self._to_dict(row)
+        job['stages'] = [
+            {
+                'stage': stage['stage'],
+                'status': stage['status'],
+                'started_at': stage['started_at'],
+                'finished_at': stage['finished_at'],
+                'duration': (stage['finished_at'] - stage['started_at']) if stage['finished_at'] else None,
+                'error': stage['error']
+            }
+            for stage in stages
+        ]
+        return job
+
+    def history(self, limit: int = 50, before: Optional[float] = None,
+                status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """최근 작업 목록을 생성 시각 역순으로 조회합니다.
+
+        OFFSET 대신 생성 시각 커서(before)로 페이지를 나누므로 작업이 많아도 일정하게 빠릅니다.
+
+        Args:
+            limit: 최대 개수
+            before: 이 시각보다 먼저 만들어진 작업만 조회 (이전 페이지 마지막 항목의 created_at)
+            status: 상태 필터
+
+        Returns:
+            List[Dict[str, Any]]: 작업 정보 목록
+        """
+        clauses = []
+        params: List[Any] = []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if before is not None:
+            clauses.append("created_at < ?")
+            params.append(before)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        params.append(max(1, limit))
+
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT * FROM jobs {where}ORDER BY created_at DESC LIMIT ?", params
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def close(self) -> None:
+        """데이터베이스 연결을 닫습니다."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+@lru_cache(maxsize=None)
+def get_job_store(path: str) -> JobStore:
+    """데이터베이스 경로별로 프로세스 전체에서 공유하는 작업 저장소를 가져옵니다.
+
+    Args:
+        path: SQLite 데이터베이스 파일 경로
+
+    Returns:
+        JobStore: 작업 저장소
+    """
+    return JobStore(path)
@@ -1,61 +1,391 @@
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from app.config import get_settings
-from typing import Dict, Any
+from app.core.script_cache import ScriptCache, get_script_cache
+from app.core.script_package import SCRIPT_PACKAGE_SCHEMA, ScriptPackage
+from app.utils.rate_limiter import TokenBucket
+from app.utils.single_flight import AsyncSingleFlight, SingleFlight
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
+import asyncio
+import httpx
+import json
+import logging
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# 스크립트 생성 모델 및 요청 설정
+SCRIPT_MODEL = "gpt-4-turbo-preview"
+SCRIPT_SYSTEM_PROMPT = "You are a professional YouTube shorts script writer. Always write in Korean and focus on delivering educational content in an engaging way. Use [INTRO], [BODY], and [OUTRO] section markers."
+SCRIPT_MAX_TOKENS = 1000
+SCRIPT_TEMPERATURE = 0.7
+
+# 스크립트 패키지(스크립트 + 해시태그 + 제목 + 설명)를 한 번에 받는 JSON 모드 요청 설정
+PACKAGE_MAX_TOKENS = 1500
+PACKAGE_SYSTEM_PROMPT = (
+    SCRIPT_SYSTEM_PROMPT
+    + " Respond only with a JSON object that matches this JSON schema: "
+    + json.dumps(SCRIPT_PACKAGE_SCHEMA, ensure_ascii=False)
+)
+PACKAGE_INSTRUCTIONS = (
+    "스크립트의 각 섹션은 intro, body, outro 필드에 섹션 태그 없이 작성하고, "
+    "hashtags에는 유튜브 쇼츠에 적합한 해시태그 5-10개, "
+    "title에는 유튜브 영상 제목, description에는 영상 설명을 JSON으로 작성해주세요."
+)
+
+# 같은 스크립트 요청의 동시 호출을 하나로 합침 (프로세스 전체에서 공유)
+_script_flights = SingleFlight()
+_async_script_flights = AsyncSingleFlight()
+
+# 이벤트 루프별로 공유하는 비동기 클라이언트 (연결 풀은 루프에 묶임)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+def _pool_limits() -> httpx.Limits:
+    """OpenAI 호출에 사용할 연결 풀 크기"""
+    max_connections = max(1, get_settings().openai_max_connections)
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+
+@lru_cache(maxsize=None)
+def get_sync_client() -> OpenAI:
+    """프로세스 전체에서 연결 풀을 공유하는 동기 OpenAI 클라이언트를 가져옵니다.
+
+    Returns:
+        OpenAI: 동기 클라이언트
+    """
+    settings = get_settings()
+    return OpenAI(api_key=settings.openai_api_key, http_client=httpx.Client(limits=_pool_limits()))
+
+def get_async_client() -> AsyncOpenAI:
+    """현재 이벤트 루프에서 연결 풀을 공유하는 비동기 OpenAI 클라이언트를 가져옵니다.
+
+    Returns:
+        AsyncOpenAI: 비동기 클라이언트
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        settings = get_settings()
+        client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=httpx.AsyncClient(limits=_pool_limits())
+        )
+        _async_clients[loop] = client
+    return client
+
+@lru_cache(maxsize=None)
+def get_rate_limits() -> Tuple[TokenBucket, TokenBucket]:
+    """프로세스 전체에서 공유하는 OpenAI 요청 수/토큰 수 속도 제한기를 가져옵니다.
+
+    Returns:
+        Tuple[TokenBucket, TokenBucket]: (분당 요청 수, 분당 토큰 수) 버킷
+    """
+    settings = get_settings()
+    return TokenBucket(settings.openai_requests_per_minute), TokenBucket(settings.openai_tokens_per_minute)
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """요청이 사용할 토큰 수를 넉넉하게 추정합니다.
+
+    한국어는 대략 글자당 1토큰이므로 글자 수를 프롬프트 토큰으로 보고,
+    응답 최대 토큰을 더합니다. 실제 사용량은 응답을 받은 뒤 보정합니다.
+
+    Args:
+        messages: 채팅 메시지 목록
+        max_tokens: 응답 최대 토큰 수
+
+    Returns:
+        int: 추정 토큰 수
+    """
+    return sum(len(message['content']) for message in messages) + max_tokens
 
 class OpenAIClient:
     def __init__(self):
         settings = get_settings()
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = get_sync_client()
+        self.request_limit, self.token_limit = get_rate_limits()
+        self.cache: Optional[ScriptCache] = None
+        if settings.script_cache_enabled:
+            self.cache = get_script_cache(
+                settings.script_cache_path,
+                settings.script_cache_ttl,
+                settings.script_cache_max_entries
+            )
+
+    def cache_stats(self) -> Dict[str, int]:
+        """스크립트 캐시 적중 수와 하나로 합쳐진 동시 요청 수를 반환합니다.
+
+        Returns:
+            Dict[str, int]: hits, misses, coalesced
+        """
+        stats = dict(self.cache.stats) if self.cache is not None else {'hits': 0, 'misses': 0}
+        stats['coalesced'] = _script_flights.coalesced + _async_script_flights.coalesced
+        return stats
+
+    def _script_messages(self, content_data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """스크립트 생성 요청 메시지를 만듭니다."""
+        settings = get_settings()
+        # 프롬프트 구성
+        prompt = settings.openai_prompt_template.format(
+            title=content_data.get('title', '')
+        )
+        return [
+            {"role": "system", "content": SCRIPT_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _settle_tokens(self, estimated: int, response: Any) -> None:
+        """추정한 토큰 수와 실제 사용량의 차이를 버킷에 돌려줍니다."""
+        usage = getattr(response, 'usage', None)
+        total_tokens = getattr(usage, 'total_tokens', None)
+        if isinstance(total_tokens, int):
+            self.token_limit.refund(estimated - total_tokens)
+
+    def _package_messages(self, content_data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """스크립트 패키지(스크립트 + 해시태그 + 제목 + 설명) 요청 메시지를 만듭니다."""
+        messages = self._script_messages(content_data)
+        details = [
+            f"{label}: {value}"
+            for label, value in (
+                ('내용', content_data.get('content', '')),
+                ('기존 태그', ', '.join(content_data.get('tags', [])))
+            )
+            if value
+        ]
+        messages[0] = {"role": "system", "content": PACKAGE_SYSTEM_PROMPT}
+        messages[1] = {
+            "role": "user",
+            "content": '\n'.join([messages[1]['content'], *details, PACKAGE_INSTRUCTIONS])
+        }
+        return messages
+
+    def _script_cache_key(self, messages: List[Dict[str, str]], max_tokens: int = SCRIPT_MAX_TOKENS) -> str:
+        """스크립트 요청의 캐시 키를 만듭니다."""
+        return ScriptCache.make_key(
+            SCRIPT_MODEL,
+            messages[0]['content'],
+            messages[1]['content'],
+            SCRIPT_TEMPERATURE,
+            max_tokens
+        )
+
+    def _cached_script(self, key: str) -> Optional[str]:
+        """캐시된 응답을 가져옵니다. 캐시를 사용하지 않으면 None을 반환합니다."""
+        if self.cache is None:
+            return None
+        script = self.cache.get(key)
+        if script is not None:
+            logger.info(f"스크립트 캐시 적중: {key[:12]}")
+        return script
+
+    def _completion_options(self, messages: List[Dict[str, str]], max_tokens: int, json_mode: bool) -> Dict[str, Any]:
+        """chat.completions.create 요청 인자를 만듭니다."""
+        options: Dict[str, Any] = {
+            'model': SCRIPT_MODEL,
+            'messages': messages,
+            'temperature': SCRIPT_TEMPERATURE,
+            'max_tokens': max_tokens
+        }
+        if json_mode:
+            options['response_format'] = {'type': 'json_object'}
+        return options
+
+    def _finish_completion(self, estimated: int, response: Any, json_mode: bool) -> str:
+        """응답 내용을 꺼내고, JSON 모드이면 스키마를 검증합니다 (검증 실패 응답은 캐시하지 않음)."""
+        self._settle_tokens(estimated, response)
+        # 거절 응답은 content가 null로 올 수 있음
+        content = (response.choices[0].message.content or '').strip()
+        if not content:
+            raise ValueError("Empty response content")
+        if json_mode:
+            ScriptPackage.from_json(content)
+        return content
+
+    def _request_completion(self, key: str, messages: List[Dict[str, str]],
+                            max_tokens: int = SCRIPT_MAX_TOKENS, json_mode: bool = False) -> str:
+        """OpenAI API를 호출하여 응답을 생성하고 캐시에 저장합니다."""
+        estimated = estimate_tokens(messages, max_tokens)
+        self.request_limit.acquire()
+        self.token_limit.acquire(estimated)
+
+        response = self.client.chat.completions.create(**self._completion_options(messages, max_tokens, json_mode))
+        content = self._finish_completion(estimated, response, json_mode)
+
+        if self.cache is not None:
+            self.cache.put(key, content)
+        return content
+
+    async def _arequest_completion(self, key: str, messages: List[Dict[str, str]],
+                                   max_tokens: int = SCRIPT_MAX_TOKENS, json_mode: bool = False) -> str:
+        """AsyncOpenAI로 응답을 생성하고 캐시에 저장합니다."""
+        estimated = estimate_tokens(messages, max_tokens)
+        await self.request_limit.acquire_async()
+        await self.token_limit.acquire_async(estimated)
+
+        response = await get_async_client().chat.completions.create(
+            **self._completion_options(messages, max_tokens, json_mode)
+        )
+        content = self._finish_completion(estimated, response, json_mode)
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, key, content)
+        return content
+
+    def _complete(self, messages: List[Dict[str, str]], max_tokens: int = SCRIPT_MAX_TOKENS,
+                  json_mode: bool = False) -> str:
+        """캐시를 먼저 확인하고, 없으면 같은 요청끼리 하나로 합쳐 API를 호출합니다."""
+        key = self._script_cache_key(messages, max_tokens)
+
+        # 같은 요청이 이미 생성되었으면 API를 호출하지 않음
+        content = self._cached_script(key)
+        if content is not None:
+            return content
+
+        def lead() -> str:
+            # 앞선 요청이 캐시 확인 직후 끝났을 수 있으므로 리더가 된 뒤 캐시를 다시 확인
+            content = self._cached_script(key)
+            if content is not None:
+                return content
+            return self._request_completion(key, messages, max_tokens, json_mode)
+
+        # 동시에 들어온 같은 요청은 하나의 API 호출로 합침
+        return _script_flights.do(key, lead)
+
+    async def _acomplete(self, messages: List[Dict[str, str]], max_tokens: int = SCRIPT_MAX_TOKENS,
+                         json_mode: bool = False) -> str:
+        """_complete의 비동기 버전"""
+        key = self._script_cache_key(messages, max_tokens)
+
+        content = await asyncio.to_thread(self._cached_script, key)
+        if content is not None:
+            return content
+
+        async def lead() -> str:
+            content = await asyncio.to_thread(self._cached_script, key)
+            if content is not None:
+                return content
+            return await self._arequest_completion(key, messages, max_tokens, json_mode)
+
+        return await _async_script_flights.do(key, lead)
+
+    def build_script_request(self, content_data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Batch API 등 외부에서 보낼 스크립트 요청 본문과 캐시 키를 만듭니다.
+
+        Args:
+            content_data: 콘텐츠 데이터 (title 등)
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: (캐시 키, chat.completions 요청 본문)
+        """
+        messages = self._script_messages(content_data)
+        return self._script_cache_key(messages), self._completion_options(messages, SCRIPT_MAX_TOKENS, False)
+
+    def store_script(self, key: str, script: str) -> None:
+        """외부에서 생성한 스크립트를 캐시에 저장합니다.
+
+        Args:
+            key: build_script_request가 만든 캐시 키
+            script: 스크립트
+        """
+        if self.cache is not None:
+            self.cache.put(key, script)
 
     def generate_script(self, content_data: Dict[str, Any]) -> str:
         try:
-            settings = get_settings()
-            # 프롬프트 구성
-            prompt = settings.openai_prompt_template.format(
-                title=content_data.get('title', '')
-            )
+            return self._complete(self._script_messages(content_data))
 
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": "You are a professional YouTube shorts script writer. Always write in Korean and focus on delivering educational content in an engaging way. Use [INTRO], [BODY], and [OUTRO] section markers."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
-            )
+        except Exception as e:
+            raise Exception(f"Failed to generate script with OpenAI: {str(e)}")
+
+    async def agenerate_script(self, content_data: Dict[str, Any]) -> str:
+        """AsyncOpenAI로 스크립트를 생성합니다. 대기 중에도 이벤트 루프를 막지 않습니다.
+
+        Args:
+            content_data: 콘텐츠 데이터 (title 등)
 
-            return response.choices[0].message.content.strip()
+        Returns:
+            str: 생성된 스크립트
+
+        Raises:
+            Exception: 스크립트 생성에 실패한 경우
+        """
+        try:
+            return await self._acomplete(self._script_messages(content_data))
 
         except Exception as e:
             raise Exception(f"Failed to generate script with OpenAI: {str(e)}")
 
-    def generate_hashtags(self, content_data: Dict[str, Any]) -> list:
+    def generate_package(self, content_data: Dict[str, Any]) -> ScriptPackage:
+        """한 번의 JSON 응답으로 스크립트 섹션, 해시태그, 제목, 설명을 생성합니다.
+
+        Args:
+            content_data: 콘텐츠 데이터 (title, content, tags)
+
+        Returns:
+            ScriptPackage: 스크립트 패키지
+
+        Raises:
+            Exception: 생성에 실패했거나 응답이 스키마와 맞지 않는 경우
+        """
         try:
-            prompt = f"""
-            다음 내용을 바탕으로 유튜브 쇼츠에 적합한 해시태그 5-10개를 생성해주세요.
-            
-            제목: {content_data.get('title', '')}
-            내용: {content_data.get('content', '')}
-            기존 태그: {', '.join(content_data.get('tags', []))}
-            """
-
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": "You are a social media expert specializing in hashtag generation."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=200
-            )
+            content = self._complete(self._package_messages(content_data), PACKAGE_MAX_TOKENS, json_mode=True)
+            return ScriptPackage.from_json(content)
+
+        except Exception as e:
+            raise Exception(f"Failed to generate script package with OpenAI: {str(e)}")
 
-            # 해시태그 추출 및 정리
-            hashtags = response.choices[0].message.content.strip().split('\n')
-            hashtags = [tag.strip() for tag in hashtags if tag.strip()]
-            hashtags = [tag if tag.startswith('#') else f'#{tag}' for tag in hashtags]
+    async def agenerate_package(self, content_data: Dict[str, Any]) -> ScriptPackage:
+        """generate_package의 비동기 버전입니다.
 
-            return hashtags
+        Args:
+            content_data: 콘텐츠 데이터 (title, content, tags)
+
+        Returns:
+            ScriptPackage: 스크립트 패키지
+
+        Raises:
+            Exception: 생성에 실패했거나 응답이 스키마와 맞지 않는 경우
+        """
+        try:
+            content = await self._acomplete(self._package_messages(content_data), PACKAGE_MAX_TOKENS, json_mode=True)
+            return ScriptPackage.from_json(content)
+
+        except Exception as e:
+            raise Exception(f"Failed to generate script package with OpenAI: {str(e)}")
+
+    async def generate_scripts(
+        self,
+        batch: List[Dict[str, Any]],
+        concurrency: Optional[int] = None
+    ) -> List[Union[str, Exception]]:
+        """여러 콘텐츠의 스크립트를 동시에 생성합니다.
+
+        동시 요청 수는 세마포어로, 처리량은 분당 요청 수/토큰 수 버킷으로 제한합니다.
+        한 항목의 실패는 다른 항목에 영향을 주지 않으며, 실패한 자리에는 예외 객체가 들어갑니다.
+
+        Args:
+            batch: 콘텐츠 데이터 목록
+            concurrency: 동시 요청 수 (기본값: 설정값 openai_batch_concurrency)
+
+        Returns:
+            List[Union[str, Exception]]: 입력 순서대로의 스크립트 또는 예외
+        """
+        limit = asyncio.Semaphore(max(1, concurrency or get_settings().openai_batch_concurrency))
+
+        async def generate(content_data: Dict[str, Any]) -> str:
+            async with limit:
+                return await self.agenerate_script(content_data)
+
+        results = await asyncio.gather(
+            *(generate(content_data) for content_data in batch),
+            return_exceptions=True
+        )
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        logger.info(f"스크립트 일괄 생성 완료 - 전체: {len(batch)}, 실패: {failed}")
+        return results
+
+    def generate_hashtags(self, content_data: Dict[str, Any]) -> list:
+        try:
+            # 스크립트 패키지 응답의 해시태그를 사용 (같은 요청은 캐시에서 재사용)
+            return self.generate_package(content_data).hashtags
 
         except Exception as e:
-            raise Exception(f"Failed to generate hashtags with OpenAI: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Failed to generate hashtags with OpenAI: {str(e)}")
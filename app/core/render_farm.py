@@ -0,0 +1,254 @@
+from app.config import get_settings
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+class RenderTimeoutError(Exception):
+    """렌더링 작업이 제한 시간을 넘긴 경우"""
+
+class RenderCancelledError(Exception):
+    """렌더링 작업이 취소된 경우"""
+
+@dataclass
+class RenderJob:
+    """렌더링 대기열에 들어간 ffmpeg 작업"""
+    job_id: str
+    args: List[str]
+    timeout: float
+    future: asyncio.Future
+    submitted_at: float = field(default_factory=time.monotonic)
+    process: Optional[asyncio.subprocess.Process] = None
+    cancelled: bool = False
+
+class RenderFarm:
+    """ffmpeg 작업을 제한된 수의 워커 프로세스로 분배하는 렌더링 팜
+
+    워커 수만큼의 ffmpeg 프로세스만 동시에 실행하고, 나머지 작업은 크기가 제한된
+    대기열에서 기다립니다. 대기열이 가득 차면 submit이 자리가 날 때까지 대기하여
+    호출자에게 백프레셔를 전달합니다. 모든 대기는 비동기이므로 이벤트 루프를 막지 않습니다.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue: int = 32, default_timeout: float = 600.0):
+        """RenderFarm 인스턴스를 초기화합니다.
+
+        Args:
+            workers: 동시에 실행할 ffmpeg 프로세스 수 (기본값: CPU 수)
+            max_queue: 대기열 최대 길이
+            default_timeout: 작업별 기본 제한 시간(초)
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_queue = max(1, max_queue)
+        self.default_timeout = default_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: Dict[str, RenderJob] = {}
+        self._running = 0
+
+    def _ensure_started(self) -> None:
+        """처음 사용할 때 현재 이벤트 루프에서 워커를 시작합니다."""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [
+            asyncio.create_task(self._worker(index), name=f"render-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"렌더링 팜 시작 - 워커 {self.workers}개, 대기열 {self.max_queue}개")
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """대기 중인 작업과 실행 중인 작업 수"""
+        return {
+            'workers': self.workers,
+            'queued': self._queue.qsize() if self._queue else 0,
+            'running': self._running
+        }
+
+    async def _enqueue(self, args: List[str], timeout: Optional[float], job_id: Optional[str]) -> RenderJob:
+        """작업을 만들어 대기열에 넣습니다. 대기열이 가득 차면 자리가 날 때까지 기다립니다."""
+        self._ensure_started()
+        job = RenderJob(
+            job_id=job_id or uuid.uuid4().hex,
+            args=list(args),
+            timeout=timeout or self.default_timeout,
+            future=asyncio.get_running_loop().create_future()
+        )
+        # 아무도 기다리지 않는 작업(취소 등)의 예외는 이미 로그로 남기므로 경고하지 않음
+        job.future.add_done_callback(lambda future: future.cancelled() or future.exception())
+        self._jobs[job.job_id] = job
+        try:
+            await self._queue.put(job)
+        except asyncio.CancelledError:
+            self._jobs.pop(job.job_id, None)
+            raise
+        return job
+
+    async def _wait(self, job: RenderJob) -> None:
+        """작업이 끝날 때까지 기다리고, 기다리는 코루틴이 취소되면 작업도 취소합니다."""
+        try:
+            await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            self.cancel(job.job_id)
+            raise
+
+    async def submit(self, args: List[str], timeout: Optional[float] = None, job_id: Optional[str] = None) -> str:
+        """ffmpeg 작업을 대기열에 넣습니다. 대기열이 가득 차면 자리가 날 때까지 기다립니다.
+
+        Args:
+            args: 실행할 명령어 인자 목록
+            timeout: 작업 제한 시간(초) (기본값: default_timeout)
+            job_id: 작업 ID (기본값: 자동 생성)
+
+        Returns:
+            str: 작업 ID
+        """
+        job = await self._enqueue(args, timeout, job_id)
+        return job.job_id
+
+    async def wait(self, job_id: str) -> None:
+        """대기 중이거나 실행 중인 작업이 끝날 때까지 기다립니다.
+
+        기다리는 코루틴이 취소되면(예: 클라이언트 연결 종료) 작업도 취소합니다.
+
+        Args:
+            job_id: 작업 ID
+
+        Raises:
+            KeyError: 대기 중이거나 실행 중인 작업이 아닌 경우
+            RenderTimeoutError: 제한 시간을 넘긴 경우
+            RenderCancelledError: 작업이 취소된 경우
+            Exception: ffmpeg 실행에 실패한 경우
+        """
+        await self._wait(self._jobs[job_id])
+
+    async def run(self, args: List[str], timeout: Optional[float] = None) -> None:
+        """ffmpeg 작업을 대기열에 넣고 끝날 때까지 기다립니다.
+
+        Args:
+            args: 실행할 명령어 인자 목록
+            timeout: 작업 제한 시간(초) (기본값: default_timeout)
+
+        Raises:
+            RenderTimeoutError: 제한 시간을 넘긴 경우
+            RenderCancelledError: 작업이 취소된 경우
+            Exception: ffmpeg 실행에 실패한 경우
+        """
+        job = await self._enqueue(args, timeout, None)
+        await self._wait(job)
+
+    def cancel(self, job_id: str) -> bool:
+        """대기 중이거나 실행 중인 작업을 취소합니다.
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            bool: 취소 여부 (이미 끝난 작업이면 False)
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.future.done():
+            return False
+
+        job.cancelled = True
+        if job.process and job.process.returncode is None:
+            job.process.kill()
+        else:
+            job.future.set_exception(RenderCancelledError(f"Render job {job_id} was cancelled"))
+            self._jobs.pop(job_id, None)
+        logger.info(f"렌더링 작업 취소: {job_id}")
+        return True
+
+    async def _worker(self, index: int) -> None:
+        """대기열에서 작업을 꺼내 하나씩 실행하는 워커"""
+        while True:
+            job = await self._queue.get()
+            try:
+                if not job.cancelled:
+                    self._running += 1
+                    try:
+                        await self._execute(job)
+                    finally:
+                        self._running -= 1
+            finally:
+                self._jobs.pop(job.job_id, None)
+                self._queue.task_done()
+
+    async def _execute(self, job: RenderJob) -> None:
+        """ffmpeg 프로세스를 실행하고 결과를 작업의 future에 기록합니다."""
+        started_at = time.monotonic()
+        try:
+            job.process = await asyncio.create_subprocess_exec(
+                *job.args,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            if job.cancelled:
+                # 프로세스를 시작하는 사이에 취소된 경우
+                job.process.kill()
+            try:
+                _, stderr = await asyncio.wait_for(job.process.communicate(), timeout=job.timeout)
+            except asyncio.TimeoutError:
+                job.process.kill()
+                await job.process.wait()
+                raise RenderTimeoutError(f"Render job {job.job_id} timed out after {job.timeout:.0f}s")
+
+            if job.cancelled:
+                raise RenderCancelledError(f"Render job {job.job_id} was cancelled")
+            if job.process.returncode != 0:
+                message = stderr.decode('utf-8', errors='replace').strip().splitlines()[-5:]
+                raise Exception(f"ffmpeg exited with code {job.process.returncode}: {' '.join(message)}")
+
+            logger.info(
+                f"렌더링 작업 완료: {job.job_id} - 대기 {started_at - job.submitted_at:.2f}초, "
+                f"실행 {time.monotonic() - started_at:.2f}초"
+            )
+            if not job.future.done():
+                job.future.set_result(None)
+        except Exception as e:
+            logger.error(f"렌더링 작업 실패: {job.job_id} - {str(e)}")
+            if not job.future.done():
+                job.future.set_exception(e)
+
+    async def shutdown(self) -> None:
+        """실행 중인 작업을 모두 취소하고 워커를 종료합니다."""
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+_farm: Optional[RenderFarm] = None
+_farm_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_render_farm() -> RenderFarm:
+    """현재 이벤트 루프에서 공유하는 렌더링 팜을 가져옵니다.
+
+    Returns:
+        RenderFarm: 렌더링 팜
+    """
+    global _farm, _farm_loop
+    loop = asyncio.get_running_loop()
+    if _farm is None or _farm_loop is not loop:
+        settings = get_settings()
+        _farm = RenderFarm(
+            workers=settings.render_workers or None,
+            max_queue=settings.render_queue_size,
+            default_timeout=settings.render_timeout
+        )
+        _farm_loop = loop
+    return _farm
+
+async def shutdown_render_farm() -> None:
+    """렌더링 팜이 만들어져 있으면 실행 중인 ffmpeg 프로세스를 정리합니다."""
+    global _farm, _farm_loop
+    farm, _farm, _farm_loop = _farm, None, None
+    if farm is not None:
+        await farm.shutdown()
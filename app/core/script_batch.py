@@ -0,0 +1,315 @@
+from dataclasses import asdict, dataclass, field
+from email.parser import BytesParser
+from email.policy import HTTP
+from openai import OpenAI
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import httpx
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Batch API 요청 설정
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+@dataclass
+class BatchRequest:
+    """배치 파일의 한 줄(요청)과 시트 행의 대응 정보"""
+    custom_id: str
+    row: int
+    topic: str
+    cache_key: str
+
+@dataclass
+class BatchManifest:
+    """제출한 배치의 상태를 디스크에 기록하여 나중에 결과를 적용(재생)할 수 있게 하는 매니페스트"""
+    name: str
+    input_path: str
+    requests: List[BatchRequest] = field(default_factory=list)
+    batch_id: Optional[str] = None
+    output_path: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+
+    def save(self, path: str) -> None:
+        """매니페스트를 JSON 파일로 원자적으로 저장합니다.
+
+        Args:
+            path: 매니페스트 파일 경로
+        """
+        temp_path = f"{path}.part"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'BatchManifest':
+        """JSON 파일에서 매니페스트를 읽습니다.
+
+        Args:
+            path: 매니페스트 파일 경로
+
+        Returns:
+            BatchManifest: 매니페스트
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        data['requests'] = [BatchRequest(**request) for request in data.get('requests', [])]
+        return cls(**data)
+
+def batch_line(custom_id: str, body: Dict[str, Any]) -> str:
+    """배치 입력 파일(JSONL)의 한 줄을 만듭니다.
+
+    Args:
+        custom_id: 결과와 요청을 연결하는 ID
+        body: chat.completions 요청 본문
+
+    Returns:
+        str: JSON 한 줄
+    """
+    return json.dumps(
+        {'custom_id': custom_id, 'method': 'POST', 'url': BATCH_ENDPOINT, 'body': body},
+        ensure_ascii=False
+    )
+
+def parse_batch_output(text: str) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """배치 출력 파일(JSONL)을 custom_id별 (응답 내용, 오류)로 변환합니다.
+
+    Args:
+        text: 출력 파일 내용
+
+    Returns:
+        Dict[str, Tuple[Optional[str], Optional[str]]]: custom_id -> (내용, 오류 메시지)
+    """
+    results: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        custom_id = item.get('custom_id')
+        response = item.get('response') or {}
+        error = item.get('error')
+        if error:
+            results[custom_id] = (None, error.get('message') if isinstance(error, dict) else str(error))
+        elif response.get('status_code') != 200:
+            body = response.get('body') or {}
+            message = (body.get('error') or {}).get('message', 'unknown error')
+            results[custom_id] = (None, f"HTTP {response.get('status_code')}: {message}")
+        else:
+            content = response['body']['choices'][0]['message'].get('content')
+            if content and content.strip():
+                results[custom_id] = (content.strip(), None)
+            else:
+                # 거부 응답 등에서는 content가 null이거나 비어 있음
+                results[custom_id] = (None, "Empty response content")
+    return results
+
+class OpenAIBatchBackend:
+    """OpenAI Batch API(/v1/files, /v1/batches)로 배치를 제출하고 결과를 받는 백엔드
+
+    설치된 openai SDK에는 batches 리소스가 없으므로 저수준 post/get으로 호출합니다.
+    """
+
+    def __init__(self, client: OpenAI):
+        """OpenAIBatchBackend 인스턴스를 초기화합니다.
+
+        Args:
+            client: OpenAI 클라이언트
+        """
+        self.client = client
+
+    def submit(self, input_path: str) -> str:
+        """배치 입력 파일을 업로드하고 배치를 만듭니다.
+
+        Args:
+            input_path: 배치 입력 파일(JSONL) 경로
+
+        Returns:
+            str: 배치 ID
+        """
+        with open(input_path, 'rb') as f:
+            input_file = self.client.files.create(file=f, purpose='batch')
+        response = self.client.post(
+            '/batches',
+            cast_to=httpx.Response,
+            body={
+                'input_file_id': input_file.id,
+                'endpoint': BATCH_ENDPOINT,
+                'completion_window': BATCH_COMPLETION_WINDOW
+            }
+        )
+        return response.json()['id']
+
+    def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        """배치 상태를 조회합니다.
+
+        Args:
+            batch_id: 배치 ID
+
+        Returns:
+            Dict[str, Any]: 배치 객체 (status, output_file_id 등)
+        """
+        return self.client.get(f'/batches/{batch_id}', cast_to=httpx.Response).json()
+
+    def download(self, file_id: str) -> str:
+        """결과 파일 내용을 받습니다.
+
+        Args:
+            file_id: 파일 ID
+
+        Returns:
+            str: 파일 내용
+        """
+        return self.client.files.content(file_id).text
+
+    def wait(self, batch_id: str, poll_interval: float, timeout: float,
+             sleep: Callable[[float], None] = time.sleep) -> Dict[str, Any]:
+        """배치가 끝날 때까지 주기적으로 상태를 조회합니다.
+
+        Args:
+            batch_id: 배치 ID
+            poll_interval: 조회 간격(초)
+            timeout: 최대 대기 시간(초)
+            sleep: 대기 함수
+
+        Returns:
+            Dict[str, Any]: 끝난 배치 객체
+
+        Raises:
+            TimeoutError: 제한 시간 안에 끝나지 않은 경우
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            batch = self.retrieve(batch_id)
+            status = batch.get('status')
+            counts = batch.get('request_counts') or {}
+            logger.info(
+                f"배치 상태: {batch_id} - {status} "
+                f"({counts.get('completed', 0)}/{counts.get('total', 0)})"
+            )
+            if status in BATCH_TERMINAL_STATUSES:
+                return batch
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Batch {batch_id} did not finish within {timeout:.0f}s")
+            sleep(poll_interval)
+
+class LocalBatchEndpoint(httpx.BaseTransport):
+    """네트워크 없이 OpenAI Files/Batches API를 흉내 내는 로컬 가짜 엔드포인트
+
+    httpx 전송 계층으로 동작하므로 실제 OpenAIBatchBackend 코드를 그대로 사용하여
+    제출 → 조회 → 결과 다운로드 흐름을 검증할 수 있습니다. 배치는 조회할 때마다
+    validating → in_progress → completed 순서로 진행되며, 각 요청의 응답은 responder가 만듭니다.
+    """
+
+    def __init__(self, responder: Callable[[Dict[str, Any]], str], polls_until_complete: int = 2):
+        """LocalBatchEndpoint 인스턴스를 초기화합니다.
+
+        Args:
+            responder: 요청 본문을 받아 응답 내용을 만드는 함수 (예외를 던지면 해당 요청은 실패)
+            polls_until_complete: 완료될 때까지 필요한 조회 횟수
+        """
+        self.responder = responder
+        self.polls_until_complete = polls_until_complete
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def client(self) -> OpenAI:
+        """이 엔드포인트로 요청을 보내는 OpenAI 클라이언트를 만듭니다.
+
+        Returns:
+            OpenAI: 로컬 클라이언트
+        """
+        return OpenAI(
+            api_key='local',
+            base_url='http://local-batch/v1',
+            http_client=httpx.Client(transport=self),
+            max_retries=0
+        )
+
+    def _json(self, request: httpx.Request, data: Dict[str, Any], status_code: int = 200) -> httpx.Response:
+        """JSON 응답을 만듭니다."""
+        return httpx.Response(status_code, json=data, request=request)
+
+    def _upload(self, request: httpx.Request) -> httpx.Response:
+        """multipart 업로드 본문에서 파일 내용을 꺼내 저장합니다."""
+        header = f"Content-Type: {request.headers['content-type']}\r\n\r\n".encode('utf-8')
+        message = BytesParser(policy=HTTP).parsebytes(header + request.read())
+        content = b''
+        filename = 'batch.jsonl'
+        for part in message.iter_parts():
+            if part.get_param('name', header='content-disposition') == 'file':
+                content = part.get_payload(decode=True)
+                filename = part.get_filename() or filename
+        file_id = f"file-local-{next(self._ids)}"
+        self.files[file_id] = content
+        return self._json(request, {
+            'id': file_id, 'object': 'file', 'bytes': len(content), 'created_at': int(time.time()),
+            'filename': filename, 'purpose': 'batch', 'status': 'processed'
+        })
+
+    def _complete(self, batch: Dict[str, Any]) -> None:
+        """입력 파일의 모든 요청에 응답하여 출력 파일을 만듭니다."""
+        lines = []
+        failed = 0
+        for line in self.files[batch['input_file_id']].decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            try:
+                content = self.responder(item['body'])
+                response = {'status_code': 200, 'body': {
+                    'object': 'chat.completion',
+                    'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}}]
+                }}
+            except Exception as e:
+                failed += 1
+                response = {'status_code': 500, 'body': {'error': {'message': str(e)}}}
+            lines.append(json.dumps({'custom_id': item['custom_id'], 'response': response}, ensure_ascii=False))
+
+        output_file_id = f"file-local-{next(self._ids)}"
+        self.files[output_file_id] = ('\n'.join(lines) + '\n').encode('utf-8')
+        batch.update(
+            status='completed',
+            output_file_id=output_file_id,
+            request_counts={'total': len(lines), 'completed': len(lines) - failed, 'failed': failed}
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """요청 경로에 따라 Files/Batches API 응답을 만듭니다."""
+        path = request.url.path.removeprefix('/v1')
+        with self._lock:
+            if request.method == 'POST' and path == '/files':
+                return self._upload(request)
+            if request.method == 'GET' and path.startswith('/files/') and path.endswith('/content'):
+                file_id = path[len('/files/'):-len('/content')]
+                if file_id not in self.files:
+                    return self._json(request, {'error': {'message': 'file not found'}}, 404)
+                return httpx.Response(200, content=self.files[file_id], request=request)
+            if request.method == 'POST' and path == '/batches':
+                body = json.loads(request.read())
+                batch_id = f"batch-local-{next(self._ids)}"
+                self.batches[batch_id] = {
+                    'id': batch_id, 'object': 'batch', 'status': 'validating', 'polls': 0,
+                    'input_file_id': body['input_file_id'], 'endpoint': body['endpoint'],
+                    'output_file_id': None, 'request_counts': {'total': 0, 'completed': 0, 'failed': 0}
+                }
+                return self._json(request, self.batches[batch_id])
+            if request.method == 'GET' and path.startswith('/batches/'):
+                batch = self.batches.get(path[len('/batches/'):])
+                if batch is None:
+                    return self._json(request, {'error': {'message': 'batch not found'}}, 404)
+                if batch['status'] != 'completed':
+                    batch['polls'] += 1
+                    if batch['polls'] >= self.polls_until_complete:
+                        self._complete(batch)
+                    else:
+                        batch['status'] = 'in_progress'
+                return self._json(request, batch)
+        return self._json(request, {'error': {'message': f'unsupported: {request.method} {path}'}}, 404)
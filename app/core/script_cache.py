@@ -0,0 +1,169 @@
+from functools import lru_cache
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class ScriptCache:
+    """OpenAI 스크립트 응답을 요청 내용으로 주소를 매겨 저장하는 SQLite 캐시
+
+    키는 모델, 시스템 프롬프트, 완성된 프롬프트, temperature, max_tokens의
+    안정적인 SHA-256 해시입니다. ttl이 지난 항목은 적중으로 보지 않고 삭제하며,
+    항목 수가 max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int):
+        """ScriptCache 인스턴스를 초기화합니다.
+
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+            ttl: 항목 유효 시간(초) (0 이하이면 만료 없음)
+            max_entries: 최대 항목 수
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        """요청의 캐시 키를 만듭니다.
+
+        Args:
+            model: 모델 이름
+            system_prompt: 시스템 프롬프트
+            prompt: 완성된 사용자 프롬프트
+            temperature: 샘플링 temperature
+            max_tokens: 응답 최대 토큰 수
+
+        Returns:
+            str: 16진수 SHA-256 해시
+        """
+        payload = json.dumps(
+            {
+                'model': model,
+                'system_prompt': system_prompt,
+                'prompt': prompt,
+                'temperature': temperature,
+                'max_tokens': max_tokens
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """처음 사용할 때 데이터베이스를 열고 테이블을 만듭니다. 잠금을 잡은 상태에서 호출합니다."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scripts ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scripts_accessed_at ON scripts (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        """항목이 유효 시간을 지났는지 확인합니다."""
+        return self.ttl > 0 and now - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답을 가져옵니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            Optional[str]: 응답 (없거나 만료되었으면 None)
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT response, created_at FROM scripts WHERE key = ?", (key,)).fetchone()
+            if row is None or self._expired(row[1], now):
+                if row is not None:
+                    conn.execute("DELETE FROM scripts WHERE key = ?", (key,))
+                    conn.commit()
+                self.misses += 1
+                return None
+
+            # LRU 순서를 위해 사용 시각 갱신
+            conn.execute("UPDATE scripts SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """응답을 캐시에 저장하고 크기 상한을 넘으면 오래된 항목을 삭제합니다.
+
+        Args:
+            key: 캐시 키
+            response: 응답
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO scripts (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            removed = self._evict(conn, now)
+            conn.commit()
+        if removed:
+            logger.info(f"스크립트 캐시 정리 - {removed}개 항목 삭제")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        """만료된 항목과 상한을 넘는 오래된 항목을 삭제합니다."""
+        removed = 0
+        if self.ttl > 0:
+            removed += conn.execute("DELETE FROM scripts WHERE created_at < ?", (now - self.ttl,)).rowcount
+        count = conn.execute("SELECT COUNT(*) FROM scripts").fetchone()[0]
+        if count > self.max_entries:
+            removed += conn.execute(
+                "DELETE FROM scripts WHERE key IN "
+                "(SELECT key FROM scripts ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_entries,)
+            ).rowcount
+        return removed
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중 통계"""
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self) -> None:
+        """데이터베이스 연결을 닫습니다."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+@lru_cache(maxsize=None)
+def get_script_cache(path: str, ttl: float, max_entries: int) -> ScriptCache:
+    """데이터베이스 경로별로 프로세스 전체에서 공유하는 스크립트 캐시를 가져옵니다.
+
+    Args:
+        path: SQLite 데이터베이스 파일 경로
+        ttl: 항목 유효 시간(초)
+        max_entries: 최대 항목 수
+
+    Returns:
+        ScriptCache: 스크립트 캐시
+    """
+    return ScriptCache(path, ttl, max_entries)
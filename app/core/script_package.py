@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+import json
+
+# 스크립트 패키지 응답의 JSON 스키마 (모델에 그대로 전달하고, 응답도 같은 규칙으로 검증)
+SCRIPT_PACKAGE_SCHEMA: Dict[str, Any] = {
+    'type': 'object',
+    'properties': {
+        'intro': {'type': 'string', 'description': '[INTRO] 섹션 내용'},
+        'body': {'type': 'string', 'description': '[BODY] 섹션 내용'},
+        'outro': {'type': 'string', 'description': '[OUTRO] 섹션 내용'},
+        'hashtags': {
+            'type': 'array',
+            'items': {'type': 'string'},
+            'minItems': 5,
+            'maxItems': 10,
+            'description': '유튜브 쇼츠 해시태그 5-10개'
+        },
+        'title': {'type': 'string', 'maxLength': 100, 'description': '유튜브 영상 제목'},
+        'description': {'type': 'string', 'maxLength': 5000, 'description': '유튜브 영상 설명'}
+    },
+    'required': ['intro', 'body', 'outro', 'hashtags', 'title', 'description'],
+    'additionalProperties': False
+}
+
+SECTION_FIELDS = ('intro', 'body', 'outro')
+
+def normalize_hashtag(tag: str) -> str:
+    """해시태그를 '#단어' 형태로 정리합니다.
+
+    Args:
+        tag: 원본 해시태그
+
+    Returns:
+        str: 공백이 제거되고 '#'으로 시작하는 해시태그 (내용이 없으면 빈 문자열)
+    """
+    word = ''.join(tag.split()).lstrip('#')
+    return f'#{word}' if word else ''
+
+@dataclass
+class ScriptPackage:
+    """한 번의 구조화된 응답으로 받은 스크립트 섹션과 업로드 메타데이터"""
+    intro: str
+    body: str
+    outro: str
+    hashtags: List[str] = field(default_factory=list)
+    title: str = ''
+    description: str = ''
+
+    @property
+    def script(self) -> str:
+        """섹션 태그([INTRO]/[BODY]/[OUTRO])가 포함된 전체 스크립트"""
+        return '\n'.join(
+            f'[{name.upper()}]\n{getattr(self, name)}' for name in SECTION_FIELDS
+        )
+
+    @property
+    def narration(self) -> str:
+        """섹션 태그 없이 음성 합성에 사용할 스크립트"""
+        return '\n'.join(getattr(self, name) for name in SECTION_FIELDS)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> 'ScriptPackage':
+        """스키마를 검증하고 ScriptPackage를 만듭니다.
+
+        Args:
+            data: JSON 응답을 파싱한 값
+
+        Returns:
+            ScriptPackage: 스크립트 패키지
+
+        Raises:
+            ValueError: 스키마와 맞지 않는 경우
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Script package must be a JSON object")
+
+        schema = SCRIPT_PACKAGE_SCHEMA['properties']
+        missing = [name for name in SCRIPT_PACKAGE_SCHEMA['required'] if name not in data]
+        if missing:
+            raise ValueError(f"Script package is missing fields: {', '.join(missing)}")
+
+        for name in SECTION_FIELDS + ('title', 'description'):
+            value = data[name]
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"Script package field '{name}' must be a non-empty string")
+            if len(value) > schema[name].get('maxLength', len(value)):
+                raise ValueError(f"Script package field '{name}' is too long")
+
+        if not isinstance(data['hashtags'], list) or not all(isinstance(tag, str) for tag in data['hashtags']):
+            raise ValueError("Script package field 'hashtags' must be a list of strings")
+        hashtags = list(dict.fromkeys(filter(None, map(normalize_hashtag, data['hashtags']))))
+        if not hashtags:
+            raise ValueError("Script package field 'hashtags' must not be empty")
+
+        return cls(
+            intro=data['intro'].strip(),
+            body=data['body'].strip(),
+            outro=data['outro'].strip(),
+            hashtags=hashtags[:schema['hashtags']['maxItems']],
+            title=data['title'].strip(),
+            description=data['description'].strip()
+        )
+
+    @classmethod
+    def from_json(cls, content: str) -> 'ScriptPackage':
+        """JSON 문자열 응답을 파싱하여 ScriptPackage를 만듭니다.
+
+        Args:
+            content: 모델 응답 문자열
+
+        Returns:
+            ScriptPackage: 스크립트 패키지
+
+        Raises:
+            ValueError: JSON이 아니거나 스키마와 맞지 않는 경우
+        """
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Script package is not valid JSON: {str(e)}")
+        return cls.from_dict(data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """스크립트 패키지를 딕셔너리로 변환합니다.
+
+        Returns:
+            Dict[str, Any]: 스크립트 패키지
+        """
+        return {
+            'intro': self.intro,
+            'body': self.body,
+            'outro': self.outro,
+            'hashtags': list(self.hashtags),
+            'title': self.title,
+            'description': self.description
+        }
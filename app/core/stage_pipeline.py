@@ -0,0 +1,331 @@
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# 단계 처리 함수: 작업 항목을 받아 다음 단계로 넘길 항목을 반환
+StageHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+# 대기열 백엔드에서 꺼내기에 실패했을 때 다시 시도하기 전 대기 시간(초)
+BACKEND_RETRY_DELAY = 1.0
+
+class StageError(Exception):
+    """파이프라인의 한 단계에서 작업 항목 처리에 실패한 경우"""
+
+    def __init__(self, stage: str, message: str):
+        super().__init__(message)
+        self.stage = stage
+
+@dataclass
+class PipelineStage:
+    """파이프라인 단계 정의 (처리 함수와 독립적으로 조절하는 워커 수)"""
+    name: str
+    handler: StageHandler
+    workers: int = 1
+    processed: int = 0
+    failed: int = 0
+    busy: float = 0.0
+
+@dataclass
+class PipelineRun:
+    """submit 한 번으로 제출한 항목들의 완료 상태"""
+    results: List[Any]
+    remaining: int
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+class InProcessQueueBackend:
+    """단계 사이의 대기열을 현재 이벤트 루프의 asyncio.Queue로 구현한 백엔드
+
+    대기열 크기가 제한되어 있으므로 다음 단계가 밀리면 앞 단계의 put이 기다려
+    백프레셔가 전달됩니다.
+    """
+
+    def __init__(self, max_size: int = 100):
+        """InProcessQueueBackend 인스턴스를 초기화합니다.
+
+        Args:
+            max_size: 단계별 대기열 최대 길이
+        """
+        self.max_size = max(1, max_size)
+        self._queues: Dict[str, asyncio.Queue] = {}
+
+    def _queue(self, stage: str) -> asyncio.Queue:
+        """단계의 대기열을 가져옵니다 (없으면 생성)."""
+        if stage not in self._queues:
+            self._queues[stage] = asyncio.Queue(maxsize=self.max_size)
+        return self._queues[stage]
+
+    async def put(self, stage: str, message: Dict[str, Any]) -> None:
+        """단계 대기열에 메시지를 넣습니다."""
+        await self._queue(stage).put(message)
+
+    async def get(self, stage: str) -> Dict[str, Any]:
+        """단계 대기열에서 메시지를 꺼냅니다. 비어 있으면 기다립니다."""
+        return await self._queue(stage).get()
+
+    async def close(self) -> None:
+        """대기열을 비웁니다."""
+        self._queues.clear()
+
+class RedisQueueBackend:
+    """단계 사이의 대기열을 Redis 호환 서버(Redis, Valkey, KeyDB 등)의 리스트로 구현한 백엔드
+
+    메시지는 JSON으로 직렬화되므로 작업 항목에는 JSON으로 표현할 수 있는 값만 넣어야 합니다.
+    키는 단계마다 하나이며 프로세스의 파이프라인에 제출된 모든 작업이 공유하므로,
+    다른 프로세스에서 대기열 길이(LLEN)로 밀린 작업을 확인할 수 있습니다.
+    완료 여부는 제출한 프로세스 안에서 추적하므로 프로세스마다 다른 접두사를 사용해야 합니다.
+    """
+
+    def __init__(self, url: str, prefix: str = "shorts:pipeline", poll_timeout: int = 1):
+        """RedisQueueBackend 인스턴스를 초기화합니다.
+
+        Args:
+            url: Redis 접속 URL (예: redis://localhost:6379/0)
+            prefix: 대기열 키 접두사
+            poll_timeout: BLPOP 대기 시간(초)
+
+        Raises:
+            ImportError: redis 패키지가 설치되어 있지 않은 경우
+        """
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError(f"Redis queue backend requires the 'redis' package: {str(e)}")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.poll_timeout = max(1, poll_timeout)
+
+    def _key(self, stage: str) -> str:
+        """단계 대기열의 키를 만듭니다."""
+        return f"{self.prefix}:{stage}"
+
+    async def put(self, stage: str, message: Dict[str, Any]) -> None:
+        """단계 대기열에 메시지를 넣습니다."""
+        await self.client.rpush(self._key(stage), json.dumps(message, ensure_ascii=False))
+
+    async def get(self, stage: str) -> Dict[str, Any]:
+        """단계 대기열에서 메시지를 꺼냅니다. 비어 있으면 기다립니다."""
+        while True:
+            item = await self.client.blpop(self._key(stage), timeout=self.poll_timeout)
+            if item is not None:
+                return json.loads(item[1])
+
+    async def close(self) -> None:
+        """Redis 연결을 닫습니다."""
+        await self.client.aclose()
+
+QueueBackend = Union[InProcessQueueBackend, RedisQueueBackend]
+
+class StagedPipeline:
+    """단계마다 별도의 대기열과 워커를 두고 작업 항목을 흘려보내는 파이프라인
+
+    각 단계의 워커는 자기 대기열에서 항목을 꺼내 처리한 뒤 다음 단계의 대기열에 넣습니다.
+    따라서 느린 렌더링이 다음 항목의 스크립트 생성이나 음성 합성을 막지 않으며,
+    I/O 위주 단계는 넓게, CPU 위주 단계는 코어 수만큼 워커 수를 따로 조절할 수 있습니다.
+    워커와 대기열은 start부터 stop까지 유지되어 여러 번의 submit이 함께 쓰므로,
+    단계별 워커 수는 동시에 들어온 요청 전체에 대한 한도입니다.
+    한 항목이 실패해도 나머지 항목은 계속 처리됩니다.
+    """
+
+    def __init__(self, stages: List[PipelineStage], backend: Optional[QueueBackend] = None):
+        """StagedPipeline 인스턴스를 초기화합니다.
+
+        Args:
+            stages: 순서대로 실행할 단계 목록
+            backend: 단계 사이의 대기열 백엔드 (기본값: 프로세스 내부 asyncio 대기열)
+
+        Raises:
+            ValueError: 단계가 없거나 이름이 중복된 경우
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        if len({stage.name for stage in stages}) != len(stages):
+            raise ValueError("Pipeline stage names must be unique")
+        self.stages = stages
+        self.backend = backend or InProcessQueueBackend()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._workers: List[asyncio.Task] = []
+        self._runs: Dict[str, PipelineRun] = {}
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """단계별 워커 수, 처리/실패 건수, 처리에 쓴 시간"""
+        return {
+            stage.name: {
+                'workers': stage.workers,
+                'processed': stage.processed,
+                'failed': stage.failed,
+                'busy': round(stage.busy, 3)
+            }
+            for stage in self.stages
+        }
+
+    @property
+    def running(self) -> bool:
+        """워커가 실행 중인지 여부"""
+        return bool(self._workers)
+
+    def start(self) -> None:
+        """현재 이벤트 루프에서 단계별 워커를 시작합니다 (이미 실행 중이면 아무것도 하지 않음)."""
+        if self._workers:
+            return
+        self.loop = asyncio.get_running_loop()
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"pipeline-{stage.name}-{worker}")
+            for index, stage in enumerate(self.stages)
+            for worker in range(max(1, stage.workers))
+        ]
+        logger.info(f"파이프라인 워커 시작 - {', '.join(f'{stage.name}={stage.workers}' for stage in self.stages)}")
+
+    async def stop(self) -> None:
+        """워커를 멈추고 대기열 백엔드를 닫습니다. 끝나지 않은 항목은 실패로 기록됩니다.
+
+        처리 중이던 항목은 그 단계의 "Cancelled" StageError로, 대기열에 남은 항목은
+        'pipeline' 단계의 "Pipeline stopped" StageError로 기록됩니다.
+        """
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        for run in list(self._runs.values()):
+            for position, result in enumerate(run.results):
+                if result is None:
+                    run.results[position] = StageError('pipeline', "Pipeline stopped")
+            run.remaining = 0
+            run.done.set()
+        await self.backend.close()
+
+    def _finish(self, run_id: str, position: int, result: Any) -> None:
+        """항목의 최종 결과(마지막 단계의 결과 또는 StageError)를 기록합니다."""
+        run = self._runs.get(run_id)
+        if run is None:
+            # 이전 프로세스가 남긴 항목처럼 이 프로세스가 기다리지 않는 항목
+            return
+        run.results[position] = result
+        run.remaining -= 1
+        if run.remaining == 0:
+            run.done.set()
+
+    async def _worker(self, index: int) -> None:
+        """단계 대기열에서 항목을 꺼내 처리하고 다음 단계로 넘기는 워커"""
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1].name if index + 1 < len(self.stages) else None
+        while True:
+            try:
+                message = await self.backend.get(stage.name)
+            except Exception as e:
+                logger.error(f"파이프라인 대기열 읽기 실패: {stage.name} - {str(e)}")
+                await asyncio.sleep(BACKEND_RETRY_DELAY)
+                continue
+
+            run_id, position = message.get('run'), message['position']
+            started_at = time.perf_counter()
+            try:
+                result = await stage.handler(message['item'])
+            except asyncio.CancelledError:
+                # 처리 중에 멈춘 항목은 취소된 실패로 기록하고 워커를 끝냄
+                stage.failed += 1
+                self._finish(run_id, position, StageError(stage.name, "Cancelled"))
+                raise
+            except Exception as e:
+                stage.failed += 1
+                logger.error(f"파이프라인 단계 실패: {stage.name} - {str(e)}")
+                result = StageError(stage.name, str(e))
+            else:
+                stage.processed += 1
+            finally:
+                stage.busy += time.perf_counter() - started_at
+
+            if next_stage is not None and not isinstance(result, StageError):
+                try:
+                    await self.backend.put(next_stage, {'run': run_id, 'position': position, 'item': result})
+                    continue
+                except Exception as e:
+                    logger.error(f"파이프라인 대기열 쓰기 실패: {next_stage} - {str(e)}")
+                    result = StageError(next_stage, f"Failed to enqueue item: {str(e)}")
+
+            # 마지막 단계를 마쳤거나 실패한 항목
+            self._finish(run_id, position, result)
+
+    async def submit(self, items: List[Dict[str, Any]]) -> List[Union[Dict[str, Any], StageError]]:
+        """항목들을 실행 중인 파이프라인에 넣고 모두 끝날 때까지 기다립니다.
+
+        워커가 없으면 현재 이벤트 루프에서 시작합니다.
+
+        Args:
+            items: 작업 항목 목록
+
+        Returns:
+            List[Union[Dict[str, Any], StageError]]: 입력 순서대로 마지막 단계의 결과
+                (실패한 항목은 실패한 단계가 담긴 StageError)
+        """
+        if not items:
+            return []
+
+        self.start()
+        run_id = uuid.uuid4().hex
+        run = PipelineRun(results=[None] * len(items), remaining=len(items))
+        self._runs[run_id] = run
+        first = self.stages[0].name
+        started_at = time.perf_counter()
+        try:
+            for position, item in enumerate(items):
+                try:
+                    await self.backend.put(first, {'run': run_id, 'position': position, 'item': item})
+                except Exception as e:
+                    logger.error(f"파이프라인 대기열 쓰기 실패: {first} - {str(e)}")
+                    self._finish(run_id, position, StageError(first, f"Failed to enqueue item: {str(e)}"))
+            await run.done.wait()
+        finally:
+            self._runs.pop(run_id, None)
+
+        failed = sum(isinstance(result, StageError) for result in run.results)
+        logger.info(
+            f"파이프라인 항목 {len(items)}개 완료 - 성공: {len(items) - failed}, 실패: {failed}, "
+            f"소요 시간: {time.perf_counter() - started_at:.2f}초"
+        )
+        return run.results
+
+    async def run(self, items: List[Dict[str, Any]]) -> List[Union[Dict[str, Any], StageError]]:
+        """워커를 시작하고 모든 항목을 처리한 뒤 워커를 멈춥니다 (한 번만 쓰는 파이프라인용).
+
+        Args:
+            items: 작업 항목 목록
+
+        Returns:
+            List[Union[Dict[str, Any], StageError]]: 입력 순서대로 마지막 단계의 결과
+                (실패한 항목은 실패한 단계가 담긴 StageError)
+        """
+        try:
+            return await self.submit(items)
+        finally:
+            await self.stop()
+
+def create_queue_backend(name: str, max_size: int = 100, redis_url: str = "") -> QueueBackend:
+    """설정 이름에 맞는 대기열 백엔드를 만듭니다.
+
+    Args:
+        name: 백엔드 이름 ('memory' 또는 'redis')
+        max_size: 프로세스 내부 대기열 최대 길이
+        redis_url: Redis 접속 URL
+
+    Returns:
+        QueueBackend: 대기열 백엔드
+
+    Raises:
+        ValueError: 알 수 없는 백엔드 이름인 경우
+    """
+    if name == 'memory':
+        return InProcessQueueBackend(max_size)
+    if name == 'redis':
+        # 완료 여부는 프로세스 안에서 추적하므로 프로세스마다 다른 키를 사용
+        return RedisQueueBackend(redis_url, prefix=f"shorts:pipeline:{socket.gethostname()}:{os.getpid()}")
+    raise ValueError(f"Unknown pipeline backend: {name}")
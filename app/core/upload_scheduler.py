@@ -0,0 +1,266 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+from app.config import get_settings
+from app.core.youtube_client import YouTubeClient, is_quota_exceeded
+from app.core.youtube_quota import QUOTA_COSTS, QuotaExceededError, QuotaLedger
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# 예약 업로드 결과 상태 (deferred: 할당량 부족으로 올리지 못해 다음 실행에서 다시 올릴 영상)
+UPLOAD_UPLOADED = 'uploaded'
+UPLOAD_FAILED = 'failed'
+UPLOAD_DEFERRED = 'deferred'
+
+@dataclass
+class UploadTask:
+    """예약 업로드할 영상과 메타데이터"""
+    video_file: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+
+def parse_publish_window(value: str) -> Tuple[int, int]:
+    """'시작-종료' 형식의 게시 시간대를 시각(시) 쌍으로 변환합니다.
+
+    Args:
+        value: 게시 시간대 (예: '09-21', 자정을 넘기면 '22-02', 하루 종일이면 '00-24')
+
+    Returns:
+        Tuple[int, int]: (시작 시각, 종료 시각)
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    try:
+        start, end = (int(part) for part in value.split('-'))
+    except ValueError:
+        raise ValueError(f"Invalid publish window: {value}")
+    if not (0 <= start <= 23 and 0 <= end <= 24):
+        raise ValueError(f"Invalid publish window: {value}")
+    return start, end
+
+class UploadScheduler:
+    """YouTube 할당량 안에서 업로드 대기 목록을 게시 시간대에 나누어 올리는 스케줄러
+
+    업로드를 시작할 때마다 남은 시간대를 (남은 영상 수, 오늘 할당량으로 올릴 수 있는 영상 수) 중
+    작은 값으로 나눈 만큼 간격을 둡니다. 할당량은 태평양 시간 자정에 초기화되지만 스케줄러는
+    초기화를 기다리지 않으므로, 남은 영상은 다음 실행에서 이어서 올립니다. 대기 목록이 하루 할당량보다 많으면 할당량이 허락하는
+    가장 빠른 속도로 올리고, 남은 할당량이 영상 하나(와 플레이리스트 추가) 비용보다 적어지면
+    API가 quotaExceeded를 반환하기 전에 멈춥니다. 플레이리스트 추가는 모아서 배치로 보냅니다.
+    """
+
+    def __init__(self, client: YouTubeClient, ledger: QuotaLedger, window: Tuple[int, int] = (0, 24),
+                 timezone: str = 'Asia/Seoul', concurrency: int = 1, playlist_batch_size: int = 50,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        """UploadScheduler 인스턴스를 초기화합니다.
+
+        Args:
+            client: YouTube 클라이언트
+            ledger: 할당량 장부
+            window: 게시 시간대 (시작 시각, 종료 시각)
+            timezone: 게시 시간대의 시간대 이름
+            concurrency: 동시에 진행할 업로드 수
+            playlist_batch_size: 플레이리스트 배치 추가 크기
+            clock: 현재 시각(초)을 반환하는 함수
+            sleep: 비동기 대기 함수
+        """
+        self.client = client
+        self.ledger = ledger
+        self.window = window
+        self.timezone = ZoneInfo(timezone)
+        self.concurrency = max(1, concurrency)
+        self.playlist_batch_size = max(1, playlist_batch_size)
+        self.clock = clock
+        self.sleep = sleep
+        self._playlist: List[str] = []
+        self._stopped = False
+        self._video_indices: Dict[str, int] = {}
+        self.playlist_failures: Dict[int, str] = {}
+
+    @property
+    def upload_cost(self) -> int:
+        """영상 하나를 올리는 데 필요한 할당량 (플레이리스트 추가 포함)"""
+        cost = QUOTA_COSTS['videos.insert']
+        if self.client.playlist_id:
+            cost += QUOTA_COSTS['playlistItems.insert']
+        return cost
+
+    def _window_bounds(self) -> Tuple[datetime, datetime, datetime]:
+        """현재 시각과, 지금 열려 있거나 다음에 열릴 게시 시간대의 시작/종료 시각을 계산합니다."""
+        now = datetime.fromtimestamp(self.clock(), self.timezone)
+        start_hour, end_hour = self.window
+        duration = timedelta(hours=(end_hour - start_hour) % 24 or 24)
+        for offset in (-1, 0, 1):
+            day = (now + timedelta(days=offset)).replace(hour=0, minute=0, second=0, microsecond=0)
+            opens = day + timedelta(hours=start_hour)
+            closes = opens + duration
+            if closes > now:
+                return now, opens, closes
+        raise ValueError("Publish window could not be resolved")
+
+    def seconds_until_window(self) -> float:
+        """게시 시간대가 열릴 때까지 남은 시간(초) (열려 있으면 0)"""
+        now, opens, _ = self._window_bounds()
+        return max(0.0, (opens - now).total_seconds())
+
+    def interval(self, pending: int) -> float:
+        """지금 업로드를 시작한 뒤 다음 업로드까지 기다릴 시간(초)을 계산합니다.
+
+        Args:
+            pending: 지금 시작할 영상을 포함한 남은 영상 수
+
+        Returns:
+            float: 대기 시간(초) (이번이 오늘 마지막 업로드이면 0)
+        """
+        now, opens, closes = self._window_bounds()
+        remaining_window = (closes - max(now, opens)).total_seconds()
+        affordable = (self.ledger.remaining() - self._playlist_owed) // self.upload_cost
+        slots = min(pending, affordable)
+        if slots <= 1:
+            return 0.0
+        return remaining_window / slots
+
+    @property
+    def _playlist_owed(self) -> int:
+        """아직 배치로 보내지 않은 플레이리스트 추가의 할당량"""
+        return len(self._playlist) * QUOTA_COSTS['playlistItems.insert']
+
+    async def _flush_playlist(self) -> None:
+        """모아 둔 영상들을 플레이리스트에 배치로 추가합니다."""
+        video_ids, self._playlist = self._playlist, []
+        if not video_ids:
+            return
+        try:
+            failures = await self.client.add_to_playlist(video_ids)
+        except Exception as e:
+            logger.error(f"플레이리스트 배치 추가 실패: {str(e)}")
+            failures = {video_id: str(e) for video_id in video_ids}
+        # 영상 업로드는 성공했으므로 결과 대신 입력 순서별 플레이리스트 실패로 기록
+        for video_id, error in failures.items():
+            if video_id in self._video_indices:
+                self.playlist_failures[self._video_indices[video_id]] = error
+
+    async def _upload(self, index: int, task: UploadTask, results: List, semaphore: asyncio.Semaphore) -> None:
+        """영상 하나를 올리고 결과를 기록합니다."""
+        try:
+            video_id = await self.client.insert_video(task.video_file, task.title, task.description, task.tags)
+        except Exception as e:
+            logger.error(f"예약 업로드 실패: {task.video_file} - {str(e)}")
+            results[index] = e
+            if is_quota_exceeded(e):
+                self._stopped = True
+            return
+        finally:
+            semaphore.release()
+
+        results[index] = f"https://youtube.com/watch?v={video_id}"
+        if self.client.playlist_id:
+            self._video_indices[video_id] = index
+            self._playlist.append(video_id)
+            if len(self._playlist) >= self.playlist_batch_size:
+                await self._flush_playlist()
+
+    async def run(self, tasks: List[UploadTask]) -> List[Union[str, Exception]]:
+        """대기 목록의 영상들을 게시 시간대와 할당량에 맞춰 올립니다.
+
+        Args:
+            tasks: 업로드할 영상 목록 (앞에서부터 순서대로 시작)
+
+        Returns:
+            List[Union[str, Exception]]: 입력 순서대로 영상 URL 또는 예외
+                (할당량이 부족해 시작하지 않은 영상은 QuotaExceededError,
+                플레이리스트 추가 실패는 playlist_failures에 기록)
+        """
+        results: List[Union[str, Exception, None]] = [None] * len(tasks)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        uploads = []
+        self._stopped = False
+        self._video_indices = {}
+        self.playlist_failures = {}
+
+        for index, task in enumerate(tasks):
+            wait = self.seconds_until_window()
+            if wait > 0:
+                logger.info(f"게시 시간대까지 {wait:.0f}초 대기")
+                await self.sleep(wait)
+
+            # 앞선 업로드가 할당량을 차감한 뒤에 남은 할당량을 확인
+            await semaphore.acquire()
+            remaining = self.ledger.remaining() - self._playlist_owed
+            if self._stopped or remaining < self.upload_cost:
+                semaphore.release()
+                error = QuotaExceededError(
+                    f"YouTube quota exhausted: {remaining} units left, {self.upload_cost} needed per upload; "
+                    f"resets in {self.ledger.seconds_until_reset():.0f}s"
+                )
+                logger.warning(f"할당량 부족으로 업로드 중단 - 남은 영상 {len(tasks) - index}개")
+                for rest in range(index, len(tasks)):
+                    results[rest] = error
+                break
+
+            delay = self.interval(len(tasks) - index)
+            uploads.append(asyncio.create_task(self._upload(index, task, results, semaphore)))
+            if delay > 0:
+                await self.sleep(delay)
+
+        await asyncio.gather(*uploads)
+        await self._flush_playlist()
+        logger.info(
+            f"예약 업로드 완료 - 성공: {sum(isinstance(result, str) for result in results)}, "
+            f"전체: {len(tasks)}, 남은 할당량: {self.ledger.remaining()}"
+        )
+        return results
+
+    def report(self, tasks: List[UploadTask], results: List[Union[str, Exception]]) -> List[Dict[str, Any]]:
+        """run의 결과를 영상별 상태 목록으로 만듭니다 (작업 저장소 기록용).
+
+        Args:
+            tasks: run에 넘긴 영상 목록
+            results: run의 결과
+
+        Returns:
+            List[Dict[str, Any]]: 입력 순서대로 영상 파일, 상태(uploaded/failed/deferred),
+                영상 URL, 오류 메시지, 플레이리스트 추가 오류
+        """
+        report = []
+        for index, (task, result) in enumerate(zip(tasks, results)):
+            if isinstance(result, str):
+                status = UPLOAD_UPLOADED
+            elif isinstance(result, QuotaExceededError) or is_quota_exceeded(result):
+                status = UPLOAD_DEFERRED
+            else:
+                status = UPLOAD_FAILED
+            report.append({
+                'video_file': task.video_file,
+                'status': status,
+                'video_url': result if isinstance(result, str) else None,
+                'error': None if isinstance(result, str) else str(result),
+                'playlist_error': self.playlist_failures.get(index)
+            })
+        return report
+
+def create_upload_scheduler(client: Optional[YouTubeClient] = None) -> UploadScheduler:
+    """설정값으로 업로드 스케줄러를 만듭니다.
+
+    Args:
+        client: YouTube 클라이언트 (기본값: 새 클라이언트)
+
+    Returns:
+        UploadScheduler: 업로드 스케줄러
+    """
+    settings = get_settings()
+    client = client or YouTubeClient()
+    return UploadScheduler(
+        client,
+        client.quota,
+        window=parse_publish_window(settings.youtube_publish_window),
+        timezone=settings.youtube_publish_timezone,
+        concurrency=settings.youtube_upload_concurrency,
+        playlist_batch_size=settings.youtube_playlist_batch_size
+    )
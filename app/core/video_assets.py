@@ -0,0 +1,259 @@
+from app.core.backgrounds import RGB, render_gradient
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+from PIL import Image, ImageFont
+import hashlib
+import logging
+import os
+import random
+import shutil
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 미리 정의된 배경 팔레트 (같은 팔레트의 배경은 한 번만 렌더링됨)
+BACKGROUND_PALETTES: List[Tuple[RGB, RGB]] = [
+    ((32, 64, 160), (240, 120, 40)),
+    ((18, 18, 48), (120, 40, 160)),
+    ((10, 90, 110), (40, 200, 160)),
+    ((200, 40, 80), (250, 180, 60)),
+    ((20, 30, 40), (70, 110, 150)),
+    ((90, 20, 120), (230, 80, 140)),
+    ((15, 60, 40), (160, 210, 90)),
+    ((40, 40, 40), (180, 150, 110)),
+]
+
+# 캐시에 보관할 자산 파일 수 기본값 (제목마다 오버레이가 하나씩 생기므로 상한이 필요)
+DEFAULT_MAX_ENTRIES = 256
+
+@lru_cache(maxsize=None)
+def get_font(name: str, size: int) -> ImageFont.ImageFont:
+    """폰트를 로드합니다. 같은 (이름, 크기)는 프로세스 안에서 한 번만 로드됩니다.
+
+    Args:
+        name: 폰트 이름 또는 파일 경로
+        size: 폰트 크기
+
+    Returns:
+        ImageFont.ImageFont: 폰트 객체 (로드 실패 시 기본 폰트)
+    """
+    try:
+        return ImageFont.truetype(name, size)
+    except OSError:
+        logger.warning(f"폰트를 찾을 수 없어 기본 폰트를 사용합니다: {name}")
+        return ImageFont.load_default()
+
+def random_palette() -> Tuple[RGB, RGB]:
+    """미리 정의된 팔레트 중 하나를 무작위로 고릅니다.
+
+    Returns:
+        Tuple[RGB, RGB]: 그라데이션 색상 쌍
+    """
+    return random.choice(BACKGROUND_PALETTES)
+
+@contextmanager
+def job_scratch_dir(prefix: str = 'render_') -> Iterator[str]:
+    """렌더링 작업 하나가 단독으로 사용하는 임시 디렉토리를 만듭니다.
+
+    블록이 끝나면 디렉토리와 안의 파일이 모두 삭제됩니다.
+
+    Args:
+        prefix: 디렉토리 이름 접두사
+
+    Returns:
+        Iterator[str]: 임시 디렉토리 경로
+    """
+    path = tempfile.mkdtemp(prefix=prefix)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+class VideoAssetCache:
+    """배경과 텍스트 오버레이 PNG를 한 번만 렌더링하여 재사용하는 캐시
+
+    파일은 내용 키로 이름을 정하고 임시 파일에 저장한 뒤 이름을 바꾸므로,
+    여러 렌더링 작업이 동시에 같은 자산을 요청해도 안전하게 공유됩니다.
+    자산 수가 max_entries를 넘으면 가장 오래 사용하지 않은 자산의 파일과
+    메모리 항목(경로, 키별 잠금)을 함께 삭제합니다.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """VideoAssetCache 인스턴스를 초기화합니다.
+
+        이전 프로세스가 남긴 자산 파일도 수정 시각 순으로 등록하여 상한에 포함합니다.
+
+        Args:
+            cache_dir: 캐시 디렉토리 경로
+            max_entries: 보관할 최대 자산 수 (0이면 제한 없음)
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._paths: OrderedDict[str, str] = OrderedDict()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._load_existing()
+
+    def _load_existing(self) -> None:
+        """캐시 디렉토리에 남아 있는 자산 파일을 오래된 순서로 등록합니다."""
+        entries = []
+        try:
+            kinds = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return
+        for kind in kinds:
+            kind_dir = os.path.join(self.cache_dir, kind)
+            if not os.path.isdir(kind_dir):
+                continue
+            for name in os.listdir(kind_dir):
+                if not name.endswith('.png'):
+                    continue
+                path = os.path.join(kind_dir, name)
+                try:
+                    entries.append((os.path.getmtime(path), name[:-len('.png')], path))
+                except FileNotFoundError:
+                    continue
+        with self._lock:
+            for _, key, path in sorted(entries):
+                self._paths[key] = path
+            evicted = self._evict()
+        self._remove_files(evicted)
+
+    def _evict(self) -> List[str]:
+        """상한을 넘은 만큼 가장 오래 사용하지 않은 항목을 제거합니다 (self._lock 안에서 호출).
+
+        Returns:
+            List[str]: 삭제할 파일 경로 목록
+        """
+        evicted = []
+        while self.max_entries and len(self._paths) > self.max_entries:
+            key, path = self._paths.popitem(last=False)
+            self._locks.pop(key, None)
+            evicted.append(path)
+        return evicted
+
+    def _remove_files(self, paths: List[str]) -> None:
+        """제거된 자산 파일을 삭제합니다."""
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        if paths:
+            logger.info(f"오래 사용하지 않은 영상 자산 {len(paths)}개 삭제: {self.cache_dir}")
+
+    @staticmethod
+    def _make_key(*parts: object) -> str:
+        """자산 속성으로 캐시 키를 만듭니다."""
+        return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:32]
+
+    def _get_or_render(self, kind: str, key: str, render: Callable[[], Image.Image]) -> str:
+        """캐시된 자산 경로를 가져오거나, 없으면 렌더링하여 저장합니다.
+
+        Args:
+            kind: 자산 종류 (하위 디렉토리 이름)
+            key: 캐시 키
+            render: 자산 이미지를 만드는 함수
+
+        Returns:
+            str: PNG 파일 경로
+        """
+        with self._lock:
+            path = self._paths.get(key)
+            if path and os.path.exists(path):
+                self._paths.move_to_end(key)
+                return path
+            key_lock = self._locks.setdefault(key, threading.Lock())
+
+        # 같은 자산을 여러 스레드가 동시에 렌더링하지 않도록 키별로 잠금
+        with key_lock:
+            path = os.path.join(self.cache_dir, kind, f"{key}.png")
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.png')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        render().save(f, format='PNG')
+                    os.replace(temp_path, path)
+                except BaseException:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                    raise
+                logger.info(f"영상 자산 렌더링 완료: {kind}/{key}")
+
+        with self._lock:
+            self._paths[key] = path
+            self._paths.move_to_end(key)
+            evicted = self._evict()
+        self._remove_files(evicted)
+        return path
+
+    def background_path(self, width: int, height: int, colors: Sequence[RGB], style: str = 'vertical') -> str:
+        """그라데이션 배경 PNG 경로를 가져옵니다.
+
+        Args:
+            width: 이미지 너비
+            height: 이미지 높이
+            colors: 그라데이션 색상 목록
+            style: 그라데이션 스타일
+
+        Returns:
+            str: PNG 파일 경로
+        """
+        colors = tuple(tuple(color) for color in colors)
+        key = self._make_key('background', width, height, colors, style)
+        return self._get_or_render(
+            'backgrounds',
+            key,
+            lambda: render_gradient(width, height, colors, style)
+        )
+
+    def overlay_path(self, title: str, width: int, height: int, font_name: str, font_size: int,
+                     render: Callable[[], Image.Image]) -> str:
+        """제목 텍스트 오버레이 PNG 경로를 가져옵니다. 같은 제목은 한 번만 렌더링됩니다.
+
+        Args:
+            title: 제목
+            width: 이미지 너비
+            height: 이미지 높이
+            font_name: 폰트 이름
+            font_size: 폰트 크기
+            render: 오버레이 이미지를 만드는 함수
+
+        Returns:
+            str: PNG 파일 경로
+        """
+        key = self._make_key('overlay', title, width, height, font_name, font_size)
+        return self._get_or_render('overlays', key, render)
+
+    def prerender_backgrounds(self, width: int, height: int, style: str = 'vertical') -> List[str]:
+        """모든 팔레트의 배경을 미리 렌더링합니다.
+
+        Args:
+            width: 이미지 너비
+            height: 이미지 높이
+            style: 그라데이션 스타일
+
+        Returns:
+            List[str]: PNG 파일 경로 목록
+        """
+        return [
+            self.background_path(width, height, palette, style)
+            for palette in BACKGROUND_PALETTES
+        ]
+
+@lru_cache(maxsize=None)
+def get_asset_cache(cache_dir: str, max_entries: int = DEFAULT_MAX_ENTRIES) -> VideoAssetCache:
+    """캐시 디렉토리별로 프로세스 전체에서 공유하는 자산 캐시를 가져옵니다.
+
+    Args:
+        cache_dir: 캐시 디렉토리 경로
+        max_entries: 보관할 최대 자산 수 (0이면 제한 없음)
+
+    Returns:
+        VideoAssetCache: 자산 캐시
+    """
+    return VideoAssetCache(cache_dir, max_entries)
@@ -1,106 +1,168 @@
 import ffmpeg
+import asyncio
 import os
 import tempfile
+import uuid
 from app.config import get_settings
-from typing import Dict, Any
-import random
-from PIL import Image, ImageDraw, ImageFont
+from app.core.backgrounds import render_gradient
+from app.core.video_assets import get_asset_cache, get_font, job_scratch_dir, random_palette
+from app.core.render_farm import get_render_farm
+from app.core.audio_metadata import get_audio_duration_us
+from app.core.captions import (
+    CaptionCue, CaptionStyle, cues_from_script, cues_from_sentences, resolve_caption_font,
+    subtitles_filter_available, write_captions
+)
+from app.core.encoding_profiles import EncodingProfile, get_profile
+from app.utils.text_utils import split_sentences
+from typing import Dict, Any, List, Optional
+from PIL import Image, ImageDraw
 import textwrap
 
+# 제목 오버레이가 나타나고 사라지는 시간(초)
+FADE_DURATION = 0.5
+
 class VideoGenerator:
     def __init__(self):
         settings = get_settings()
         self.width = settings.video_width
         self.height = settings.video_height
         self.fps = settings.fps
-
-    async def generate_video(self, audio_file: str, content_data: Dict[str, Any]) -> str:
+        self.background_style = settings.background_style
+        self.font_name = settings.video_font
+        self.font_size = settings.video_font_size
+        self.assets = get_asset_cache(settings.video_asset_cache_dir, settings.video_asset_cache_max_entries)
+        self.render_timeout = settings.render_timeout
+        self.profile = get_profile(settings.video_profile)
+        # libass가 없는 ffmpeg에서는 모든 렌더링이 실패하므로 자막 없이 렌더링
+        self.captions_enabled = settings.captions_enabled and subtitles_filter_available()
+        self.caption_font, self.caption_fonts_dir = resolve_caption_font(settings.caption_font)
+        self.caption_font_size = settings.caption_font_size
+        self.caption_max_chars = settings.caption_max_chars
+        self.caption_margin = settings.caption_margin
+        self.caption_format = settings.caption_format
+
+    def warm_up(self) -> None:
+        # 모든 배경 팔레트를 미리 렌더링하고 폰트를 로드
+        self.assets.prerender_backgrounds(self.width, self.height, self.background_style)
+        get_font(self.font_name, self.font_size)
+
+    async def generate_video(self, audio_file: str, content_data: Dict[str, Any], profile: Optional[str] = None) -> str:
         try:
-            # 임시 파일 생성
-            temp_dir = tempfile.gettempdir()
-            output_file = os.path.join(temp_dir, f"video_{hash(str(content_data))}.mp4")
-
-            # 배경 이미지 생성
-            background = self._create_background()
-            background_path = os.path.join(temp_dir, "background.png")
-            background.save(background_path)
-
-            # 텍스트 오버레이 생성
-            text_overlay = self._create_text_overlay(content_data)
-            text_path = os.path.join(temp_dir, "text.png")
-            text_overlay.save(text_path)
-
-            # FFmpeg 명령어 구성
-            stream = (
-                ffmpeg
-                .input(background_path, loop=1, t=self._get_audio_duration(audio_file))
-                .filter('fps', fps=self.fps)
-                .filter('scale', self.width, self.height)
-                .overlay(
-                    ffmpeg.input(text_path).filter('fade', 'in', 0.5).filter('fade', 'out', 0.5),
-                    x='(W-w)/2',
-                    y='(H-h)/2'
-                )
-                .output(
-                    output_file,
-                    acodec='aac',
-                    audio_bitrate='192k',
-                    vcodec='libx264',
-                    video_bitrate='2500k',
-                    preset='medium',
-                    movflags='faststart'
-                )
-                .overwrite_output()
-            )
+            encoding = get_profile(profile) if profile else self.profile
 
-            # 비디오 생성
-            stream.run(capture_stdout=True, capture_stderr=True)
+            # 결과 파일 경로 (동시 렌더링끼리 겹치지 않도록 고유 이름 사용)
+            output_file = os.path.join(tempfile.gettempdir(), f"video_{uuid.uuid4().hex}.mp4")
+
+            # 배경 이미지와 텍스트 오버레이는 캐시에서 재사용 (렌더링은 스레드에서 실행)
+            background_path = await asyncio.to_thread(
+                self.assets.background_path,
+                self.width, self.height, random_palette(), self.background_style
+            )
+            text_path = await asyncio.to_thread(
+                self.assets.overlay_path,
+                content_data.get('title', ''),
+                self.width,
+                self.height,
+                self.font_name,
+                self.font_size,
+                lambda: self._create_text_overlay(content_data)
+            )
+            duration = await asyncio.to_thread(self._get_audio_duration, audio_file)
+
+            # 작업별 임시 디렉토리에서 인코딩 후 결과 경로로 이동
+            with job_scratch_dir() as scratch_dir:
+                scratch_output = os.path.join(scratch_dir, "output.mp4")
+
+                # 스크립트 자막은 파일로만 만들고 그리기는 인코딩 중에 libass가 처리
+                captions_path = None
+                cues = self._caption_cues(content_data, duration)
+                if cues:
+                    captions_path = write_captions(
+                        os.path.join(scratch_dir, f"captions.{self.caption_format}"), cues, self._caption_style()
+                    )
+
+                # 배경, 오버레이, 음성, 자막을 한 번의 인코딩으로 합성
+                stream = self._build_stream(
+                    background_path, text_path, audio_file, duration, scratch_output, encoding, captions_path
+                )
 
-            # 임시 파일 정리
-            os.remove(background_path)
-            os.remove(text_path)
+                # 렌더링 팜의 워커 프로세스에서 인코딩 (이벤트 루프를 막지 않음)
+                await get_render_farm().run(stream.compile(), timeout=self.render_timeout)
+                os.replace(scratch_output, output_file)
 
             return output_file
 
         except Exception as e:
             raise Exception(f"Failed to generate video: {str(e)}")
 
-    def _create_background(self) -> Image.Image:
-        # 랜덤 그라데이션 배경 생성
-        image = Image.new('RGB', (self.width, self.height))
-        draw = ImageDraw.Draw(image)
-
-        # 랜덤 색상 선택
-        color1 = (
-            random.randint(0, 255),
-            random.randint(0, 255),
-            random.randint(0, 255)
+    def _still(self, image_path: str, duration: float, pix_fmt: str):
+        # 한 번만 디코딩하고 오버레이 형식으로 변환한 프레임을 입력 프레임 레이트로 duration초 동안 반복
+        # (-loop 1 입력은 매 프레임마다 PNG를 다시 디코딩하고, 반복 후 변환하면 매 프레임 변환함)
+        return (
+            ffmpeg
+            .input(image_path, framerate=self.fps)
+            .filter('format', pix_fmt)
+            .filter('loop', loop=-1, size=1)
+            .filter('trim', duration=duration)
         )
-        color2 = (
-            random.randint(0, 255),
-            random.randint(0, 255),
-            random.randint(0, 255)
+
+    def _caption_cues(self, content_data: Dict[str, Any], duration: float) -> List[CaptionCue]:
+        # 문장 단위 합성의 문장별 재생 시간이 있으면 그대로, 없으면 스크립트 글자 수 비율로 자막 시각을 정함
+        if not self.captions_enabled:
+            return []
+        script = content_data.get('script')
+        if not script:
+            return []
+        durations = content_data.get('sentence_durations')
+        sentences = split_sentences(script)
+        if durations and len(durations) == len(sentences) and all(durations):
+            return cues_from_sentences(sentences, durations, self.caption_max_chars)
+        return cues_from_script(script, round(duration * 1_000_000), self.caption_max_chars)
+
+    def _caption_style(self) -> CaptionStyle:
+        return CaptionStyle(
+            font=self.caption_font,
+            font_size=self.caption_font_size,
+            width=self.width,
+            height=self.height,
+            margin_v=self.caption_margin
         )
 
-        # 그라데이션 그리기
-        for y in range(self.height):
-            r = int(color1[0] * (1 - y/self.height) + color2[0] * (y/self.height))
-            g = int(color1[1] * (1 - y/self.height) + color2[1] * (y/self.height))
-            b = int(color1[2] * (1 - y/self.height) + color2[2] * (y/self.height))
-            draw.line([(0, y), (self.width, y)], fill=(r, g, b))
+    def _build_stream(self, background_path: str, text_path: str, audio_file: str, duration: float,
+                      output_file: str, profile: EncodingProfile, captions_path: Optional[str] = None):
+        # 배경은 이미 출력 크기로 렌더링되어 있으므로 scale/fps 필터 없이 반복
+        # 제목은 알파 채널만 페이드하여 음성 시작과 끝에 맞춰 나타나고 사라지게 함
+        fade = min(FADE_DURATION, duration / 2)
+        title = (
+            self._still(text_path, duration, 'yuva420p')
+            .filter('fade', type='in', start_time=0, duration=fade, alpha=1)
+            .filter('fade', type='out', start_time=max(0.0, duration - fade), duration=fade, alpha=1)
+        )
+        video = self._still(background_path, duration, 'yuv420p').overlay(title, x='(W-w)/2', y='(H-h)/2')
+        if captions_path:
+            # 자막은 같은 필터 그래프에서 libass로 그림 (폰트 파일을 지정했으면 그 디렉토리에서 찾음)
+            options = {'fontsdir': self.caption_fonts_dir} if self.caption_fonts_dir else {}
+            video = video.filter('subtitles', captions_path, **options)
+        audio = ffmpeg.input(audio_file).audio
+
+        # 음성을 같은 패스에서 AAC로 인코딩하여 다중화하고, 짧은 스트림에 맞춰 종료
+        return (
+            ffmpeg
+            .output(video, audio, output_file, shortest=None, **profile.output_options(self.fps))
+            .overwrite_output()
+        )
 
-        return image
+    def _create_background(self) -> Image.Image:
+        # 팔레트 중 하나로 그라데이션 배경 생성 (전체 픽셀을 배열 연산으로 계산)
+        return render_gradient(self.width, self.height, random_palette(), style=self.background_style)
 
     def _create_text_overlay(self, content_data: Dict[str, Any]) -> Image.Image:
         # 텍스트 오버레이 이미지 생성
         image = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
         draw = ImageDraw.Draw(image)
 
-        # 폰트 설정
-        try:
-            font = ImageFont.truetype("Arial", 60)
-        except:
-            font = ImageFont.load_default()
+        # 폰트 설정 (프로세스 전체에서 한 번만 로드)
+        font = get_font(self.font_name, self.font_size)
 
         # 텍스트 줄바꿈
         title = content_data.get('title', '')
@@ -118,6 +180,5 @@ class VideoGenerator:
         return image
 
     def _get_audio_duration(self, audio_file: str) -> float:
-        # 오디오 파일 길이 가져오기
-        probe = ffmpeg.probe(audio_file)
-        return float(probe['format']['duration']) 
\ No newline at end of file
+        # 오디오 파일 길이(초) 가져오기 (MP3는 ffprobe 프로세스 없이 헤더에서 계산)
+        return get_audio_duration_us(audio_file) / 1_000_000 
\ No newline at end of file
@@ -0,0 +1,159 @@
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List
+import json
+import logging
+import os
+import shutil
+
+logger = logging.getLogger(__name__)
+
+# 주제 디렉토리 안의 문장 조각 디렉토리와 매니페스트 파일 이름
+SEGMENTS_DIRNAME = "segments"
+MANIFEST_FILENAME = "segments.json"
+
+@dataclass
+class VoiceSegment:
+    """주제 음성을 이루는 문장 하나의 합성 결과"""
+    key: str
+    text: str
+    duration_us: int
+
+@dataclass
+class SegmentManifest:
+    """주제 음성의 문장 순서와 문장별 해시(합성 요청 캐시 키)를 기록하는 매니페스트"""
+    segments: List[VoiceSegment] = field(default_factory=list)
+
+    def save(self, path: str) -> None:
+        """매니페스트를 JSON 파일로 원자적으로 저장합니다.
+
+        Args:
+            path: 매니페스트 파일 경로
+        """
+        temp_path = f"{path}.part"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'SegmentManifest':
+        """JSON 파일에서 매니페스트를 읽습니다.
+
+        Args:
+            path: 매니페스트 파일 경로
+
+        Returns:
+            SegmentManifest: 매니페스트
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(segments=[VoiceSegment(**segment) for segment in data.get('segments', [])])
+
+class VoiceSegmentStore:
+    """주제 디렉토리(data/<topic>/)에 문장별 음성 조각을 보관하는 저장소
+
+    조각 파일 이름은 문장 텍스트, 음성 ID, 모델, 음성 설정의 해시이므로 스크립트를
+    고친 뒤에도 바뀌지 않은 문장은 같은 파일을 가리킵니다. 공유 TTS 캐시와 달리
+    크기 제한으로 삭제되지 않아, 편집 후 다시 합성할 때 바뀐 문장만 API로 보낼 수 있습니다.
+    """
+
+    def __init__(self, topic_dir: str):
+        """VoiceSegmentStore 인스턴스를 초기화합니다.
+
+        Args:
+            topic_dir: 주제 디렉토리 경로
+        """
+        self.segments_dir = os.path.join(topic_dir, SEGMENTS_DIRNAME)
+        self.manifest_path = os.path.join(topic_dir, MANIFEST_FILENAME)
+
+    def path_for(self, key: str) -> str:
+        """문장 해시에 해당하는 조각 파일 경로를 반환합니다.
+
+        Args:
+            key: 문장 해시
+
+        Returns:
+            str: 조각 파일 경로
+        """
+        return os.path.join(self.segments_dir, f"{key}.mp3")
+
+    def load(self) -> Dict[str, VoiceSegment]:
+        """매니페스트에 기록되어 있고 조각 파일도 남아 있는 문장들을 읽습니다.
+
+        매니페스트가 없거나 손상된 경우 빈 결과를 반환하여 모든 문장을 다시 합성하게 합니다.
+
+        Returns:
+            Dict[str, VoiceSegment]: 문장 해시별 조각 정보
+        """
+        try:
+            manifest = SegmentManifest.load(self.manifest_path)
+        except FileNotFoundError:
+            return {}
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"문장 조각 매니페스트를 읽을 수 없어 무시합니다: {self.manifest_path} ({str(e)})")
+            return {}
+        return {
+            segment.key: segment
+            for segment in manifest.segments
+            if os.path.exists(self.path_for(segment.key))
+        }
+
+    def add(self, key: str, source_path: str) -> str:
+        """합성된 오디오 파일을 조각으로 복사합니다.
+
+        임시 파일에 복사한 뒤 이름을 바꿔 중간에 실패해도 불완전한 조각이 남지 않습니다.
+
+        Args:
+            key: 문장 해시
+            source_path: 합성된 오디오 파일 경로 (TTS 캐시 파일)
+
+        Returns:
+            str: 조각 파일 경로
+        """
+        os.makedirs(self.segments_dir, exist_ok=True)
+        path = self.path_for(key)
+        temp_path = f"{path}.{os.getpid()}.part"
+        try:
+            shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return path
+
+    def save(self, segments: Iterable[VoiceSegment]) -> None:
+        """문장 순서대로 매니페스트를 기록하고 더 이상 쓰지 않는 조각 파일을 삭제합니다.
+
+        Args:
+            segments: 현재 스크립트의 문장 순서대로 조각 정보
+        """
+        manifest = SegmentManifest(segments=list(segments))
+        os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+        manifest.save(self.manifest_path)
+        self.prune(segment.key for segment in manifest.segments)
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """keep에 없는 조각 파일을 삭제합니다.
+
+        Args:
+            keep: 남길 문장 해시 목록
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        keep_names = {f"{key}.mp3" for key in keep}
+        try:
+            names = os.listdir(self.segments_dir)
+        except FileNotFoundError:
+            return 0
+        removed = 0
+        for name in names:
+            if name in keep_names:
+                continue
+            try:
+                os.remove(os.path.join(self.segments_dir, name))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        if removed:
+            logger.info(f"사용하지 않는 문장 조각 {removed}개 삭제: {self.segments_dir}")
+        return removed
@@ -1,77 +1,203 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 from app.config import get_settings
-import json
+from app.core.youtube_quota import QuotaLedger, get_quota_ledger
+from app.core.youtube_upload import ProgressCallback, ResumableUploader, UploadSessionStore, normalize_chunk_size
+from app.utils.google_clients import get_google_service
+from typing import Dict, List, Optional
+import asyncio
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
+YOUTUBE_UPLOAD_SCOPE = 'https://www.googleapis.com/auth/youtube.upload'
+
+# 배치 요청 하나에 담을 수 있는 최대 호출 수
+MAX_BATCH_SIZE = 50
+
+def is_quota_exceeded(error: Exception) -> bool:
+    """YouTube API 오류가 할당량 초과(quotaExceeded)인지 확인합니다.
+
+    Args:
+        error: 발생한 예외
+
+    Returns:
+        bool: 할당량 초과 여부
+    """
+    if isinstance(error, HttpError):
+        return error.resp.status == 403 and b'quotaExceeded' in (error.content or b'')
+    return 'quotaExceeded' in str(error)
+
 class YouTubeClient:
-    def __init__(self):
+    def __init__(self, youtube=None, quota: Optional[QuotaLedger] = None):
         settings = get_settings()
-        credentials_dict = json.loads(settings.google_sheets_credentials)
-        credentials = service_account.Credentials.from_service_account_info(
-            credentials_dict,
-            scopes=['https://www.googleapis.com/auth/youtube.upload']
-        )
-        self.youtube = build('youtube', 'v3', credentials=credentials)
+        self.youtube = youtube or get_google_service('youtube', 'v3', (YOUTUBE_UPLOAD_SCOPE,))
+        self.quota = quota or get_quota_ledger(settings.youtube_quota_path, settings.youtube_daily_quota)
         self.channel_id = settings.youtube_channel_id
         self.playlist_id = settings.youtube_playlist_id
 
-    async def upload_video(self, video_file: str, title: str = None, description: str = None, tags: list = None) -> str:
+        # 청크 단위 재개 가능한 업로드 설정
+        self.chunk_size = normalize_chunk_size(settings.youtube_upload_chunk_size)
+        self.uploader = ResumableUploader(
+            sessions=UploadSessionStore(settings.youtube_upload_session_dir, settings.youtube_upload_session_ttl),
+            max_retries=settings.youtube_upload_max_retries
+        )
+
+    async def upload_video(self, video_file: str, title: str = None, description: str = None, tags: list = None,
+                           progress: Optional[ProgressCallback] = None) -> str:
+        """영상을 청크 단위로 업로드하고 플레이리스트에 추가합니다.
+
+        업로드는 스레드에서 실행되므로 이벤트 루프를 막지 않으며, progress 콜백도 그 스레드에서 호출됩니다.
+
+        Args:
+            video_file: 영상 파일 경로
+            title: 영상 제목
+            description: 영상 설명
+            tags: 태그 목록
+            progress: 청크마다 (보낸 바이트 수, 전체 바이트 수)로 호출할 콜백
+
+        Returns:
+            str: 업로드된 영상 URL
+
+        Raises:
+            Exception: 업로드에 실패한 경우
+        """
+        video_id = await self.insert_video(video_file, title, description, tags, progress)
+        if self.playlist_id:
+            failures = await self.add_to_playlist([video_id])
+            if failures:
+                raise Exception(f"Failed to add video to playlist: {failures[video_id]}")
+        return f"https://youtube.com/watch?v={video_id}"
+
+    async def insert_video(self, video_file: str, title: str = None, description: str = None, tags: list = None,
+                           progress: Optional[ProgressCallback] = None) -> str:
+        """영상을 청크 단위로 업로드합니다 (플레이리스트에는 추가하지 않음).
+
+        새 업로드 세션을 시작하기 전에 videos.insert 할당량을 차감합니다.
+
+        Args:
+            video_file: 영상 파일 경로
+            title: 영상 제목
+            description: 영상 설명
+            tags: 태그 목록
+            progress: 청크마다 (보낸 바이트 수, 전체 바이트 수)로 호출할 콜백
+
+        Returns:
+            str: 업로드된 영상 ID
+
+        Raises:
+            Exception: 할당량이 부족하거나 업로드에 실패한 경우
+        """
         try:
-            # 비디오 메타데이터 설정
-            body = {
-                'snippet': {
-                    'title': title or 'AI Generated Shorts',
-                    'description': description or 'Generated using AI Shorts Generator',
-                    'tags': tags or [],
-                    'categoryId': '22'  # People & Blogs
-                },
-                'status': {
-                    'privacyStatus': 'public',
-                    'selfDeclaredMadeForKids': False
-                }
+            return await asyncio.to_thread(self._insert_video, video_file, title, description, tags, progress)
+        except Exception as e:
+            if is_quota_exceeded(e):
+                self.quota.exhaust()
+            raise Exception(f"Failed to upload video to YouTube: {str(e)}")
+
+    def _insert_video(self, video_file: str, title: Optional[str], description: Optional[str],
+                      tags: Optional[list], progress: Optional[ProgressCallback]) -> str:
+        """영상을 업로드하는 동기 구현"""
+        # 비디오 메타데이터 설정
+        body = {
+            'snippet': {
+                'title': title or 'AI Generated Shorts',
+                'description': description or 'Generated using AI Shorts Generator',
+                'tags': tags or [],
+                'categoryId': '22'  # People & Blogs
+            },
+            'status': {
+                'privacyStatus': 'public',
+                'selfDeclaredMadeForKids': False
             }
+        }
 
-            # 비디오 파일 업로드
-            media = MediaFileUpload(
-                video_file,
-                mimetype='video/mp4',
-                resumable=True
-            )
-
-            # 업로드 요청
-            request = self.youtube.videos().insert(
-                part=','.join(body.keys()),
-                body=body,
-                media_body=media
-            )
-
-            # 업로드 실행
-            response = request.execute()
-
-            # 플레이리스트에 추가
-            if self.playlist_id:
-                self.youtube.playlistItems().insert(
-                    part='snippet',
-                    body={
-                        'snippet': {
-                            'playlistId': self.playlist_id,
-                            'resourceId': {
-                                'kind': 'youtube#video',
-                                'videoId': response['id']
-                            }
-                        }
-                    }
-                ).execute()
+        # 비디오 파일 업로드
+        media = MediaFileUpload(
+            video_file,
+            mimetype='video/mp4',
+            chunksize=self.chunk_size,
+            resumable=True
+        )
+
+        # 업로드 요청
+        request = self.youtube.videos().insert(
+            part=','.join(body.keys()),
+            body=body,
+            media_body=media
+        )
+
+        # 이어서 올리는 세션은 이미 할당량이 차감되었으므로 새 세션을 시작할 때만 차감
+        # (저장된 세션이 만료되어 처음부터 다시 올리는 경우도 새 videos.insert 호출)
+        session_key = UploadSessionStore.make_key(video_file, body)
+
+        # 청크 단위로 업로드 (실패 시 받은 범위부터 재개)
+        response = self.uploader.upload(
+            request,
+            session_key=session_key,
+            progress=progress,
+            on_new_session=lambda: self.quota.reserve('videos.insert')
+        )
+        return response['id']
+
+    async def add_to_playlist(self, video_ids: List[str]) -> Dict[str, str]:
+        """영상들을 플레이리스트에 추가합니다. 최대 50개씩 하나의 배치 HTTP 요청으로 보냅니다.
 
-            return f"https://youtube.com/watch?v={response['id']}"
+        Args:
+            video_ids: 영상 ID 목록
 
+        Returns:
+            Dict[str, str]: 추가에 실패한 영상 ID -> 오류 메시지
+
+        Raises:
+            Exception: 할당량이 부족하거나 배치 요청에 실패한 경우
+        """
+        try:
+            return await asyncio.to_thread(self._add_to_playlist, video_ids)
         except Exception as e:
-            raise Exception(f"Failed to upload video to YouTube: {str(e)}")
+            raise Exception(f"Failed to add videos to playlist: {str(e)}")
+
+    def _add_to_playlist(self, video_ids: List[str]) -> Dict[str, str]:
+        """플레이리스트 배치 추가의 동기 구현"""
+        failures: Dict[str, str] = {}
+        video_ids = list(dict.fromkeys(video_ids))
+
+        def callback(request_id: str, response: dict, exception: Exception) -> None:
+            if exception is not None:
+                if is_quota_exceeded(exception):
+                    self.quota.exhaust()
+                failures[request_id] = str(exception)
+
+        for start in range(0, len(video_ids), MAX_BATCH_SIZE):
+            chunk = video_ids[start:start + MAX_BATCH_SIZE]
+            self.quota.reserve('playlistItems.insert', len(chunk))
+            batch = self.youtube.new_batch_http_request(callback=callback)
+            for video_id in chunk:
+                batch.add(
+                    self.youtube.playlistItems().insert(
+                        part='snippet',
+                        body={
+                            'snippet': {
+                                'playlistId': self.playlist_id,
+                                'resourceId': {
+                                    'kind': 'youtube#video',
+                                    'videoId': video_id
+                                }
+                            }
+                        }
+                    ),
+                    request_id=video_id
+                )
+            batch.execute()
+
+        if failures:
+            logger.error(f"플레이리스트 추가 실패: {len(failures)}개 - {failures}")
+        return failures
 
     async def get_video_status(self, video_id: str) -> dict:
         try:
+            self.quota.reserve('videos.list')
             response = self.youtube.videos().list(
                 part='status',
                 id=video_id
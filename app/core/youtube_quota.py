@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# YouTube Data API 메서드별 할당량 비용 (단위)
+QUOTA_COSTS = {
+    'videos.insert': 1600,
+    'playlistItems.insert': 50,
+    'videos.list': 1,
+}
+
+# YouTube 할당량은 태평양 시간 자정에 초기화됨
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+
+class QuotaExceededError(Exception):
+    """오늘 남은 YouTube API 할당량으로 호출할 수 없는 경우"""
+
+class QuotaLedger:
+    """YouTube Data API 할당량 사용량을 날짜(태평양 시간)별로 기록하는 SQLite 장부
+
+    호출 전에 reserve로 비용을 먼저 차감하므로, 여러 업로드가 동시에 진행되어도
+    일일 한도를 넘는 호출은 보내지 않습니다.
+    """
+
+    def __init__(self, path: str, daily_limit: int, clock=time.time):
+        """QuotaLedger 인스턴스를 초기화합니다.
+
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+            daily_limit: 하루 할당량 (단위)
+            clock: 현재 시각(초)을 반환하는 함수
+        """
+        self.path = path
+        self.daily_limit = daily_limit
+        self.clock = clock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """처음 사용할 때 데이터베이스를 열고 테이블을 만듭니다. 잠금을 잡은 상태에서 호출합니다."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS quota_usage ("
+                "day TEXT NOT NULL, method TEXT NOT NULL, units INTEGER NOT NULL, "
+                "PRIMARY KEY (day, method))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def today(self) -> str:
+        """할당량 기준 날짜 (태평양 시간, YYYY-MM-DD)"""
+        return datetime.fromtimestamp(self.clock(), QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+    def seconds_until_reset(self) -> float:
+        """할당량이 초기화될 때까지 남은 시간(초)"""
+        now = datetime.fromtimestamp(self.clock(), QUOTA_TIMEZONE)
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (midnight - now).total_seconds()
+
+    def _used(self, conn: sqlite3.Connection, day: str) -> int:
+        """날짜의 사용량 합계를 조회합니다."""
+        return conn.execute("SELECT COALESCE(SUM(units), 0) FROM quota_usage WHERE day = ?", (day,)).fetchone()[0]
+
+    def _add(self, conn: sqlite3.Connection, day: str, method: str, units: int) -> None:
+        """메서드 사용량을 더합니다."""
+        conn.execute(
+            "INSERT INTO quota_usage (day, method, units) VALUES (?, ?, ?) "
+            "ON CONFLICT (day, method) DO UPDATE SET units = MAX(0, units + excluded.units)",
+            (day, method, units)
+        )
+
+    def used(self) -> int:
+        """오늘 사용한 할당량"""
+        with self._lock:
+            return self._used(self._connect(), self.today())
+
+    def remaining(self) -> int:
+        """오늘 남은 할당량"""
+        return max(0, self.daily_limit - self.used())
+
+    def usage(self) -> Dict[str, int]:
+        """오늘 메서드별 사용량"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT method, units FROM quota_usage WHERE day = ?", (self.today(),)
+            ).fetchall()
+        return dict(rows)
+
+    def reserve(self, method: str, count: int = 1) -> None:
+        """호출 비용을 오늘 할당량에서 먼저 차감합니다.
+
+        Args:
+            method: API 메서드 이름 (예: 'videos.insert')
+            count: 호출 횟수
+
+        Raises:
+            QuotaExceededError: 남은 할당량이 부족한 경우
+        """
+        units = QUOTA_COSTS[method] * count
+        day = self.today()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                used = self._used(conn, day)
+                if used + units > self.daily_limit:
+                    raise QuotaExceededError(
+                        f"YouTube quota exhausted: {method} needs {units} units, "
+                        f"{self.daily_limit - used} of {self.daily_limit} left for {day}"
+                    )
+                self._add(conn, day, method, units)
+
+    def refund(self, method: str, count: int = 1) -> None:
+        """보내지 않은 호출의 비용을 되돌립니다.
+
+        Args:
+            method: API 메서드 이름
+            count: 호출 횟수
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._add(conn, self.today(), method, -QUOTA_COSTS[method] * count)
+
+    def exhaust(self) -> None:
+        """API가 quotaExceeded를 반환한 경우 오늘 남은 할당량을 모두 사용한 것으로 기록합니다."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                day = self.today()
+                remaining = self.daily_limit - self._used(conn, day)
+                if remaining > 0:
+                    self._add(conn, day, 'quotaExceeded', remaining)
+        logger.warning("YouTube API가 할당량 초과를 반환하여 오늘 업로드를 중단합니다")
+
+    def close(self) -> None:
+        """데이터베이스 연결을 닫습니다."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+@lru_cache(maxsize=None)
+def get_quota_ledger(path: str, daily_limit: int) -> QuotaLedger:
+    """데이터베이스 경로별로 프로세스 전체에서 공유하는 할당량 장부를 가져옵니다.
+
+    Args:
+        path: SQLite 데이터베이스 파일 경로
+        daily_limit: 하루 할당량 (단위)
+
+    Returns:
+        QuotaLedger: 할당량 장부
+    """
+    return QuotaLedger(path, daily_limit)
@@ -0,0 +1,286 @@
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import http.client
+import httplib2
+import json
+import logging
+import os
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 HTTP 상태 코드와 전송 오류
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRYABLE_EXCEPTIONS = (httplib2.HttpLib2Error, http.client.HTTPException, ConnectionError, TimeoutError)
+
+# 업로드 세션이 만료되었음을 뜻하는 상태 코드
+EXPIRED_SESSION_STATUS_CODES = (404, 410)
+
+# 재개 가능한 업로드의 청크는 256KiB의 배수여야 함
+CHUNK_GRANULARITY = 256 * 1024
+
+# 업로드 진행 콜백: (보낸 바이트 수, 전체 바이트 수)
+ProgressCallback = Callable[[int, int], None]
+
+def normalize_chunk_size(chunk_size: int) -> int:
+    """청크 크기를 256KiB의 배수로 내림합니다 (최소 256KiB).
+
+    Args:
+        chunk_size: 원하는 청크 크기(바이트)
+
+    Returns:
+        int: 사용할 청크 크기(바이트)
+    """
+    return max(CHUNK_GRANULARITY, chunk_size // CHUNK_GRANULARITY * CHUNK_GRANULARITY)
+
+class UploadSessionStore:
+    """재개 가능한 업로드의 세션 URI를 디스크에 저장하여 프로세스가 죽어도 이어서 올릴 수 있게 하는 저장소
+
+    세션은 파일 경로, 크기, 수정 시각, 메타데이터로 만든 키마다 JSON 파일 하나로 저장됩니다.
+    YouTube 업로드 세션은 약 1주일 동안 유효하므로 ttl이 지난 세션은 사용하지 않습니다.
+    """
+
+    def __init__(self, directory: str, ttl: float):
+        """UploadSessionStore 인스턴스를 초기화합니다.
+
+        Args:
+            directory: 세션 파일을 저장할 디렉토리
+            ttl: 세션 유효 시간(초)
+        """
+        self.directory = directory
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(video_file: str, body: Dict[str, Any]) -> str:
+        """업로드할 파일과 메타데이터로 세션 키를 만듭니다.
+
+        Args:
+            video_file: 영상 파일 경로
+            body: 영상 메타데이터
+
+        Returns:
+            str: 16진수 SHA-256 해시
+        """
+        stat = os.stat(video_file)
+        payload = json.dumps(
+            {
+                'path': os.path.abspath(video_file),
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'body': body
+            },
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """세션 파일 경로를 만듭니다."""
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[str]:
+        """저장된 세션 URI를 가져옵니다.
+
+        Args:
+            key: 세션 키
+
+        Returns:
+            Optional[str]: 세션 URI (없거나 만료되었으면 None)
+        """
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - session.get('created_at', 0) > self.ttl:
+            self.delete(key)
+            return None
+        return session.get('resumable_uri')
+
+    def save(self, key: str, resumable_uri: str) -> None:
+        """세션 URI를 원자적으로 저장합니다.
+
+        Args:
+            key: 세션 키
+            resumable_uri: 업로드 세션 URI
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self._path(key)}.part"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'resumable_uri': resumable_uri, 'created_at': time.time()}, f)
+        os.replace(temp_path, self._path(key))
+
+    def delete(self, key: str) -> None:
+        """세션을 삭제합니다.
+
+        Args:
+            key: 세션 키
+        """
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+class ResumableUploader:
+    """googleapiclient의 재개 가능한 업로드 요청을 청크 단위로 보내는 업로더
+
+    청크마다 진행 상황을 알리고, 5xx/429 응답이나 연결 오류가 나면 지수 백오프 후
+    서버에 이미 받은 범위를 물어본 뒤 그 지점부터 이어서 보냅니다. 세션 URI는
+    저장소에 기록되므로 다른 프로세스에서도 같은 업로드를 이어갈 수 있습니다.
+    """
+
+    def __init__(self, sessions: Optional[UploadSessionStore] = None, max_retries: int = 10,
+                 backoff_base: float = 1.0, backoff_max: float = 64.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        """ResumableUploader 인스턴스를 초기화합니다.
+
+        Args:
+            sessions: 업로드 세션 저장소 (None이면 세션을 저장하지 않음)
+            max_retries: 연속 재시도 최대 횟수
+            backoff_base: 첫 재시도 대기 시간(초)
+            backoff_max: 재시도 대기 시간 상한(초)
+            sleep: 대기 함수
+        """
+        self.sessions = sessions
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sleep = sleep
+
+    def _backoff(self, attempt: int) -> float:
+        """재시도 대기 시간을 계산합니다 (지수 증가 + 지터)."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return delay * (0.5 + random.random() / 2)
+
+    def _resume(self, request: HttpRequest, resumable_uri: str) -> Optional[Dict[str, Any]]:
+        """저장된 세션에 서버가 받은 범위를 물어보고 그 지점부터 이어가도록 요청을 설정합니다.
+
+        googleapiclient의 내부 상태를 건드리지 않도록 상태 조회(Content-Range: bytes */N)는
+        요청의 http 객체로 직접 보냅니다. 재시도할 수 있는 오류는 지수 백오프 후 다시 조회합니다.
+
+        Args:
+            request: resumable=True인 미디어를 가진 요청
+            resumable_uri: 저장된 세션 URI
+
+        Returns:
+            Optional[Dict[str, Any]]: 이미 업로드가 끝난 세션이면 완료 응답, 아니면 None
+
+        Raises:
+            HttpError: 재시도할 수 없는 응답(만료된 세션 포함)을 받았거나 재시도 횟수를 넘긴 경우
+            Exception: 재시도 횟수를 넘긴 전송 오류
+        """
+        size = request.resumable.size()
+        headers = {'Content-Range': f"bytes */{size if size is not None else '*'}", 'Content-Length': '0'}
+        attempt = 0
+        while True:
+            try:
+                resp, content = request.http.request(resumable_uri, 'PUT', headers=headers)
+            except RETRYABLE_EXCEPTIONS as e:
+                error = e
+            else:
+                if resp.status in (200, 201):
+                    return request.postproc(resp, content)
+                if resp.status == 308:
+                    # Range가 없으면 서버가 아직 아무것도 받지 않은 것
+                    byte_range = resp.get('range')
+                    request.resumable_uri = resp.get('location', resumable_uri)
+                    request.resumable_progress = int(byte_range.split('-')[1]) + 1 if byte_range else 0
+                    return None
+                error = HttpError(resp, content, uri=resumable_uri)
+                if resp.status not in RETRYABLE_STATUS_CODES:
+                    raise error
+
+            attempt += 1
+            if attempt > self.max_retries:
+                raise error
+            delay = self._backoff(attempt)
+            logger.warning(f"업로드 세션 조회 재시도 {attempt}/{self.max_retries} ({delay:.1f}초 후): {str(error)}")
+            self.sleep(delay)
+
+    def _restart(self, request: HttpRequest) -> None:
+        """세션 없이 처음부터 다시 업로드하도록 요청을 되돌립니다 (다음 next_chunk가 새 세션을 엶)."""
+        request.resumable_uri = None
+        request.resumable_progress = 0
+
+    def upload(self, request: HttpRequest, session_key: Optional[str] = None,
+               progress: Optional[ProgressCallback] = None,
+               on_new_session: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+        """업로드를 끝까지 진행하고 API 응답을 반환합니다.
+
+        Args:
+            request: resumable=True인 미디어를 가진 요청
+            session_key: 세션 저장소 키 (None이면 세션을 저장하지 않음)
+            progress: 청크마다 호출할 진행 콜백
+            on_new_session: 새 업로드 세션을 시작하기 직전에 호출할 콜백
+                (저장된 세션이 없을 때와 저장된 세션이 만료되어 처음부터 다시 올릴 때)
+
+        Returns:
+            Dict[str, Any]: 업로드 완료 응답
+
+        Raises:
+            HttpError: 재시도할 수 없는 응답을 받았거나 재시도 횟수를 넘긴 경우
+            Exception: 재시도 횟수를 넘긴 전송 오류
+        """
+        store = self.sessions if session_key else None
+        resumed = False
+        response = None
+        if store:
+            resumable_uri = store.load(session_key)
+            if resumable_uri:
+                logger.info(f"저장된 업로드 세션으로 재개: {session_key[:12]}")
+                try:
+                    response = self._resume(request, resumable_uri)
+                    resumed = True
+                except HttpError as e:
+                    if e.resp.status not in EXPIRED_SESSION_STATUS_CODES:
+                        raise
+                    logger.info("업로드 세션이 만료되어 처음부터 다시 업로드")
+                    store.delete(session_key)
+        if not resumed and on_new_session:
+            on_new_session()
+
+        total = request.resumable.size() or 0
+        saved_uri = request.resumable_uri
+        attempt = 0
+        while response is None:
+            try:
+                status, response = request.next_chunk()
+            except HttpError as e:
+                if resumed and e.resp.status in EXPIRED_SESSION_STATUS_CODES:
+                    # 저장된 세션이 만료된 경우 한 번만 처음부터 다시 시작
+                    logger.info("업로드 세션이 만료되어 처음부터 다시 업로드")
+                    store.delete(session_key)
+                    if on_new_session:
+                        on_new_session()
+                    self._restart(request)
+                    resumed = False
+                    saved_uri = None
+                    continue
+                if e.resp.status not in RETRYABLE_STATUS_CODES:
+                    raise
+                error = e
+            except RETRYABLE_EXCEPTIONS as e:
+                error = e
+            else:
+                attempt = 0
+                resumed = False
+                if store and request.resumable_uri and request.resumable_uri != saved_uri:
+                    store.save(session_key, request.resumable_uri)
+                    saved_uri = request.resumable_uri
+                if progress:
+                    progress(status.resumable_progress if status else total, total)
+                continue
+
+            attempt += 1
+            if attempt > self.max_retries:
+                raise error
+            delay = self._backoff(attempt)
+            logger.warning(f"업로드 재시도 {attempt}/{self.max_retries} ({delay:.1f}초 후): {str(error)}")
+            self.sleep(delay)
+
+        if store:
+            store.delete(session_key)
+        return response
@@ -2,7 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.config import get_settings
-from app.api.routes import router as api_router
+from app.api.routes import router as api_router, shutdown_generate_pipeline
 
 app = FastAPI(
     title="AI Shorts Generator",
@@ -29,11 +29,17 @@ scheduler = BackgroundScheduler()
 async def startup_event():
     settings = get_settings()
     # 여기에 스케줄러 작업 등록
+    # 영상 배경은 처음 렌더링할 때 자산 캐시에 저장되므로 기동 시 미리 렌더링하지 않음
     scheduler.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     scheduler.shutdown()
+    # 영상 생성 파이프라인 워커 정리
+    await shutdown_generate_pipeline()
+    # 실행 중인 ffmpeg 프로세스 정리 (렌더링한 적이 없으면 렌더링 팜을 만들지 않음)
+    from app.core.render_farm import shutdown_render_farm
+    await shutdown_render_farm()
 
 @app.get("/")
 async def root():
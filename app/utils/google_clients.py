@@ -0,0 +1,123 @@
+from app.config import get_settings
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+import json
+import threading
+
+if TYPE_CHECKING:
+    from google.oauth2 import service_account
+    from google_auth_httplib2 import AuthorizedHttp
+
+# google-auth, httplib2, googleapiclient는 가져오는 데 시간이 걸리므로 서비스를 처음 만들 때 가져옴
+
+class SharedAuthorizedHttp:
+    """여러 서비스가 함께 쓰는 인증된 HTTP 전송 계층
+
+    httplib2.Http는 스레드 안전하지 않으므로 스레드마다 AuthorizedHttp를 하나씩 만들어
+    그 스레드의 모든 요청이 같은 연결을 재사용하게 합니다. 자격 증명 객체는 모든 스레드가
+    공유하므로 액세스 토큰은 만료될 때 한 번만 갱신됩니다.
+    """
+
+    def __init__(self, credentials: 'service_account.Credentials'):
+        """SharedAuthorizedHttp 인스턴스를 초기화합니다.
+
+        Args:
+            credentials: 범위가 지정된 서비스 계정 자격 증명
+        """
+        self.credentials = credentials
+        self._local = threading.local()
+
+    def _thread_http(self) -> 'AuthorizedHttp':
+        """현재 스레드의 AuthorizedHttp를 가져옵니다 (없으면 생성)."""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            from google_auth_httplib2 import AuthorizedHttp
+            from googleapiclient.http import build_http
+
+            # build_http는 재개 가능한 업로드의 308 응답을 리다이렉트로 처리하지 않음
+            http = AuthorizedHttp(self.credentials, http=build_http())
+            self._local.http = http
+        return http
+
+    def request(self, *args, **kwargs):
+        """현재 스레드의 연결로 인증된 요청을 보냅니다."""
+        return self._thread_http().request(*args, **kwargs)
+
+def _require_credentials(credentials_json: Optional[str]) -> str:
+    """자격 증명 JSON 문자열을 확인합니다."""
+    credentials_json = credentials_json if credentials_json is not None else get_settings().google_sheets_credentials
+    if not credentials_json:
+        raise ValueError("GOOGLE_SHEETS_CREDENTIALS environment variable is not set")
+    return credentials_json
+
+@lru_cache(maxsize=None)
+def _load_credentials(credentials_json: str) -> 'service_account.Credentials':
+    """서비스 계정 JSON을 한 번만 파싱하여 범위가 없는 기본 자격 증명을 만듭니다."""
+    from google.oauth2 import service_account
+    try:
+        info: Dict[str, Any] = json.loads(credentials_json)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Failed to parse credentials JSON: {str(e)}")
+    return service_account.Credentials.from_service_account_info(info)
+
+@lru_cache(maxsize=None)
+def get_credentials(scopes: Tuple[str, ...], credentials_json: Optional[str] = None) -> 'service_account.Credentials':
+    """범위별로 프로세스 전체에서 공유하는 서비스 계정 자격 증명을 가져옵니다.
+
+    갱신된 액세스 토큰은 이 객체에 저장되므로 같은 범위의 모든 서비스가 재사용합니다.
+
+    Args:
+        scopes: OAuth 범위 목록
+        credentials_json: 서비스 계정 JSON 문자열 (기본값: 설정값 google_sheets_credentials)
+
+    Returns:
+        service_account.Credentials: 자격 증명
+
+    Raises:
+        ValueError: 자격 증명이 없거나 JSON 파싱에 실패한 경우
+    """
+    return _load_credentials(_require_credentials(credentials_json)).with_scopes(list(scopes))
+
+@lru_cache(maxsize=None)
+def get_authorized_http(scopes: Tuple[str, ...], credentials_json: Optional[str] = None) -> SharedAuthorizedHttp:
+    """범위별로 프로세스 전체에서 공유하는 인증된 HTTP 전송 계층을 가져옵니다.
+
+    Args:
+        scopes: OAuth 범위 목록
+        credentials_json: 서비스 계정 JSON 문자열 (기본값: 설정값 google_sheets_credentials)
+
+    Returns:
+        SharedAuthorizedHttp: 인증된 HTTP 전송 계층
+
+    Raises:
+        ValueError: 자격 증명이 없거나 JSON 파싱에 실패한 경우
+    """
+    return SharedAuthorizedHttp(get_credentials(scopes, credentials_json))
+
+@lru_cache(maxsize=None)
+def get_google_service(api: str, version: str, scopes: Tuple[str, ...], credentials_json: Optional[str] = None) -> Any:
+    """API, 버전, 범위별로 프로세스 전체에서 공유하는 Google API 서비스를 가져옵니다.
+
+    googleapiclient에 포함된 정적 디스커버리 문서로 만들므로 디스커버리 문서를 내려받지 않으며,
+    서비스는 처음 요청될 때 한 번만 만들어집니다.
+
+    Args:
+        api: API 이름 (예: 'sheets', 'youtube')
+        version: API 버전 (예: 'v4', 'v3')
+        scopes: OAuth 범위 목록
+        credentials_json: 서비스 계정 JSON 문자열 (기본값: 설정값 google_sheets_credentials)
+
+    Returns:
+        Resource: Google API 서비스
+
+    Raises:
+        ValueError: 자격 증명이 없거나 JSON 파싱에 실패한 경우
+    """
+    from googleapiclient.discovery import build
+    return build(
+        api,
+        version,
+        http=get_authorized_http(scopes, credentials_json),
+        static_discovery=True,
+        cache_discovery=False
+    )
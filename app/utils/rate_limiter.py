@@ -0,0 +1,87 @@
+from typing import Optional
+import asyncio
+import threading
+import time
+
+class TokenBucket:
+    """초당 일정량씩 채워지는 토큰 버킷 속도 제한기
+
+    요청 수(RPM)나 토큰 수(TPM) 같은 분당 한도를 그대로 넣어 사용합니다.
+    스레드와 코루틴에서 함께 사용할 수 있으며, 비동기 대기는 이벤트 루프를 막지 않습니다.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """TokenBucket 인스턴스를 초기화합니다.
+
+        Args:
+            per_minute: 분당 채워지는 양 (0 이하이면 제한 없음)
+            capacity: 버킷 최대 크기 (기본값: per_minute, 즉 1분치 버스트 허용)
+        """
+        self.per_minute = per_minute
+        self.capacity = capacity or per_minute
+        self._rate = per_minute / 60
+        self._available = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def unlimited(self) -> bool:
+        """제한이 없는지 여부"""
+        return self.per_minute <= 0
+
+    def _reserve(self, amount: float) -> float:
+        """토큰을 예약하고, 예약분이 채워질 때까지 기다려야 할 시간(초)을 반환합니다.
+
+        잔량이 부족하면 음수가 되도록 미리 빼 두므로, 먼저 예약한 요청이 먼저 실행됩니다.
+        """
+        if self.unlimited:
+            return 0.0
+        # 버킷보다 큰 요청은 버킷 크기만큼만 기다림
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._available = min(self.capacity, self._available + (now - self._updated_at) * self._rate)
+            self._updated_at = now
+            self._available -= amount
+            if self._available >= 0:
+                return 0.0
+            return -self._available / self._rate
+
+    def acquire(self, amount: float = 1) -> float:
+        """토큰이 채워질 때까지 현재 스레드를 대기시킵니다.
+
+        Args:
+            amount: 사용할 토큰 양
+
+        Returns:
+            float: 대기한 시간(초)
+        """
+        wait = self._reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, amount: float = 1) -> float:
+        """토큰이 채워질 때까지 비동기로 대기합니다.
+
+        Args:
+            amount: 사용할 토큰 양
+
+        Returns:
+            float: 대기한 시간(초)
+        """
+        wait = self._reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def refund(self, amount: float) -> None:
+        """예상보다 적게 사용한 토큰을 돌려줍니다.
+
+        Args:
+            amount: 돌려줄 토큰 양
+        """
+        if self.unlimited or amount <= 0:
+            return
+        with self._lock:
+            self._available = min(self.capacity, self._available + amount)
@@ -0,0 +1,98 @@
+from googleapiclient.errors import HttpError
+from typing import Any, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 values.get 요청으로 읽을 행 수
+DEFAULT_PAGE_SIZE = 500
+
+class SheetRowReader:
+    """시트를 고정 크기 창(window) 단위로 나눠 읽는 스트리밍 행 리더
+
+    values.get 응답은 창 안의 뒤쪽 빈 행을 잘라내므로, 적은 행이 돌아왔다고 해서
+    데이터가 끝난 것은 아닙니다. 창 전체가 비어 있을 때 마지막 데이터 행을 지난 것으로
+    보고 읽기를 멈추며, 전체 행 수는 요청 범위의 상한으로만 사용합니다.
+    """
+
+    def __init__(
+        self,
+        service: Any,
+        spreadsheet_id: str,
+        sheet_name: str,
+        last_column: str = 'G',
+        page_size: int = DEFAULT_PAGE_SIZE,
+        row_count: Optional[int] = None
+    ):
+        """SheetRowReader 인스턴스를 초기화합니다.
+
+        Args:
+            service: Google Sheets API 서비스 객체
+            spreadsheet_id: 스프레드시트 ID
+            sheet_name: 시트 이름
+            last_column: 읽을 마지막 열 문자 (A열부터 읽습니다)
+            page_size: 한 번에 읽을 행 수
+            row_count: 시트의 전체 행 수 (알고 있으면 그리드 밖을 요청하지 않습니다)
+        """
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_name = sheet_name
+        self.last_column = last_column
+        self.page_size = max(1, page_size)
+        self.row_count = row_count
+
+    def _get_page(self, start_row: int, end_row: int) -> Optional[List[List[str]]]:
+        """한 창의 행 데이터를 가져옵니다.
+
+        Args:
+            start_row: 시작 행 번호
+            end_row: 끝 행 번호
+
+        Returns:
+            Optional[List[List[str]]]: 행 데이터 목록 (그리드 범위를 벗어나면 None)
+
+        Raises:
+            HttpError: API 호출에 실패한 경우
+        """
+        try:
+            result = self.service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f'{self.sheet_name}!A{start_row}:{self.last_column}{end_row}'
+            ).execute()
+        except HttpError as e:
+            # 전체 행 수를 모르는 상태에서 그리드 끝을 넘어 요청한 경우
+            if self.row_count is None and start_row > 1 and e.resp.status == 400:
+                logger.info(f"시트 그리드의 끝에 도달: {start_row}행")
+                return None
+            raise
+        return result.get('values', [])
+
+    def iter_rows(self, start_row: int = 1) -> Iterator[Tuple[int, List[str]]]:
+        """행을 창 단위로 읽어 하나씩 반환합니다.
+
+        Args:
+            start_row: 읽기 시작할 행 번호 (1부터 시작)
+
+        Returns:
+            Iterator[Tuple[int, List[str]]]: (행 번호, 행 데이터) 쌍
+
+        Raises:
+            HttpError: API 호출에 실패한 경우
+        """
+        row = start_row
+        while self.row_count is None or row <= self.row_count:
+            end_row = row + self.page_size - 1
+            if self.row_count is not None:
+                end_row = min(end_row, self.row_count)
+
+            values = self._get_page(row, end_row)
+            if values is None:
+                return
+
+            for offset, values_row in enumerate(values):
+                yield row + offset, values_row
+
+            # 창 끝의 빈 행은 잘려서 오므로, 창 전체가 비었을 때만 데이터의 끝으로 봄
+            if not values:
+                return
+            row = end_row + 1
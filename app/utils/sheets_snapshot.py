@@ -0,0 +1,76 @@
+from app.utils.sheets_write_buffer import CellChanges
+from typing import Dict, Iterator, List, Tuple
+import threading
+
+class SheetSnapshot:
+    """한 번의 실행 동안 공유되는 시트 데이터 스냅샷
+
+    시트를 한 번 읽어 메모리에 보관하고, 우리가 기록한 변경이 반영될 때마다
+    제자리에서 갱신하여 이후의 조회가 API를 다시 호출하지 않도록 합니다.
+    """
+
+    def __init__(self, headers: List[str], rows: List[List[str]], first_row: int = 2):
+        """SheetSnapshot 인스턴스를 초기화합니다.
+
+        Args:
+            headers: 헤더 행의 데이터
+            rows: 헤더 아래 데이터 행 목록
+            first_row: 첫 번째 데이터 행의 행 번호 (1부터 시작)
+        """
+        self.headers = list(headers)
+        self._rows: Dict[int, List[str]] = {
+            row_number: list(row)
+            for row_number, row in enumerate(rows, start=first_row)
+        }
+        self._lock = threading.Lock()
+
+    @property
+    def last_row(self) -> int:
+        """데이터가 있는 마지막 행 번호 (데이터가 없으면 1)"""
+        with self._lock:
+            return max(self._rows, default=1)
+
+    def get_row(self, row_number: int) -> List[str]:
+        """행 데이터의 복사본을 가져옵니다.
+
+        Args:
+            row_number: 행 번호 (1부터 시작)
+
+        Returns:
+            List[str]: 행 데이터 (없는 행이면 빈 목록)
+        """
+        with self._lock:
+            return list(self._rows.get(row_number, []))
+
+    def iter_rows(self) -> Iterator[Tuple[int, List[str]]]:
+        """행 번호 순으로 데이터 행을 순회합니다.
+
+        Returns:
+            Iterator[Tuple[int, List[str]]]: (행 번호, 행 데이터) 쌍
+        """
+        with self._lock:
+            rows = sorted((row_number, list(row)) for row_number, row in self._rows.items())
+        return iter(rows)
+
+    def set_row(self, row_number: int, values: List[str]) -> None:
+        """행 전체를 교체합니다.
+
+        Args:
+            row_number: 행 번호 (1부터 시작)
+            values: 행 데이터
+        """
+        with self._lock:
+            self._rows[row_number] = list(values)
+
+    def apply(self, changes: CellChanges) -> None:
+        """기록된 셀 변경을 스냅샷에 반영합니다.
+
+        Args:
+            changes: (행 번호, 열 인덱스)와 값의 매핑
+        """
+        with self._lock:
+            for (row_number, column), value in changes.items():
+                row = self._rows.setdefault(row_number, [])
+                if len(row) <= column:
+                    row.extend([''] * (column + 1 - len(row)))
+                row[column] = value
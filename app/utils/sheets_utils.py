@@ -1,15 +1,21 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-import json
+from app.config import get_settings
+from app.utils.google_clients import get_google_service
+from app.utils.sheets_write_buffer import SheetsWriteBuffer, CellChanges
+from app.utils.sheets_snapshot import SheetSnapshot
+from app.utils.sheets_reader import SheetRowReader
+from contextlib import contextmanager
 import os
-from typing import List, Dict, Any, Optional, Tuple
+import re
+import threading
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass
 
 # 상수 정의
-SHEET_RANGE = 'A1:G100'
+SHEET_LAST_COLUMN = 'G'
 REQUIRED_COLUMNS = ['Topic', 'Data', 'Script', 'Voice', 'Video', 'Video Link', 'Status']
 SHEETS_SCOPE = 'https://www.googleapis.com/auth/spreadsheets'
+SHEET_METADATA_FIELDS = 'sheets.properties(title,gridProperties.rowCount)'
 
 @dataclass
 class TopicData:
@@ -29,33 +35,46 @@ class SheetsUtils:
     
     def __init__(self):
         """SheetsUtils 인스턴스를 초기화합니다."""
+        settings = get_settings()
         self.service = self._initialize_service()
         self.spreadsheet_id = self._get_spreadsheet_id()
-        self.sheet_name = self.get_sheet_name()
+        sheet_properties = self._get_sheet_properties()
+        self.sheet_name = sheet_properties['title']
+        self.row_count = sheet_properties.get('gridProperties', {}).get('rowCount')
+        self.row_reader = SheetRowReader(
+            self.service,
+            self.spreadsheet_id,
+            self.sheet_name,
+            last_column=SHEET_LAST_COLUMN,
+            page_size=settings.sheets_page_size,
+            row_count=self.row_count
+        )
+        self.flush_interval = settings.sheets_flush_interval
+        self.write_buffer = SheetsWriteBuffer(
+            self.service,
+            self.spreadsheet_id,
+            self.sheet_name,
+            max_ranges=settings.sheets_batch_max_ranges,
+            on_flush=self._apply_to_snapshot
+        )
+        self._batch_depth = 0
+        self._batch_lock = threading.Lock()
+        self._snapshot: Optional[SheetSnapshot] = None
+        self._snapshot_lock = threading.Lock()
 
     def _initialize_service(self) -> Any:
-        """Google Sheets API 서비스를 초기화합니다.
+        """프로세스 전체에서 공유하는 Google Sheets API 서비스를 가져옵니다.
 
         Returns:
             Any: Google Sheets API 서비스 객체
 
         Raises:
-            ValueError: 환경 변수가 설정되지 않은 경우
-            json.JSONDecodeError: JSON 파싱에 실패한 경우
+            ValueError: 환경 변수가 설정되지 않았거나 JSON 파싱에 실패한 경우
         """
         credentials_json = os.getenv('GOOGLE_SHEETS_CREDENTIALS')
         if not credentials_json:
             raise ValueError("GOOGLE_SHEETS_CREDENTIALS environment variable is not set")
-        
-        try:
-            credentials_info = json.loads(credentials_json)
-            credentials = service_account.Credentials.from_service_account_info(
-                credentials_info,
-                scopes=[SHEETS_SCOPE]
-            )
-            return build('sheets', 'v4', credentials=credentials)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse credentials JSON: {str(e)}")
+        return get_google_service('sheets', 'v4', (SHEETS_SCOPE,), credentials_json)
 
     def _get_spreadsheet_id(self) -> str:
         """스프레드시트 ID를 가져옵니다.
@@ -71,26 +90,152 @@ class SheetsUtils:
             raise ValueError("SPREADSHEET_ID environment variable is not set")
         return spreadsheet_id
 
-    def get_sheet_name(self) -> str:
-        """스프레드시트의 첫 번째 시트 이름을 가져옵니다.
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """셀 변경을 모았다가 블록 종료 시 한 번에 기록하는 작업 단위를 엽니다.
+
+        블록 안에서의 update_row, update_voice_status, reset_voice_status 호출은
+        즉시 기록되지 않고 쓰기 버퍼에 쌓이며, flush_interval마다 자동으로 기록되고
+        가장 바깥 블록이 끝날 때 남은 변경이 모두 기록됩니다.
+
+        Raises:
+            ValueError: 블록 종료 시 기록에 실패한 경우
+        """
+        with self._batch_lock:
+            self._batch_depth += 1
+            if self._batch_depth == 1:
+                self.write_buffer.start_timer(self.flush_interval)
+        try:
+            yield
+        finally:
+            with self._batch_lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                self.write_buffer.stop_timer()
+                self.flush()
+
+    def flush(self) -> int:
+        """쓰기 버퍼에 쌓인 셀 변경을 기록합니다.
 
         Returns:
-            str: 시트 이름
+            int: 기록된 셀 수
+
+        Raises:
+            ValueError: API 호출에 실패한 경우
+        """
+        return self.write_buffer.flush()
+
+    def _write_cells(self, topic_data: TopicData, values: Dict[str, str]) -> None:
+        """주제 행의 셀 변경을 쓰기 버퍼에 추가합니다.
+
+        작업 단위(batch) 밖에서 호출되면 즉시 기록합니다.
+
+        Args:
+            topic_data: 업데이트할 주제 데이터
+            values: 열 이름과 값의 매핑
+        """
+        self.write_buffer.set_cells(
+            topic_data.row,
+            {topic_data.column_indices[col]: value for col, value in values.items()}
+        )
+        with self._batch_lock:
+            batching = self._batch_depth > 0
+        if not batching:
+            self.flush()
+
+    def _get_sheet_properties(self) -> Dict[str, Any]:
+        """스프레드시트의 첫 번째 시트 속성(이름, 그리드 행 수)을 가져옵니다.
+
+        Returns:
+            Dict[str, Any]: 시트 속성
 
         Raises:
-            HttpError: API 호출에 실패한 경우
+            ValueError: API 호출에 실패했거나 시트가 없는 경우
         """
         try:
             sheet_metadata = self.service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
+                spreadsheetId=self.spreadsheet_id,
+                fields=SHEET_METADATA_FIELDS
             ).execute()
             sheets = sheet_metadata.get('sheets', [])
             if not sheets:
                 raise ValueError("No sheets found in the spreadsheet")
-            return sheets[0]['properties']['title']
+            return sheets[0]['properties']
         except HttpError as e:
             raise ValueError(f"Failed to get sheet name: {str(e)}")
 
+    def get_sheet_name(self) -> str:
+        """스프레드시트의 첫 번째 시트 이름을 가져옵니다.
+
+        Returns:
+            str: 시트 이름
+
+        Raises:
+            ValueError: API 호출에 실패한 경우
+        """
+        return self._get_sheet_properties()['title']
+
+    @property
+    def snapshot(self) -> SheetSnapshot:
+        """이번 실행에서 공유하는 시트 스냅샷 (처음 접근할 때 한 번만 읽습니다)
+
+        Raises:
+            ValueError: API 호출에 실패한 경우
+        """
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                self._snapshot = self._load_snapshot()
+            return self._snapshot
+
+    def refresh_snapshot(self) -> SheetSnapshot:
+        """외부에서 시트가 변경된 경우 스냅샷을 다시 읽습니다.
+
+        Returns:
+            SheetSnapshot: 새로 읽은 스냅샷
+
+        Raises:
+            ValueError: API 호출에 실패한 경우
+        """
+        with self._snapshot_lock:
+            self._snapshot = self._load_snapshot()
+            return self._snapshot
+
+    def _load_snapshot(self) -> SheetSnapshot:
+        """시트 전체를 페이지 단위로 읽어 스냅샷을 만듭니다.
+
+        Returns:
+            SheetSnapshot: 시트 스냅샷
+
+        Raises:
+            ValueError: API 호출에 실패한 경우
+        """
+        headers: List[str] = []
+        rows: List[List[str]] = []
+        try:
+            for row_idx, row in self.row_reader.iter_rows():
+                if row_idx == 1:
+                    headers = row
+                else:
+                    rows.append(row)
+        except HttpError as e:
+            raise ValueError(f"Failed to load sheet snapshot: {str(e)}")
+
+        if not headers:
+            return SheetSnapshot([], [])
+
+        print("Available headers:", headers)
+        return SheetSnapshot(headers, rows)
+
+    def _apply_to_snapshot(self, changes: CellChanges) -> None:
+        """기록에 성공한 셀 변경을 스냅샷에 반영합니다.
+
+        Args:
+            changes: 기록된 셀 변경
+        """
+        if self._snapshot is not None:
+            self._snapshot.apply(changes)
+
     def _get_column_indices(self, headers: List[str]) -> Dict[str, int]:
         """필요한 열의 인덱스를 가져옵니다.
 
@@ -123,63 +268,95 @@ class SheetsUtils:
             for col, idx in indices.items()
         }
 
+    def _to_topic_data(self, row_idx: int, row_data: Dict[str, str], column_indices: Dict[str, int]) -> TopicData:
+        """행 데이터를 TopicData로 변환합니다.
+
+        Args:
+            row_idx: 행 번호
+            row_data: 열 이름과 값의 매핑
+            column_indices: 열 인덱스 매핑
+
+        Returns:
+            TopicData: 주제 데이터
+        """
+        return TopicData(
+            row=row_idx,
+            topic=row_data['Topic'],
+            script=row_data['Script'],
+            voice=row_data['Voice'],
+            video=row_data['Video'],
+            video_link=row_data['Video Link'],
+            data_status=row_data['Data'],
+            status=row_data['Status'],
+            column_indices=column_indices
+        )
+
+    def _is_pending(self, topic_data: TopicData) -> bool:
+        """주제가 스크립트 또는 음성 생성을 기다리는지 확인합니다.
+
+        Args:
+            topic_data: 주제 데이터
+
+        Returns:
+            bool: 처리 대기 여부
+        """
+        # 스크립트 생성이 필요한 경우
+        if (not topic_data.data_status or topic_data.data_status == '❌') or \
+           (topic_data.data_status == '✅' and not topic_data.script):
+            return True
+        # 음성 생성이 필요한 경우
+        return bool(topic_data.script and topic_data.data_status == '✅' and not topic_data.voice)
+
+    def iter_topics(self, pending_only: bool = False) -> Iterator[TopicData]:
+        """시트의 주제를 하나씩 반환하는 제너레이터입니다.
+
+        스냅샷이 이미 로드되어 있으면 스냅샷에서, 아니면 시트를 페이지 단위로
+        스트리밍하며 읽으므로 전체 행을 메모리에 올리지 않습니다.
+
+        Args:
+            pending_only: 처리 대기 중인 주제만 반환할지 여부
+
+        Returns:
+            Iterator[TopicData]: 주제 데이터
+
+        Raises:
+            ValueError: API 호출 또는 필수 열 확인에 실패한 경우
+        """
+        if self._snapshot is not None:
+            headers = self._snapshot.headers
+            rows = self._snapshot.iter_rows()
+        else:
+            rows = self.row_reader.iter_rows()
+            try:
+                _, headers = next(rows, (1, []))
+            except HttpError as e:
+                raise ValueError(f"Failed to read topics: {str(e)}")
+        if not headers:
+            return
+
+        column_indices = self._get_column_indices(headers)
+        try:
+            for row_idx, row in rows:
+                topic_data = self._to_topic_data(row_idx, self._get_row_data(row, column_indices), column_indices)
+                if not pending_only or self._is_pending(topic_data):
+                    yield topic_data
+        except HttpError as e:
+            raise ValueError(f"Failed to read topics: {str(e)}")
+
     def get_pending_topics(self) -> List[TopicData]:
         """처리가 필요한 주제 목록을 가져옵니다.
 
+        시트 스냅샷에서 조회하므로 한 실행 안에서 반복 호출해도 시트를 다시 읽지 않습니다.
+
         Returns:
             List[TopicData]: 처리 대기 중인 주제 목록
+
+        Raises:
+            ValueError: 스냅샷 로드 또는 필수 열 확인에 실패한 경우
         """
-        try:
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!{SHEET_RANGE}'
-            ).execute()
-            
-            values = result.get('values', [])
-            if not values:
-                return []
-            
-            headers = values[0]
-            print("Available headers:", headers)
-            
-            column_indices = self._get_column_indices(headers)
-            pending_topics = []
-            
-            for row_idx, row in enumerate(values[1:], start=2):
-                row_data = self._get_row_data(row, column_indices)
-                
-                # 스크립트 생성이 필요한 경우
-                if (not row_data['Data'] or row_data['Data'] == '❌') or \
-                   (row_data['Data'] == '✅' and not row_data['Script']):
-                    pending_topics.append(TopicData(
-                        row=row_idx,
-                        topic=row_data['Topic'],
-                        script=row_data['Script'],
-                        voice=row_data['Voice'],
-                        video=row_data['Video'],
-                        video_link=row_data['Video Link'],
-                        data_status=row_data['Data'],
-                        status=row_data['Status'],
-                        column_indices=column_indices
-                    ))
-                # 음성 생성이 필요한 경우
-                elif row_data['Script'] and row_data['Data'] == '✅' and not row_data['Voice']:
-                    pending_topics.append(TopicData(
-                        row=row_idx,
-                        topic=row_data['Topic'],
-                        script=row_data['Script'],
-                        voice=row_data['Voice'],
-                        video=row_data['Video'],
-                        video_link=row_data['Video Link'],
-                        data_status=row_data['Data'],
-                        status=row_data['Status'],
-                        column_indices=column_indices
-                    ))
-            
-            return pending_topics
-            
-        except HttpError as e:
-            raise ValueError(f"Failed to get pending topics: {str(e)}")
+        # 스냅샷을 먼저 로드하여 이후 조회가 모두 스냅샷을 사용하도록 함
+        self.snapshot
+        return list(self.iter_topics(pending_only=True))
 
     def update_row(self, topic_data: TopicData, script: str) -> None:
         """행을 업데이트합니다.
@@ -189,33 +366,13 @@ class SheetsUtils:
             script: 새로 생성된 스크립트
 
         Raises:
-            HttpError: API 호출에 실패한 경우
+            ValueError: API 호출에 실패한 경우
         """
-        try:
-            # 현재 행 데이터 가져오기
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!A{topic_data.row}:G{topic_data.row}'
-            ).execute()
-            
-            values = result.get('values', [[]])[0]
-            current_row = values + [''] * (7 - len(values))  # A부터 G열까지
-            
-            # 데이터 업데이트
-            current_row[topic_data.column_indices['Script']] = script
-            current_row[topic_data.column_indices['Data']] = '✅'
-            current_row[topic_data.column_indices['Status']] = "Script generated"
-            
-            # 스프레드시트 업데이트
-            self.service.spreadsheets().values().update(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!A{topic_data.row}:G{topic_data.row}',
-                valueInputOption='RAW',
-                body={'values': [current_row]}
-            ).execute()
-            
-        except HttpError as e:
-            raise ValueError(f"Failed to update row: {str(e)}")
+        self._write_cells(topic_data, {
+            'Script': script,
+            'Data': '✅',
+            'Status': "Script generated"
+        })
 
     def append_row(self, topic: str) -> None:
         """새로운 행을 추가합니다.
@@ -224,35 +381,36 @@ class SheetsUtils:
             topic: 추가할 주제
 
         Raises:
-            HttpError: API 호출에 실패한 경우
+            ValueError: API 호출에 실패한 경우
         """
+        # 헤더 정보는 스냅샷에서 가져오기
+        snapshot = self.snapshot
+        headers = snapshot.headers
+        column_indices = self._get_column_indices(headers)
+
+        # 새로운 행 생성
+        new_row = [''] * len(headers)
+        new_row[column_indices['Topic']] = topic
+        new_row[column_indices['Data']] = '✅'
+
         try:
-            # 헤더 정보 가져오기
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!A1:G1'
-            ).execute()
-            
-            headers = result.get('values', [[]])[0]
-            column_indices = self._get_column_indices(headers)
-            
-            # 새로운 행 생성
-            new_row = [''] * len(headers)
-            new_row[column_indices['Topic']] = topic
-            new_row[column_indices['Data']] = '✅'
-            
             # 행 추가
-            self.service.spreadsheets().values().append(
+            result = self.service.spreadsheets().values().append(
                 spreadsheetId=self.spreadsheet_id,
                 range=f'{self.sheet_name}!A:G',
                 valueInputOption='RAW',
                 insertDataOption='INSERT_ROWS',
                 body={'values': [new_row]}
             ).execute()
-            
         except HttpError as e:
             raise ValueError(f"Failed to append row: {str(e)}")
 
+        # 추가된 행 번호를 응답에서 찾아 스냅샷에 반영 (예: "Sheet1!A12:G12")
+        updated_range = result.get('updates', {}).get('updatedRange', '')
+        match = re.search(r'![A-Z]+(\d+)', updated_range)
+        row_number = int(match.group(1)) if match else snapshot.last_row + 1
+        snapshot.set_row(row_number, new_row)
+
     def update_voice_status(self, topic_data: TopicData, voice_status: str, status_message: str) -> None:
         """음성 생성 상태를 업데이트합니다.
 
@@ -262,32 +420,12 @@ class SheetsUtils:
             status_message: 상태 메시지
 
         Raises:
-            HttpError: API 호출에 실패한 경우
+            ValueError: API 호출에 실패한 경우
         """
-        try:
-            # 현재 행 데이터 가져오기
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!A{topic_data.row}:G{topic_data.row}'
-            ).execute()
-            
-            values = result.get('values', [[]])[0]
-            current_row = values + [''] * (7 - len(values))  # A부터 G열까지
-            
-            # 데이터 업데이트
-            current_row[topic_data.column_indices['Voice']] = voice_status
-            current_row[topic_data.column_indices['Status']] = status_message
-            
-            # 스프레드시트 업데이트
-            self.service.spreadsheets().values().update(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!A{topic_data.row}:G{topic_data.row}',
-                valueInputOption='RAW',
-                body={'values': [current_row]}
-            ).execute()
-            
-        except HttpError as e:
-            raise ValueError(f"Failed to update voice status: {str(e)}")
+        self._write_cells(topic_data, {
+            'Voice': voice_status,
+            'Status': status_message
+        })
 
     def reset_voice_status(self, topic_data: TopicData) -> None:
         """음성 생성 상태를 초기화합니다.
@@ -296,29 +434,9 @@ class SheetsUtils:
             topic_data: 초기화할 주제 데이터
 
         Raises:
-            HttpError: API 호출에 실패한 경우
+            ValueError: API 호출에 실패한 경우
         """
-        try:
-            # 현재 행 데이터 가져오기
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!A{topic_data.row}:G{topic_data.row}'
-            ).execute()
-            
-            values = result.get('values', [[]])[0]
-            current_row = values + [''] * (7 - len(values))  # A부터 G열까지
-            
-            # 데이터 업데이트
-            current_row[topic_data.column_indices['Voice']] = ''
-            current_row[topic_data.column_indices['Status']] = "Voice generation pending"
-            
-            # 스프레드시트 업데이트
-            self.service.spreadsheets().values().update(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!A{topic_data.row}:G{topic_data.row}',
-                valueInputOption='RAW',
-                body={'values': [current_row]}
-            ).execute()
-            
-        except HttpError as e:
-            raise ValueError(f"Failed to reset voice status: {str(e)}") 
\ No newline at end of file
+        self._write_cells(topic_data, {
+            'Voice': '',
+            'Status': "Voice generation pending"
+        })
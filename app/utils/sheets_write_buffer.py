@@ -0,0 +1,216 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 batchUpdate 요청에 포함할 최대 범위(range) 수
+DEFAULT_MAX_RANGES = 500
+
+# (행 번호, 열 인덱스) -> 값
+CellChanges = Dict[Tuple[int, int], str]
+
+def column_letter(index: int) -> str:
+    """0부터 시작하는 열 인덱스를 A1 표기법의 열 문자로 변환합니다.
+
+    Args:
+        index: 열 인덱스 (0 = A)
+
+    Returns:
+        str: 열 문자 (예: 0 -> "A", 27 -> "AB")
+    """
+    letters = ''
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+class SheetsFlushError(ValueError):
+    """버퍼의 셀 변경을 스프레드시트에 기록하지 못한 경우 (기록되지 않은 행 번호 포함)"""
+
+    def __init__(self, message: str, rows: List[int]):
+        super().__init__(message)
+        self.rows = rows
+
+class SheetsWriteBuffer:
+    """변경된 셀을 메모리에 모았다가 values.batchUpdate로 한 번에 기록하는 쓰기 버퍼
+
+    셀은 (행 번호, 열 인덱스)로 식별되며, 같은 셀에 대한 여러 번의 변경은
+    마지막 값만 기록됩니다. 같은 행에서 연속된 열은 하나의 범위로 합쳐집니다.
+    """
+
+    def __init__(
+        self,
+        service: Any,
+        spreadsheet_id: str,
+        sheet_name: str,
+        max_ranges: int = DEFAULT_MAX_RANGES,
+        on_flush: Optional[Callable[[CellChanges], None]] = None
+    ):
+        """SheetsWriteBuffer 인스턴스를 초기화합니다.
+
+        Args:
+            service: Google Sheets API 서비스 객체
+            spreadsheet_id: 스프레드시트 ID
+            sheet_name: 시트 이름
+            max_ranges: 요청 하나에 포함할 최대 범위 수
+            on_flush: 기록에 성공한 셀 변경을 전달받을 콜백
+        """
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_name = sheet_name
+        self.max_ranges = max(1, max_ranges)
+        self.on_flush = on_flush
+        self._pending: CellChanges = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Thread] = None
+        self._stop_timer = threading.Event()
+
+    @property
+    def pending_count(self) -> int:
+        """기록 대기 중인 셀 수"""
+        with self._lock:
+            return len(self._pending)
+
+    def set_cell(self, row: int, column: int, value: str) -> None:
+        """셀 변경을 버퍼에 추가합니다.
+
+        Args:
+            row: 행 번호 (1부터 시작)
+            column: 열 인덱스 (0부터 시작)
+            value: 기록할 값
+        """
+        with self._lock:
+            self._pending[(row, column)] = value
+
+    def set_cells(self, row: int, values: Dict[int, str]) -> None:
+        """한 행의 여러 셀 변경을 버퍼에 추가합니다.
+
+        Args:
+            row: 행 번호 (1부터 시작)
+            values: 열 인덱스와 값의 매핑
+        """
+        with self._lock:
+            for column, value in values.items():
+                self._pending[(row, column)] = value
+
+    def _build_ranges(self, changes: CellChanges) -> List[Tuple[Dict[str, Any], CellChanges]]:
+        """셀 변경을 batchUpdate 요청의 범위 목록으로 변환합니다.
+
+        Args:
+            changes: 셀 변경 내역
+
+        Returns:
+            List[Tuple[Dict[str, Any], CellChanges]]: ValueRange와 그 범위에 포함된 셀 변경 목록
+        """
+        ranges = []
+        run: List[Tuple[int, int, str]] = []
+
+        def close_run() -> None:
+            row, first_column, _ = run[0]
+            last_column = run[-1][1]
+            cell_range = f'{column_letter(first_column)}{row}'
+            if last_column != first_column:
+                cell_range += f':{column_letter(last_column)}{row}'
+            value_range = {
+                'range': f'{self.sheet_name}!{cell_range}',
+                'values': [[value for _, _, value in run]]
+            }
+            ranges.append((value_range, {(r, c): value for r, c, value in run}))
+
+        for (row, column), value in sorted(changes.items()):
+            if run and (run[-1][0] != row or run[-1][1] + 1 != column):
+                close_run()
+                run = []
+            run.append((row, column, value))
+        if run:
+            close_run()
+
+        return ranges
+
+    def flush(self) -> int:
+        """대기 중인 셀 변경을 스프레드시트에 기록합니다.
+
+        범위 수가 max_ranges를 넘으면 여러 번의 batchUpdate 요청으로 나눠 기록합니다.
+
+        Returns:
+            int: 기록된 셀 수
+
+        Raises:
+            SheetsFlushError: API 호출 또는 전송에 실패한 경우 (기록되지 않은 변경은 버퍼에 남습니다)
+        """
+        with self._flush_lock:
+            with self._lock:
+                changes, self._pending = self._pending, {}
+            if not changes:
+                return 0
+
+            ranges = self._build_ranges(changes)
+            written: CellChanges = {}
+            requests = 0
+            try:
+                for start in range(0, len(ranges), self.max_ranges):
+                    chunk = ranges[start:start + self.max_ranges]
+                    self.service.spreadsheets().values().batchUpdate(
+                        spreadsheetId=self.spreadsheet_id,
+                        body={
+                            'valueInputOption': 'RAW',
+                            'data': [value_range for value_range, _ in chunk]
+                        }
+                    ).execute()
+                    requests += 1
+                    for _, cells in chunk:
+                        written.update(cells)
+            except Exception as e:
+                # HTTP 오류뿐 아니라 연결 끊김, 시간 초과 같은 전송 오류에서도
+                # 기록하지 못한 변경을 되돌리되, 그 사이에 들어온 새 값은 유지
+                unwritten = [cell for cell in changes if cell not in written]
+                with self._lock:
+                    for cell in unwritten:
+                        self._pending.setdefault(cell, changes[cell])
+                raise SheetsFlushError(
+                    f"Failed to flush sheet updates: {str(e)}",
+                    sorted({row for row, _ in unwritten})
+                ) from e
+            finally:
+                if written and self.on_flush:
+                    self.on_flush(written)
+
+            logger.info(f"스프레드시트 일괄 업데이트 완료 - 셀 {len(written)}개, 요청 {requests}회")
+            return len(written)
+
+    def start_timer(self, interval: float) -> None:
+        """일정 간격으로 버퍼를 자동 기록하는 백그라운드 스레드를 시작합니다.
+
+        Args:
+            interval: 자동 기록 간격(초)
+        """
+        if interval <= 0 or (self._timer and self._timer.is_alive()):
+            return
+        self._stop_timer.clear()
+        self._timer = threading.Thread(
+            target=self._run_timer,
+            args=(interval,),
+            name="sheets-flush",
+            daemon=True
+        )
+        self._timer.start()
+
+    def stop_timer(self) -> None:
+        """자동 기록 스레드를 중지합니다."""
+        self._stop_timer.set()
+        if self._timer:
+            self._timer.join()
+            self._timer = None
+
+    def _run_timer(self, interval: float) -> None:
+        """자동 기록 스레드의 실행 루프"""
+        while not self._stop_timer.wait(interval):
+            if not self.pending_count:
+                continue
+            try:
+                self.flush()
+            except ValueError as e:
+                logger.error(f"스프레드시트 자동 업데이트 실패: {str(e)}")
@@ -0,0 +1,84 @@
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+import threading
+
+class SingleFlight:
+    """같은 키에 대한 동시 호출을 하나의 실행으로 합치는 도우미 (스레드용)
+
+    처음 호출한 스레드만 함수를 실행하고, 실행 중에 같은 키로 들어온 호출은
+    그 결과(또는 예외)를 함께 받습니다. 실행이 끝나면 키는 다시 비워집니다.
+    """
+
+    def __init__(self):
+        """SingleFlight 인스턴스를 초기화합니다."""
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """키별로 한 번만 함수를 실행하고 결과를 반환합니다.
+
+        Args:
+            key: 호출을 합칠 기준 키
+            func: 실행할 함수
+
+        Returns:
+            Any: 함수 결과
+
+        Raises:
+            Exception: 함수가 발생시킨 예외
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(func())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return future.result()
+
+class AsyncSingleFlight:
+    """같은 키에 대한 동시 코루틴 호출을 하나의 실행으로 합치는 도우미 (asyncio용)"""
+
+    def __init__(self):
+        """AsyncSingleFlight 인스턴스를 초기화합니다."""
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """키별로 한 번만 코루틴을 실행하고 결과를 반환합니다.
+
+        기다리던 호출자 하나가 취소되어도 공유 실행은 취소되지 않습니다.
+
+        Args:
+            key: 호출을 합칠 기준 키
+            func: 코루틴을 만드는 함수
+
+        Returns:
+            Any: 코루틴 결과
+
+        Raises:
+            Exception: 코루틴이 발생시킨 예외
+        """
+        task = self._calls.get(key)
+        # 다른 이벤트 루프의 작업은 기다릴 수 없으므로 새로 실행
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._calls.pop(key, None) if self._calls.get(key) is done else None)
+        return await asyncio.shield(task)
@@ -0,0 +1,30 @@
+from typing import List
+import re
+
+# 문장 끝 문장 부호 뒤의 공백, 또는 줄바꿈에서 문장을 나눔 (소수점처럼 공백이 없는 마침표는 나누지 않음)
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…。！？])\s+|\s*\n\s*')
+
+# 발화 길이 추정에 쓰는 글자 (한글, 영문, 숫자 등 문장 부호와 공백을 제외한 글자)
+SPOKEN_CHARACTER = re.compile(r'\w')
+
+def split_sentences(text: str) -> List[str]:
+    """스크립트를 문장 단위로 나눕니다.
+
+    Args:
+        text: 스크립트 (섹션 태그를 제거한 내레이션)
+
+    Returns:
+        List[str]: 앞뒤 공백을 제거한 문장 목록 (빈 문장 제외)
+    """
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+def spoken_length(text: str) -> int:
+    """문장을 읽는 데 걸리는 시간에 비례하는 글자 수를 셉니다.
+
+    Args:
+        text: 문장
+
+    Returns:
+        int: 문장 부호와 공백을 제외한 글자 수 (최소 1)
+    """
+    return max(1, len(SPOKEN_CHARACTER.findall(text)))
@@ -0,0 +1,66 @@
+"""MP3 재생 시간 조회 벤치마크
+
+app/core/audio_metadata.py의 프로세스 내 MP3 헤더 해석과 ffprobe 서브프로세스(ffmpeg.probe)를
+60초 음성 길이의 MP3(Xing/Info 헤더 있음, 없음)로 비교합니다.
+ffprobe가 없으면 같은 프로세스 생성 비용을 갖는 `ffmpeg -i` 실행으로 대신 측정합니다.
+
+실행 방법 (저장소 루트에서, 테스트 파일 생성에 ffmpeg가 필요합니다):
+    python -m benchmarks.bench_audio_duration
+    FFMPEG_BINARY=/path/to/ffmpeg FFPROBE_BINARY=/path/to/ffprobe python -m benchmarks.bench_audio_duration
+"""
+from app.core.audio_metadata import mp3_duration_us
+from typing import Callable, Tuple
+import ffmpeg
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import timeit
+
+DURATION = 60.0
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+FFPROBE_BINARY = os.getenv('FFPROBE_BINARY', 'ffprobe')
+REPEAT = 20
+
+def make_mp3(path: str, write_xing: bool) -> None:
+    """ElevenLabs 기본 출력과 같은 44.1kHz 128kbps MP3를 만듭니다."""
+    (
+        ffmpeg
+        .input(f'sine=frequency=220:duration={DURATION}', f='lavfi')
+        .output(path, audio_bitrate='128k', ar=44100, write_xing=int(write_xing))
+        .overwrite_output()
+        .run(cmd=FFMPEG_BINARY, quiet=True)
+    )
+
+def subprocess_probe() -> Tuple[str, Callable[[str], int]]:
+    """비교할 서브프로세스 조회 함수 (ffprobe가 없으면 ffmpeg -i)"""
+    if shutil.which(FFPROBE_BINARY):
+        return 'ffprobe', lambda path: round(float(ffmpeg.probe(path, cmd=FFPROBE_BINARY)['format']['duration']) * 1_000_000)
+
+    def ffmpeg_info(path: str) -> int:
+        stderr = subprocess.run([FFMPEG_BINARY, '-hide_banner', '-i', path], capture_output=True, text=True).stderr
+        hours, minutes, seconds = re.search(r'Duration: (\d+):(\d+):([\d.]+)', stderr).groups()
+        return round((int(hours) * 3600 + int(minutes) * 60 + float(seconds)) * 1_000_000)
+    return 'ffmpeg -i', ffmpeg_info
+
+def best_of(func: Callable[[], object]) -> float:
+    """가장 빠른 1회 실행 시간(ms)을 반환합니다."""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT)) * 1000
+
+def main() -> None:
+    probe_name, probe = subprocess_probe()
+    with tempfile.TemporaryDirectory() as work_dir:
+        for label, write_xing in (('Xing/Info', True), ('frame scan', False)):
+            path = os.path.join(work_dir, f'voice_{int(write_xing)}.mp3')
+            make_mp3(path, write_xing)
+
+            reader_ms = best_of(lambda: mp3_duration_us(path))
+            probe_ms = best_of(lambda: probe(path))
+            print(
+                f"[{label:10s}] mp3 reader {reader_ms:7.3f} ms ({mp3_duration_us(path)} us) | "
+                f"{probe_name} {probe_ms:7.2f} ms ({probe(path)} us) | {probe_ms / reader_ms:.0f}x"
+            )
+
+if __name__ == '__main__':
+    main()
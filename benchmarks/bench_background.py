@@ -0,0 +1,47 @@
+"""그라데이션 배경 렌더링 마이크로 벤치마크
+
+기존 행 단위 Python 루프(draw.line)와 NumPy 엔진의 세로 그라데이션을 비교하고,
+기존 구현이 없는 대각선·원형 그라데이션은 절대 시간만 기록합니다.
+
+실행 방법 (저장소 루트에서):
+    python -m benchmarks.bench_background
+"""
+from PIL import Image, ImageDraw
+from app.core.backgrounds import GRADIENT_STYLES, render_gradient
+import timeit
+
+RESOLUTIONS = {
+    '1080x1920': (1080, 1920),
+    '4K (2160x3840)': (2160, 3840),
+}
+COLORS = [(32, 64, 160), (240, 120, 40)]
+MULTI_STOP_COLORS = [(32, 64, 160), (240, 120, 40), (20, 200, 120), (250, 250, 250)]
+
+def legacy_background(width: int, height: int) -> Image.Image:
+    """변경 전 VideoGenerator._create_background의 행 단위 루프 구현"""
+    image = Image.new('RGB', (width, height))
+    draw = ImageDraw.Draw(image)
+    color1, color2 = COLORS
+    for y in range(height):
+        r = int(color1[0] * (1 - y/height) + color2[0] * (y/height))
+        g = int(color1[1] * (1 - y/height) + color2[1] * (y/height))
+        b = int(color1[2] * (1 - y/height) + color2[2] * (y/height))
+        draw.line([(0, y), (width, y)], fill=(r, g, b))
+    return image
+
+def best_of(func, repeat: int = 5) -> float:
+    """가장 빠른 1회 실행 시간(ms)을 반환합니다."""
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+def main() -> None:
+    for label, (width, height) in RESOLUTIONS.items():
+        legacy_ms = best_of(lambda: legacy_background(width, height))
+        print(f"[{label}] legacy loop: {legacy_ms:8.2f} ms")
+        for style in GRADIENT_STYLES:
+            for name, colors in (('2-stop', COLORS), ('4-stop', MULTI_STOP_COLORS)):
+                numpy_ms = best_of(lambda: render_gradient(width, height, colors, style))
+                speedup = f" ({legacy_ms / numpy_ms:.1f}x)" if style == 'vertical' else ""
+                print(f"[{label}] numpy {style:8s} {name}: {numpy_ms:8.2f} ms{speedup}")
+
+if __name__ == '__main__':
+    main()
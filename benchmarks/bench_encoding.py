@@ -0,0 +1,82 @@
+"""인코딩 프로필별 ffmpeg 인코딩 시간과 출력 크기 벤치마크
+
+변경 전 그래프(fps/scale 필터, preset medium, 2500k 고정 비트레이트)와
+app/core/encoding_profiles.py의 각 프로필로 같은 배경과 오버레이를 인코딩합니다.
+
+실행 방법 (저장소 루트에서, ffmpeg가 PATH에 있어야 합니다):
+    python -m benchmarks.bench_encoding
+    FFMPEG_BINARY=/path/to/ffmpeg python -m benchmarks.bench_encoding
+"""
+from app.core.backgrounds import render_gradient
+from app.core.encoding_profiles import ENCODING_PROFILES
+from app.core.video_generator import VideoGenerator
+import ffmpeg
+import os
+import tempfile
+import time
+
+WIDTH, HEIGHT, FPS = 1080, 1920, 30
+DURATION = 30.0
+COLORS = [(32, 64, 160), (240, 120, 40)]
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+
+def legacy_stream(background_path: str, text_path: str, output_file: str):
+    """변경 전 VideoGenerator.generate_video의 ffmpeg 그래프"""
+    return (
+        ffmpeg
+        .input(background_path, loop=1, t=DURATION)
+        .filter('fps', fps=FPS)
+        .filter('scale', WIDTH, HEIGHT)
+        .overlay(
+            ffmpeg.input(text_path).filter('fade', 'in', 0.5).filter('fade', 'out', 0.5),
+            x='(W-w)/2',
+            y='(H-h)/2'
+        )
+        .output(
+            output_file,
+            acodec='aac',
+            audio_bitrate='192k',
+            vcodec='libx264',
+            video_bitrate='2500k',
+            preset='medium',
+            movflags='faststart'
+        )
+        .overwrite_output()
+    )
+
+def encode(stream, output_file: str):
+    """인코딩 시간(초)과 출력 크기(바이트)를 반환합니다."""
+    started = time.perf_counter()
+    stream.run(cmd=FFMPEG_BINARY, quiet=True)
+    return time.perf_counter() - started, os.path.getsize(output_file)
+
+def main() -> None:
+    generator = VideoGenerator()
+    generator.width, generator.height, generator.fps = WIDTH, HEIGHT, FPS
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        background_path = os.path.join(work_dir, 'background.png')
+        text_path = os.path.join(work_dir, 'text.png')
+        audio_path = os.path.join(work_dir, 'voice.mp3')
+        render_gradient(WIDTH, HEIGHT, COLORS).save(background_path)
+        generator._create_text_overlay({'title': 'Benchmark Title'}).save(text_path)
+        (
+            ffmpeg
+            .input(f'sine=frequency=220:duration={DURATION}', f='lavfi')
+            .output(audio_path, audio_bitrate='128k')
+            .overwrite_output()
+            .run(cmd=FFMPEG_BINARY, quiet=True)
+        )
+
+        output_file = os.path.join(work_dir, 'legacy.mp4')
+        seconds, size = encode(legacy_stream(background_path, text_path, output_file), output_file)
+        print(f"{'legacy':8s} {seconds:7.2f} s {size / 1024:9.1f} KiB")
+
+        for name, profile in ENCODING_PROFILES.items():
+            output_file = os.path.join(work_dir, f'{name}.mp4')
+            stream = generator._build_stream(background_path, text_path, audio_path, DURATION, output_file, profile)
+            seconds, size = encode(stream, output_file)
+            print(f"{name:8s} {seconds:7.2f} s {size / 1024:9.1f} KiB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""콜드 스타트 임포트 시간 벤치마크
+
+`python -X importtime`으로 run.py(콘텐츠 생성 CLI)와 uvicorn 워커 기동(`uvicorn`, `app.main`)의
+임포트 시간을 새 프로세스에서 측정하고, 가장 오래 걸린 최상위 패키지를 보여줍니다.
+저장소에 기록된 기준값(importtime_baseline.json)이 있으면 함께 비교합니다.
+
+실행 방법 (저장소 루트에서):
+    python -m benchmarks.bench_importtime
+    python -m benchmarks.bench_importtime --save benchmarks/importtime_baseline.json
+"""
+from typing import Dict, List, Tuple
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'importtime_baseline.json')
+
+# 측정 대상: 이름 → 새 프로세스에서 실행할 임포트 문
+TARGETS = {
+    'run.py': 'import run',
+    'uvicorn worker (app.main)': 'import uvicorn, app.main',
+}
+
+def measure(statement: str) -> Tuple[int, Dict[str, int]]:
+    """새 프로세스에서 임포트 문을 실행하고 임포트 시간을 측정합니다.
+
+    Args:
+        statement: 실행할 임포트 문
+
+    Returns:
+        Tuple[int, Dict[str, int]]: (전체 임포트 시간(us), 최상위 패키지별 임포트 시간(us))
+    """
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    packages: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_time, _, name = line[len('import time:'):].split('|')
+        # 모듈 자체 시간을 최상위 패키지 이름(예: openai, googleapiclient)별로 합산
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_time)
+    return sum(packages.values()), packages
+
+def best_of(statement: str, repeat: int) -> Tuple[int, Dict[str, int]]:
+    """여러 번 측정하여 전체 시간이 가장 짧은 결과를 반환합니다."""
+    return min((measure(statement) for _ in range(repeat)), key=lambda result: result[0])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="콜드 스타트 임포트 시간 벤치마크")
+    parser.add_argument('--repeat', type=int, default=5, help="대상별 측정 횟수 (최솟값 사용)")
+    parser.add_argument('--top', type=int, default=8, help="출력할 최상위 패키지 수")
+    parser.add_argument('--save', metavar='PATH', help="측정 결과를 기준값 JSON으로 저장")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = {}
+    for label, statement in TARGETS.items():
+        total, packages = best_of(statement, args.repeat)
+        results[label] = {'total_us': total, 'packages_us': packages}
+        line = f"[{label}] {total / 1000:8.1f} ms"
+        if label in baseline:
+            before = baseline[label]['total_us']
+            line += f" (기준 {before / 1000:.1f} ms, {before / total:.1f}x)"
+        print(line)
+        top: List[Tuple[str, int]] = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        for package, elapsed in top:
+            print(f"    {package:24s} {elapsed / 1000:8.1f} ms")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write('\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""음성 다중화 렌더링 패스 회귀 벤치마크
+
+변경 전 그래프는 음성을 입력으로 넣지 않아 출력에 오디오 스트림이 없었고, 음성을 붙이려면
+무음 영상을 만든 뒤 ffmpeg를 한 번 더 실행해야 했습니다. 이 스크립트는
+(1) 변경 전 그래프로 무음 인코딩 + 음성 다중화 패스(영상은 스트림 복사),
+(2) 무음 인코딩 + 영상을 다시 인코딩하는 두 번째 패스(자막·페이드를 나중에 입히는 경우),
+(3) VideoGenerator._build_stream의 단일 패스를 같은 배경, 오버레이, 음성으로 실행하여
+ffmpeg 실행 횟수, 소요 시간, 출력 스트림을 비교합니다.
+
+실행 방법 (저장소 루트에서, ffmpeg가 PATH에 있어야 합니다):
+    python -m benchmarks.bench_single_pass
+    FFMPEG_BINARY=/path/to/ffmpeg python -m benchmarks.bench_single_pass
+"""
+from app.core.backgrounds import render_gradient
+from app.core.encoding_profiles import get_profile
+from app.core.video_generator import VideoGenerator
+from typing import List, Tuple
+import ffmpeg
+import os
+import re
+import subprocess
+import tempfile
+import time
+
+WIDTH, HEIGHT, FPS = 1080, 1920, 30
+DURATION = 30.0
+COLORS = [(32, 64, 160), (240, 120, 40)]
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+PROFILE = 'publish'
+
+def legacy_passes(background_path: str, text_path: str, audio_path: str, output_file: str,
+                  reencode: bool) -> List:
+    """변경 전 그래프(음성 없음)와, 음성을 붙이기 위한 두 번째 패스"""
+    silent_file = f"{output_file}.silent.mp4"
+    options = get_profile(PROFILE).output_options(FPS)
+    silent = (
+        ffmpeg
+        .input(background_path, framerate=FPS)
+        .filter('loop', loop=-1, size=1)
+        .filter('trim', duration=DURATION)
+        .overlay(
+            ffmpeg.input(text_path).filter('fade', 'in', 0.5).filter('fade', 'out', 0.5),
+            x='(W-w)/2',
+            y='(H-h)/2'
+        )
+        .output(silent_file, **options)
+        .overwrite_output()
+    )
+    second_pass = options if reencode else {
+        'vcodec': 'copy',
+        'acodec': 'aac',
+        'audio_bitrate': options['audio_bitrate'],
+        'movflags': 'faststart',
+    }
+    mux = (
+        ffmpeg
+        .output(
+            ffmpeg.input(silent_file).video,
+            ffmpeg.input(audio_path).audio,
+            output_file,
+            shortest=None,
+            **second_pass
+        )
+        .overwrite_output()
+    )
+    return [silent, mux]
+
+def run_passes(streams: List) -> float:
+    """ffmpeg 패스들을 차례로 실행하고 전체 소요 시간(초)을 반환합니다."""
+    started = time.perf_counter()
+    for stream in streams:
+        stream.run(cmd=FFMPEG_BINARY, quiet=True)
+    return time.perf_counter() - started
+
+def describe_streams(path: str) -> Tuple[str, ...]:
+    """출력 파일의 스트림 종류를 반환합니다 (ffprobe 없이 ffmpeg -i 출력에서 추출)."""
+    result = subprocess.run([FFMPEG_BINARY, '-hide_banner', '-i', path], capture_output=True, text=True)
+    return tuple(re.findall(r'Stream #\d+:\d+.*?: (Video|Audio)', result.stderr))
+
+def main() -> None:
+    generator = VideoGenerator()
+    generator.width, generator.height, generator.fps = WIDTH, HEIGHT, FPS
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        background_path = os.path.join(work_dir, 'background.png')
+        text_path = os.path.join(work_dir, 'text.png')
+        audio_path = os.path.join(work_dir, 'voice.mp3')
+        render_gradient(WIDTH, HEIGHT, COLORS).save(background_path)
+        generator._create_text_overlay({'title': 'Benchmark Title'}).save(text_path)
+        (
+            ffmpeg
+            .input(f'sine=frequency=220:duration={DURATION}', f='lavfi')
+            .output(audio_path, audio_bitrate='128k')
+            .overwrite_output()
+            .run(cmd=FFMPEG_BINARY, quiet=True)
+        )
+
+        for label, reencode in (('legacy + remux', False), ('legacy + encode', True)):
+            legacy_file = os.path.join(work_dir, 'legacy.mp4')
+            legacy = legacy_passes(background_path, text_path, audio_path, legacy_file, reencode)
+            seconds = run_passes(legacy)
+            print(f"{label:15s} passes={len(legacy)} {seconds:7.2f} s streams={describe_streams(legacy_file)}")
+
+        single_file = os.path.join(work_dir, 'single.mp4')
+        single = [generator._build_stream(
+            background_path, text_path, audio_path, DURATION, single_file, get_profile(PROFILE)
+        )]
+        seconds = run_passes(single)
+        print(f"{'single pass':15s} passes={len(single)} {seconds:7.2f} s streams={describe_streams(single_file)}")
+
+if __name__ == '__main__':
+    main()
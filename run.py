@@ -1,3 +1,4 @@
+import argparse
 import logging
 from app.core.content_generator import ContentGenerator
 
@@ -10,8 +11,16 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def parse_args() -> argparse.Namespace:
+    """명령줄 인자를 파싱합니다."""
+    parser = argparse.ArgumentParser(description="AI Shorts Generator 콘텐츠 생성")
+    parser.add_argument('--batch', action='store_true', help="스크립트를 OpenAI Batch API로 생성 (야간 백필용)")
+    parser.add_argument('--apply-batch', metavar='MANIFEST', help="제출된 배치의 결과를 시트에 적용")
+    return parser.parse_args()
+
 def main():
     """콘텐츠 생성 프로세스를 실행합니다."""
+    args = parse_args()
     try:
         logger.info("콘텐츠 생성 프로세스 시작")
         
@@ -24,7 +33,14 @@ def main():
         logger.info("음성 상태 초기화 완료")
         
         # 대기 중인 주제 처리
-        generator.process_pending_topics()
+        if args.apply_batch:
+            summary = generator.apply_script_batch(args.apply_batch)
+        elif args.batch:
+            summary = generator.process_pending_topics_batch()
+        else:
+            summary = generator.process_pending_topics()
+        for failure in summary.failures:
+            logger.warning(f"처리 실패 - 행 {failure.row} ({failure.stage}): {failure.topic} - {failure.error}")
         
         logger.info("콘텐츠 생성 프로세스 완료")
         
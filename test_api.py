@@ -1,7 +1,26 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
 from app.core.content_generator import ContentGenerator
+from app.api.routes import router
+from app.config import get_settings
+from app.core.job_store import JobStore, get_job_store
+from app.core.stage_pipeline import InProcessQueueBackend, PipelineStage, StageError, StagedPipeline, create_queue_backend
+from app.core.openai_client import OpenAIClient
+from app.core.script_batch import LocalBatchEndpoint, OpenAIBatchBackend, parse_batch_output
+from app.core.script_cache import ScriptCache
+from app.core.script_package import ScriptPackage
+from app.utils.rate_limiter import TokenBucket
 from app.utils.sheets_utils import TopicData
+from app.utils.sheets_write_buffer import SheetsFlushError
+from test_sheets_utils import HEADERS, make_paged_service, make_sheets_utils
 from googleapiclient.errors import HttpError
 from openai import OpenAIError
 
@@ -11,6 +30,8 @@ class TestContentGenerator(unittest.TestCase):
     def setUp(self):
         """테스트를 위한 기본 설정"""
         self.generator = ContentGenerator()
+        # 시트는 가짜 서비스로 만들어 인증 정보나 네트워크 없이 실행
+        self.generator.sheets_utils = make_sheets_utils(MagicMock())
         
         # 테스트용 TopicData 생성
         self.topic_data = TopicData(
@@ -33,6 +54,21 @@ class TestContentGenerator(unittest.TestCase):
             }
         )
 
+    def test_clients_created_on_first_use(self):
+        """ContentGenerator 생성 시에는 클라이언트를 만들지 않고 처음 사용할 때 한 번만 만드는지 테스트"""
+        with patch('app.core.content_generator.SheetsUtils') as sheets, \
+                patch('app.core.openai_client.OpenAIClient') as openai_client, \
+                patch('app.core.elevenlabs_client.ElevenLabsClient') as elevenlabs_client:
+            generator = ContentGenerator()
+            sheets.assert_not_called()
+            openai_client.assert_not_called()
+
+            self.assertIs(generator.openai_client, generator.openai_client)
+            generator.sheets_utils
+            openai_client.assert_called_once()
+            sheets.assert_called_once()
+            elevenlabs_client.assert_not_called()
+
     @patch('app.utils.sheets_utils.SheetsUtils.get_pending_topics')
     @patch('app.core.openai_client.OpenAIClient.generate_script')
     @patch('app.utils.sheets_utils.SheetsUtils.update_row')
@@ -55,6 +91,19 @@ class TestContentGenerator(unittest.TestCase):
         })
         mock_update_row.assert_called_once()
 
+    @patch('app.utils.sheets_utils.SheetsUtils.get_pending_topics')
+    @patch.object(ContentGenerator, '_generate_voice')
+    def test_voice_only_run_does_not_build_openai_client(self, mock_generate_voice, mock_get_topics):
+        """음성만 만드는 실행에서는 캐시 통계를 위해 OpenAI 클라이언트를 만들지 않는지 테스트"""
+        self.topic_data.script = "이미 있는 스크립트"
+        mock_get_topics.return_value = [self.topic_data]
+
+        summary = self.generator.process_pending_topics()
+
+        self.assertEqual(summary.voices_generated, 1)
+        self.assertEqual(summary.script_cache_hits, 0)
+        self.assertNotIn('openai_client', self.generator.__dict__)
+
     @patch('app.utils.sheets_utils.SheetsUtils.append_row')
     def test_add_topic(self, mock_append_row):
         """add_topic 메서드 테스트"""
@@ -87,27 +136,33 @@ class TestContentGenerator(unittest.TestCase):
         mock_get_topics.return_value = [self.topic_data]
         mock_generate_script.side_effect = OpenAIError("API Error")
 
-        # 테스트 실행 및 검증
-        with self.assertRaises(Exception) as context:
-            self.generator.process_pending_topics()
-        
-        self.assertIn("Failed to generate script", str(context.exception))
+        # 테스트 실행
+        summary = self.generator.process_pending_topics()
+
+        # 검증 - 실패는 예외 대신 요약에 기록됨
+        self.assertEqual(summary.failed, 1)
+        self.assertEqual(summary.failures[0].stage, "script")
+        self.assertIn("Failed to generate script", summary.failures[0].error)
 
     @patch('app.utils.sheets_utils.SheetsUtils.get_pending_topics')
     @patch('app.core.openai_client.OpenAIClient.generate_script')
-    @patch('app.utils.sheets_utils.SheetsUtils.update_row')
-    def test_process_pending_topics_update_error(self, mock_update_row, mock_generate_script, mock_get_topics):
-        """스프레드시트 업데이트 에러 처리 테스트"""
-        # Mock 설정
-        mock_get_topics.return_value = [self.topic_data]
+    def test_process_pending_topics_update_error(self, mock_generate_script, mock_get_topics):
+        """스프레드시트 일괄 기록 에러가 요약에 해당 주제의 실패로 기록되는지 테스트"""
+        # Mock 설정 - 시트 쓰기는 버퍼에 쌓였다가 일괄 기록 시 실패
+        batch_update = self.generator.sheets_utils.service.spreadsheets.return_value.values.return_value.batchUpdate
+        batch_update.return_value.execute.side_effect = HttpError(MagicMock(), b"API Error")
+        other_topic = TopicData(**{**self.topic_data.__dict__, 'row': 3, 'topic': "다른 주제"})
+        mock_get_topics.return_value = [self.topic_data, other_topic]
         mock_generate_script.return_value = "테스트 스크립트"
-        mock_update_row.side_effect = HttpError(MagicMock(), b"API Error")
 
-        # 테스트 실행 및 검증
-        with self.assertRaises(ValueError) as context:
-            self.generator.process_pending_topics()
-        
-        self.assertIn("Failed to update row", str(context.exception))
+        # 테스트 실행 - 예외 대신 요약 반환
+        summary = self.generator.process_pending_topics()
+
+        # 검증
+        self.assertEqual(summary.scripts_generated, 0)
+        self.assertEqual(summary.failed, 2)
+        self.assertEqual(sorted(failure.row for failure in summary.failures), [2, 3])
+        self.assertIn("Failed to flush sheet updates", summary.failures[0].error)
 
     @patch('app.utils.sheets_utils.SheetsUtils.append_row')
     def test_add_topic_error(self, mock_append_row):
@@ -189,11 +244,52 @@ class TestContentGenerator(unittest.TestCase):
         mock_get_topics.return_value = [topic_data]
         mock_generate_audio.side_effect = Exception("음성 생성 실패")
 
-        # 테스트 실행 및 검증
-        with self.assertRaises(Exception) as context:
-            self.generator.process_pending_topics()
-        
-        self.assertEqual(str(context.exception), "Failed to generate voice: 음성 생성 실패")
+        # 테스트 실행
+        summary = self.generator.process_pending_topics()
+
+        # 검증
+        self.assertEqual(summary.failed, 1)
+        self.assertEqual(summary.failures[0].stage, "voice")
+        self.assertEqual(summary.failures[0].error, "Failed to generate voice: 음성 생성 실패")
+
+    @patch('app.utils.sheets_utils.SheetsUtils.get_pending_topics')
+    @patch('app.core.openai_client.OpenAIClient.generate_script')
+    @patch('app.utils.sheets_utils.SheetsUtils.update_row')
+    def test_process_pending_topics_failure_isolation(self, mock_update_row, mock_generate_script, mock_get_topics):
+        """한 주제의 실패가 나머지 주제 처리를 중단시키지 않는지 테스트"""
+        # Mock 설정 - 세 주제 중 두 번째만 실패
+        topics = [
+            TopicData(
+                row=row,
+                topic=f"주제 {row}",
+                script="",
+                voice="",
+                video="",
+                video_link="",
+                data_status="✅",
+                status="",
+                column_indices=self.topic_data.column_indices
+            )
+            for row in (2, 3, 4)
+        ]
+        mock_get_topics.return_value = topics
+
+        def generate_script(content_data):
+            if content_data['title'] == "주제 3":
+                raise OpenAIError("API Error")
+            return "테스트 스크립트"
+
+        mock_generate_script.side_effect = generate_script
+
+        # 테스트 실행
+        summary = self.generator.process_pending_topics(max_workers=3)
+
+        # 검증
+        self.assertEqual(summary.total, 3)
+        self.assertEqual(summary.scripts_generated, 2)
+        self.assertEqual(summary.failed, 1)
+        self.assertEqual(summary.failures[0].row, 3)
+        self.assertEqual(mock_update_row.call_count, 2)
 
     @patch('app.utils.sheets_utils.SheetsUtils.get_pending_topics')
     @patch('app.utils.sheets_utils.SheetsUtils.reset_voice_status')
@@ -254,7 +350,7 @@ class TestContentGenerator(unittest.TestCase):
             }
         )
         mock_get_topics.return_value = [topic_data]
-        mock_reset_voice.side_effect = HttpError(MagicMock(), b"API Error")
+        mock_reset_voice.side_effect = SheetsFlushError("Failed to flush sheet updates: API Error", [2])
 
         # 테스트 실행 및 검증
         with self.assertRaises(Exception) as context:
@@ -307,5 +403,781 @@ class TestContentGenerator(unittest.TestCase):
         mock_get_topics.assert_called_once()
         mock_generate_audio.assert_not_called()
 
+def make_topic(row, topic, script="", voice=""):
+    """테스트용 TopicData를 만듭니다."""
+    return TopicData(
+        row=row,
+        topic=topic,
+        script=script,
+        voice=voice,
+        video="",
+        video_link="",
+        data_status="✅",
+        status="",
+        column_indices={'Topic': 0, 'Data': 1, 'Script': 2, 'Voice': 3, 'Video': 4, 'Video Link': 5, 'Status': 6}
+    )
+
+class TestScriptBatch(unittest.TestCase):
+    """Batch API 스크립트 백필 테스트 클래스 (로컬 가짜 배치 엔드포인트 사용)"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        settings = get_settings()
+        for name, value in (('openai_batch_dir', self.temp_dir.name), ('openai_batch_poll_interval', 0)):
+            patcher = patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.generator = ContentGenerator()
+        # 시트는 가짜 서비스로 만들어 인증 정보나 네트워크 없이 실행
+        self.generator.sheets_utils = make_sheets_utils(make_paged_service([HEADERS])[0])
+        self.generator.openai_client.cache = ScriptCache(
+            os.path.join(self.temp_dir.name, 'scripts.sqlite3'), ttl=0, max_entries=100
+        )
+        self.addCleanup(self.generator.openai_client.cache.close)
+
+        self.topics = [
+            make_topic(2, "꿀"),
+            make_topic(3, "번개"),
+            make_topic(4, "화산", script="이미 있는 스크립트"),
+        ]
+
+        def responder(body):
+            prompt = body['messages'][-1]['content']
+            if "번개" in prompt:
+                raise RuntimeError("content filtered")
+            return "[INTRO]\n꿀 이야기\n[BODY]\n본문\n[OUTRO]\n끝"
+
+        self.endpoint = LocalBatchEndpoint(responder)
+        self.backend = OpenAIBatchBackend(self.endpoint.client())
+
+    @patch('app.utils.sheets_utils.SheetsUtils.get_pending_topics')
+    @patch('app.utils.sheets_utils.SheetsUtils.update_row')
+    def test_batch_submit_poll_and_apply(self, mock_update_row, mock_get_topics):
+        """배치 파일 작성, 제출, 완료 대기, 결과 일괄 적용 흐름 테스트"""
+        mock_get_topics.return_value = self.topics
+
+        summary = self.generator.process_pending_topics_batch(self.backend)
+
+        # 스크립트가 필요한 두 주제만 한 번의 배치로 제출
+        self.assertEqual(len(self.endpoint.batches), 1)
+        batch = next(iter(self.endpoint.batches.values()))
+        self.assertEqual(batch['request_counts'], {'total': 2, 'completed': 1, 'failed': 1})
+
+        self.assertEqual(summary.total, 2)
+        self.assertEqual(summary.scripts_generated, 1)
+        self.assertEqual([(failure.row, failure.stage) for failure in summary.failures], [(3, 'script')])
+        self.assertIn("content filtered", summary.failures[0].error)
+        mock_update_row.assert_called_once_with(self.topics[0], "꿀 이야기\n본문\n끝")
+
+        # 배치 결과는 스크립트 캐시에도 저장되어 실시간 호출에서 재사용
+        with patch.object(self.generator.openai_client.client.chat.completions, 'create') as create:
+            self.assertIn("꿀 이야기", self.generator.openai_client.generate_script({'title': "꿀", 'content': '', 'tags': []}))
+            create.assert_not_called()
+
+    @patch('app.utils.sheets_utils.SheetsUtils.get_pending_topics')
+    @patch('app.utils.sheets_utils.SheetsUtils.update_row')
+    def test_apply_replays_saved_output_offline(self, mock_update_row, mock_get_topics):
+        """이미 받은 배치 결과는 네트워크 없이 다시 적용되고, 바뀐 행은 건너뛰는지 테스트"""
+        mock_get_topics.return_value = self.topics
+        manifest_path = self.generator.submit_script_batch(self.backend)
+        self.generator.apply_script_batch(manifest_path, self.backend)
+
+        offline = MagicMock()
+        mock_get_topics.return_value = [make_topic(2, "다른 주제"), self.topics[1]]
+        summary = self.generator.apply_script_batch(manifest_path, offline)
+
+        offline.wait.assert_not_called()
+        offline.download.assert_not_called()
+        self.assertEqual(summary.skipped, 1)
+        self.assertEqual(mock_update_row.call_count, 1)
+
+    def test_apply_rereads_sheet_edited_during_batch(self):
+        """배치를 기다리는 동안 사람이 스크립트를 채운 행은 덮어쓰지 않는지 테스트"""
+        rows = [HEADERS, ["꿀", '✅'], ["번개", '✅']]
+        service, requested = make_paged_service(rows)
+        self.generator.sheets_utils = make_sheets_utils(service, row_count=10)
+        manifest_path = self.generator.submit_script_batch(self.backend)
+
+        rows[1] = ["꿀", '✅', "사람이 쓴 스크립트"]
+        summary = self.generator.apply_script_batch(manifest_path, self.backend)
+
+        self.assertEqual(len(requested), 2)
+        self.assertEqual(summary.skipped, 1)
+        self.assertEqual(summary.scripts_generated, 0)
+        service.spreadsheets.return_value.values.return_value.batchUpdate.assert_not_called()
+
+    @patch('app.utils.sheets_utils.SheetsUtils.get_pending_topics')
+    def test_nothing_to_submit(self, mock_get_topics):
+        """스크립트가 필요한 주제가 없으면 배치를 제출하지 않는지 테스트"""
+        mock_get_topics.return_value = [self.topics[2]]
+
+        self.assertIsNone(self.generator.submit_script_batch(self.backend))
+        self.assertEqual(self.endpoint.batches, {})
+
+    def test_null_content_is_reported_per_item(self):
+        """content가 null인 응답은 해당 항목만 실패로 보고되는지 테스트"""
+        def line(custom_id, content):
+            return json.dumps({'custom_id': custom_id, 'response': {
+                'status_code': 200,
+                'body': {'choices': [{'message': {'role': 'assistant', 'content': content, 'refusal': "거부"}}]}
+            }})
+
+        results = parse_batch_output('\n'.join([line('row-2', None), line('row-3', " 스크립트 ")]))
+
+        self.assertEqual(results['row-2'], (None, "Empty response content"))
+        self.assertEqual(results['row-3'], ("스크립트", None))
+
+class TestJobStore(unittest.TestCase):
+    """작업 저장소 테스트 클래스"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.store = JobStore(os.path.join(self.temp_dir.name, 'jobs.sqlite3'))
+        self.addCleanup(self.store.close)
+
+    def test_stage_progress_timings_and_artifacts(self):
+        """단계별 진행률, 소요 시간, 산출물이 기록되는지 테스트"""
+        job_id = self.store.create({'content_id': 'abc'})
+        self.assertEqual(self.store.get(job_id)['status'], 'queued')
+
+        self.store.start_stage(job_id, 'fetch')
+        self.store.finish_stage(job_id, 'fetch', {'title': "꿀"})
+        self.store.start_stage(job_id, 'script')
+        self.store.finish_stage(job_id, 'script', {'package': {'title': "꿀의 비밀"}})
+        self.store.start_stage(job_id, 'voice')
+
+        job = self.store.get(job_id)
+        self.assertEqual(job['status'], 'running')
+        self.assertEqual(job['stage'], 'voice')
+        self.assertEqual(job['progress'], 20.0)
+        self.assertEqual(job['artifacts'], {'title': "꿀", 'package': {'title': "꿀의 비밀"}})
+        self.assertEqual([stage['stage'] for stage in job['stages']], ['fetch', 'script', 'voice'])
+        self.assertIsNotNone(job['stages'][0]['duration'])
+        self.assertIsNone(job['stages'][2]['duration'])
+
+        self.store.report_progress(job_id, 'voice', 0.5)
+        self.assertEqual(self.store.get(job_id)['progress'], 30.0)
+
+        self.store.fail(job_id, "ElevenLabs quota exceeded")
+        job = self.store.get(job_id)
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['stages'][2]['error'], "ElevenLabs quota exceeded")
+        self.assertIsNotNone(job['finished_at'])
+
+    def test_wal_mode_and_indexed_queries(self):
+        """WAL 모드를 사용하고 상태/목록 조회가 인덱스를 타는지 테스트"""
+        self.store.create({})
+        conn = self.store._connect()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+
+        for sql, params in (
+            ("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (50,)),
+            ("SELECT * FROM jobs WHERE status = ? AND created_at < ? ORDER BY created_at DESC LIMIT ?",
+             ('completed', time.time(), 50)),
+            ("SELECT * FROM jobs WHERE job_id = ?", ('x',)),
+        ):
+            plan = ' '.join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+            self.assertIn("USING", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_history_pagination(self):
+        """최근 작업부터 before 커서로 페이지를 나눠 조회하는지 테스트"""
+        job_ids = []
+        for index in range(5):
+            with patch('app.core.job_store.time.time', return_value=1000.0 + index):
+                job_ids.append(self.store.create({'index': index}))
+        self.store.complete(job_ids[1])
+
+        first_page = self.store.history(limit=2)
+        second_page = self.store.history(limit=2, before=first_page[-1]['created_at'])
+
+        self.assertEqual([job['job_id'] for job in first_page], [job_ids[4], job_ids[3]])
+        self.assertEqual([job['job_id'] for job in second_page], [job_ids[2], job_ids[1]])
+        self.assertEqual([job['job_id'] for job in self.store.history(status='completed')], [job_ids[1]])
+
+class TestGenerateJobRoutes(unittest.TestCase):
+    """/generate, /status, /history 라우트 테스트 클래스"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        patcher = patch.object(get_settings(), 'job_store_path', os.path.join(self.temp_dir.name, 'jobs.sqlite3'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        app = FastAPI()
+        app.include_router(router, prefix="/api")
+        self.client = TestClient(app)
+
+    def patch_clients(self, content):
+        """파이프라인의 외부 클라이언트를 가짜로 바꿉니다."""
+        package = ScriptPackage.from_dict(PACKAGE_RESPONSE)
+        clients = {
+            'app.core.notion_client.NotionClient': {'get_content': content},
+            'app.core.openai_client.OpenAIClient': {'agenerate_package': package},
+            'app.core.elevenlabs_client.ElevenLabsClient': {'generate_timed_voice': ("/tmp/voice.mp3", [1_000_000])},
+            'app.core.video_generator.VideoGenerator': {'generate_video': "/tmp/video.mp4"},
+            'app.core.youtube_client.YouTubeClient': {'upload_video': "https://youtube.com/watch?v=abc"},
+        }
+        # 라우터는 클라이언트 모듈을 처음 사용할 때 가져오므로 정의된 모듈에서 바꿈
+        instances = {}
+        for target, methods in clients.items():
+            instance = MagicMock()
+            for method, value in methods.items():
+                setattr(instance, method, AsyncMock(return_value=value))
+            patcher = patch(target, return_value=instance)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+            instances[target.rsplit('.', 1)[1]] = instance
+        return instances
+
+    def test_generate_returns_job_id_and_tracks_stages(self):
+        """/generate가 작업 ID를 바로 반환하고 백그라운드 실행 결과가 상태에 반영되는지 테스트"""
+        clients = self.patch_clients({'title': "꿀"})
+
+        response = self.client.post("/api/generate", json={'content_id': "abc"})
+        self.assertEqual(response.status_code, 200)
+        job_id = response.json()['job_id']
+
+        # 문장별 재생 시간이 영상 단계로 전달되어 자막 시각에 쓰임
+        audio_file, content_data = clients['VideoGenerator'].generate_video.call_args.args
+        self.assertEqual(audio_file, "/tmp/voice.mp3")
+        self.assertEqual(content_data['sentence_durations'], [1_000_000])
+
+        status = self.client.get(f"/api/status/{job_id}").json()
+        self.assertEqual(status['status'], 'completed')
+        self.assertEqual(status['progress'], 100.0)
+        self.assertEqual(status['artifacts']['video_url'], "https://youtube.com/watch?v=abc")
+        self.assertEqual([stage['stage'] for stage in status['stages']], ['fetch', 'script', 'voice', 'video', 'upload'])
+
+        history = self.client.get("/api/history").json()
+        self.assertEqual([job['job_id'] for job in history], [job_id])
+
+    def test_failed_job_and_unknown_job(self):
+        """파이프라인 실패가 작업 상태에 기록되고, 없는 작업은 404인지 테스트"""
+        self.patch_clients(None)
+
+        job_id = self.client.post("/api/generate", json={'content_id': "missing"}).json()['job_id']
+
+        status = self.client.get(f"/api/status/{job_id}").json()
+        self.assertEqual(status['status'], 'failed')
+        self.assertEqual(status['message'], "Content not found")
+        self.assertEqual(status['stages'][0]['status'], 'failed')
+        self.assertEqual(self.client.get("/api/status/unknown").status_code, 404)
+
+    def test_cancelled_stage_marks_job_failed(self):
+        """파이프라인을 멈추며 처리 중이던 단계가 취소되면 작업이 실행 중으로 남지 않는지 테스트"""
+        from app.api.routes import _tracked
+        store = get_job_store(get_settings().job_store_path)
+        job_id = store.create({'content_id': "abc"})
+
+        async def hang(item):
+            await asyncio.sleep(60)
+
+        async def cancel_while_rendering():
+            task = asyncio.create_task(_tracked('video', hang)({'job_id': job_id}))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_while_rendering())
+
+        job = store.get(job_id)
+        self.assertEqual((job['status'], job['message']), ('failed', "Cancelled"))
+        self.assertEqual(job['stages'][0]['status'], 'failed')
+
+    def test_generate_batch_runs_jobs_through_one_pipeline(self):
+        """/generate-batch가 작업마다 ID를 만들고 모두 파이프라인으로 처리하는지 테스트"""
+        self.patch_clients({'title': "꿀"})
+
+        response = self.client.post("/api/generate-batch", json=[{'content_id': "a"}, {'content_id': "b"}])
+        job_ids = response.json()['job_ids']
+
+        self.assertEqual(len(job_ids), 2)
+        for job_id in job_ids:
+            self.assertEqual(self.client.get(f"/api/status/{job_id}").json()['status'], 'completed')
+
+    def test_scheduled_uploads_are_persisted_for_polling(self):
+        """예약 업로드의 영상별 결과가 작업 저장소에 기록되어 조회할 수 있는지 테스트"""
+        uploads = [
+            {'video_file': "a.mp4", 'status': 'uploaded', 'video_url': "https://youtube.com/watch?v=a",
+             'error': None, 'playlist_error': None},
+            {'video_file': "b.mp4", 'status': 'deferred', 'video_url': None,
+             'error': "YouTube quota exhausted", 'playlist_error': None},
+        ]
+        scheduler = MagicMock()
+        scheduler.run = AsyncMock(return_value=["https://youtube.com/watch?v=a", Exception("quota")])
+        scheduler.report.return_value = uploads
+
+        with patch('app.core.upload_scheduler.create_upload_scheduler', return_value=scheduler):
+            response = self.client.post(
+                "/api/uploads/schedule", json=[{'video_file': "a.mp4"}, {'video_file': "b.mp4"}]
+            ).json()
+
+        status = self.client.get(f"/api/status/{response['job_id']}").json()
+        self.assertEqual(response['videos'], 2)
+        self.assertEqual(status['status'], 'completed')
+        self.assertEqual(status['artifacts']['uploads'], uploads)
+        self.assertEqual(status['message'], "uploaded 1, failed 0, deferred 1")
+
+class TestStagedPipeline(unittest.TestCase):
+    """단계별 대기열 파이프라인 테스트 클래스"""
+
+    def make_stage(self, name, delay, workers, events, fail_on=()):
+        """지연 시간과 동시 실행 수를 기록하는 단계를 만듭니다."""
+        active = {'now': 0, 'max': 0}
+
+        async def handler(item):
+            active['now'] += 1
+            active['max'] = max(active['max'], active['now'])
+            try:
+                await asyncio.sleep(delay)
+                if item['id'] in fail_on:
+                    raise ValueError(f"{name} failed for {item['id']}")
+                events.append((name, item['id'], time.perf_counter()))
+                return {**item, name: True}
+            finally:
+                active['now'] -= 1
+
+        return PipelineStage(name, handler, workers), active
+
+    def test_slow_stage_does_not_block_earlier_stages(self):
+        """느린 렌더링 단계가 다음 항목의 스크립트 생성을 막지 않는지 테스트"""
+        events = []
+        script, script_active = self.make_stage('script', 0.01, 5, events)
+        render, render_active = self.make_stage('render', 0.1, 1, events)
+        pipeline = StagedPipeline([script, render])
+
+        results = asyncio.run(pipeline.run([{'id': index} for index in range(5)]))
+
+        self.assertEqual([result['id'] for result in results], list(range(5)))
+        self.assertTrue(all(result['render'] for result in results))
+        last_script = max(at for name, _, at in events if name == 'script')
+        first_render = min(at for name, _, at in events if name == 'render')
+        self.assertLess(last_script, first_render)
+        self.assertEqual(render_active['max'], 1)
+        self.assertGreater(script_active['max'], 1)
+        self.assertEqual(pipeline.stats['render']['processed'], 5)
+
+    def test_failure_isolation(self):
+        """한 항목이 실패해도 나머지 항목은 끝까지 처리되는지 테스트"""
+        events = []
+        script, _ = self.make_stage('script', 0, 2, events)
+        voice, _ = self.make_stage('voice', 0, 2, events, fail_on=(1,))
+        upload, _ = self.make_stage('upload', 0, 1, events)
+        pipeline = StagedPipeline([script, voice, upload])
+
+        results = asyncio.run(pipeline.run([{'id': index} for index in range(3)]))
+
+        self.assertIsInstance(results[1], StageError)
+        self.assertEqual(results[1].stage, 'voice')
+        self.assertTrue(results[0]['upload'] and results[2]['upload'])
+        self.assertNotIn(('upload', 1), [(name, item_id) for name, item_id, _ in events])
+        self.assertEqual(pipeline.stats['voice']['failed'], 1)
+
+    def test_concurrent_submits_share_stage_workers(self):
+        """동시에 들어온 요청들이 같은 워커를 써서 단계별 워커 수가 프로세스 전체 한도인지 테스트"""
+        events = []
+        script, _ = self.make_stage('script', 0, 4, events)
+        render, render_active = self.make_stage('render', 0.02, 1, events)
+        pipeline = StagedPipeline([script, render])
+
+        async def submit_twice():
+            try:
+                return await asyncio.gather(
+                    pipeline.submit([{'id': index} for index in range(3)]),
+                    pipeline.submit([{'id': index} for index in range(3, 6)])
+                )
+            finally:
+                await pipeline.stop()
+
+        first, second = asyncio.run(submit_twice())
+
+        self.assertEqual([result['id'] for result in first + second], list(range(6)))
+        self.assertEqual(render_active['max'], 1)
+        self.assertEqual(pipeline.stats['render']['processed'], 6)
+
+    def test_stop_records_in_flight_items_as_cancelled(self):
+        """처리 중에 파이프라인을 멈추면 그 항목이 취소된 실패로 기록되는지 테스트"""
+        started = []
+
+        async def hang(item):
+            started.append(item['id'])
+            await asyncio.sleep(60)
+
+        pipeline = StagedPipeline([PipelineStage('render', hang, 1)])
+
+        async def stop_while_rendering():
+            submitted = asyncio.create_task(pipeline.submit([{'id': 0}, {'id': 1}]))
+            while not started:
+                await asyncio.sleep(0.01)
+            await pipeline.stop()
+            return await asyncio.wait_for(submitted, 5)
+
+        results = asyncio.run(stop_while_rendering())
+
+        self.assertEqual((results[0].stage, str(results[0])), ('render', "Cancelled"))
+        self.assertEqual((results[1].stage, str(results[1])), ('pipeline', "Pipeline stopped"))
+        self.assertEqual(pipeline.stats['render']['failed'], 1)
+
+    def test_enqueue_failure_is_recorded_instead_of_hanging(self):
+        """다음 단계 대기열에 넣지 못한 항목이 StageError로 기록되고 run이 끝나는지 테스트"""
+        events = []
+        script, _ = self.make_stage('script', 0, 1, events)
+        upload, _ = self.make_stage('upload', 0, 1, events)
+        backend = InProcessQueueBackend()
+        original_put = backend.put
+
+        async def flaky_put(stage, message):
+            if stage == 'upload' and message['item']['id'] == 1:
+                raise ConnectionError("connection refused")
+            await original_put(stage, message)
+
+        backend.put = flaky_put
+        pipeline = StagedPipeline([script, upload], backend)
+
+        results = asyncio.run(asyncio.wait_for(pipeline.run([{'id': index} for index in range(3)]), 5))
+
+        self.assertIsInstance(results[1], StageError)
+        self.assertEqual(results[1].stage, 'upload')
+        self.assertTrue(results[0]['upload'] and results[2]['upload'])
+
+    def test_invalid_configuration(self):
+        """잘못된 단계 구성과 알 수 없는 백엔드를 거부하는지 테스트"""
+        with self.assertRaises(ValueError):
+            StagedPipeline([])
+        with self.assertRaises(ValueError):
+            create_queue_backend('rabbitmq')
+        self.assertEqual(asyncio.run(StagedPipeline([PipelineStage('a', AsyncMock())]).run([])), [])
+
+class FakeAsyncCompletions:
+    """호출마다 지연 후 응답하는 AsyncOpenAI chat.completions 대역"""
+
+    def __init__(self, delay=0.2, fail_titles=()):
+        self.delay = delay
+        self.fail_titles = fail_titles
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, model, messages, temperature, max_tokens):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        prompt = messages[-1]['content']
+        if any(title in prompt for title in self.fail_titles):
+            raise RuntimeError("rate limited")
+        response = MagicMock()
+        response.choices[0].message.content = f" 스크립트: {prompt.split('주제: ')[1].splitlines()[0]} "
+        response.usage.total_tokens = 100
+        return response
+
+class TestOpenAIClient(unittest.TestCase):
+    """OpenAIClient 비동기 일괄 생성 테스트 클래스"""
+
+    def setUp(self):
+        with patch('app.core.openai_client.get_sync_client'), \
+                patch('app.core.openai_client.get_rate_limits', return_value=(TokenBucket(0), TokenBucket(0))):
+            self.client = OpenAIClient()
+        self.client.cache = None
+        self.completions = FakeAsyncCompletions()
+        fake_client = MagicMock()
+        fake_client.chat.completions = self.completions
+        patcher = patch('app.core.openai_client.get_async_client', return_value=fake_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_generate_scripts_runs_concurrently(self):
+        """일괄 생성이 가장 느린 호출 시간 정도에 끝나고 순서를 유지하는지 테스트"""
+        batch = [{'title': f"주제 {index}"} for index in range(50)]
+
+        started = time.perf_counter()
+        results = asyncio.run(self.client.generate_scripts(batch, concurrency=50))
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(results, [f"스크립트: 주제 {index}" for index in range(50)])
+
+    def test_generate_scripts_respects_concurrency(self):
+        """동시 요청 수가 세마포어 크기를 넘지 않는지 테스트"""
+        self.completions.delay = 0.05
+        batch = [{'title': f"주제 {index}"} for index in range(12)]
+
+        asyncio.run(self.client.generate_scripts(batch, concurrency=3))
+
+        self.assertEqual(self.completions.max_in_flight, 3)
+
+    def test_generate_scripts_failure_isolation(self):
+        """한 항목의 실패가 나머지 결과에 영향을 주지 않는지 테스트"""
+        self.completions.fail_titles = ("주제 1",)
+        batch = [{'title': "주제 0"}, {'title': "주제 1"}, {'title': "주제 2"}]
+
+        results = asyncio.run(self.client.generate_scripts(batch))
+
+        self.assertEqual(results[0], "스크립트: 주제 0")
+        self.assertIsInstance(results[1], Exception)
+        self.assertIn("rate limited", str(results[1]))
+        self.assertEqual(results[2], "스크립트: 주제 2")
+
+class TestScriptCache(unittest.TestCase):
+    """스크립트 응답 캐시와 single-flight 테스트 클래스"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache = ScriptCache(os.path.join(self.temp_dir.name, 'scripts.sqlite3'), ttl=3600, max_entries=100)
+        self.addCleanup(self.cache.close)
+
+        with patch('app.core.openai_client.get_sync_client'), \
+                patch('app.core.openai_client.get_rate_limits', return_value=(TokenBucket(0), TokenBucket(0))):
+            self.client = OpenAIClient()
+        self.client.cache = self.cache
+
+    def make_response(self, content):
+        response = MagicMock()
+        response.choices[0].message.content = content
+        response.usage.total_tokens = 100
+        return response
+
+    def test_key_covers_request_parameters(self):
+        """요청 파라미터가 하나라도 다르면 다른 키가 되는지 테스트"""
+        base = ("gpt-4-turbo-preview", "system", "prompt", 0.7, 1000)
+        key = ScriptCache.make_key(*base)
+
+        self.assertEqual(key, ScriptCache.make_key(*base))
+        for index, value in enumerate(("gpt-4o", "other", "other", 0.2, 500)):
+            changed = list(base)
+            changed[index] = value
+            self.assertNotEqual(key, ScriptCache.make_key(*changed))
+
+    def test_ttl_expiry(self):
+        """유효 시간이 지난 항목은 적중하지 않는지 테스트"""
+        self.cache.put("key", "스크립트")
+        self.assertEqual(self.cache.get("key"), "스크립트")
+
+        with patch('app.core.script_cache.time.time', return_value=time.time() + 7200):
+            self.assertIsNone(self.cache.get("key"))
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_size_bounded_eviction(self):
+        """항목 수가 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제되는지 테스트"""
+        cache = ScriptCache(os.path.join(self.temp_dir.name, 'small.sqlite3'), ttl=0, max_entries=2)
+        self.addCleanup(cache.close)
+        with patch('app.core.script_cache.time.time', side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.put("a", "A")
+            cache.put("b", "B")
+            cache.get("a")
+            cache.put("c", "C")
+
+        self.assertEqual(cache.get("a"), "A")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "C")
+
+    def test_cache_hit_skips_api_call(self):
+        """같은 주제를 다시 요청하면 API를 호출하지 않고 적중 수가 늘어나는지 테스트"""
+        self.client.client.chat.completions.create.return_value = self.make_response(" 스크립트 ")
+
+        first = self.client.generate_script({'title': "중복 주제"})
+        second = self.client.generate_script({'title': "중복 주제"})
+
+        self.assertEqual(first, "스크립트")
+        self.assertEqual(second, "스크립트")
+        self.client.client.chat.completions.create.assert_called_once()
+        self.assertEqual(self.client.cache_stats()['hits'], 1)
+
+    def test_null_content_raises_and_is_not_cached(self):
+        """거절 응답처럼 content가 null이면 ValueError로 실패하고 캐시에 남기지 않는지 테스트"""
+        self.client.client.chat.completions.create.return_value = self.make_response(None)
+
+        with self.assertRaises(Exception) as context:
+            self.client.generate_script({'title': "거절된 주제"})
+
+        self.assertIn("Empty response content", str(context.exception))
+        self.assertEqual(self.cache.stats['hits'], 0)
+        key = self.client._script_cache_key(self.client._script_messages({'title': "거절된 주제"}))
+        self.assertIsNone(self.cache.get(key))
+        with self.assertRaises(ValueError):
+            self.client._finish_completion(0, self.make_response(None), False)
+
+    def test_concurrent_identical_requests_collapse(self):
+        """동시에 들어온 같은 요청이 하나의 API 호출로 합쳐지는지 테스트"""
+        release = threading.Event()
+
+        def slow_create(**kwargs):
+            release.wait(5)
+            return self.make_response("스크립트")
+
+        self.client.client.chat.completions.create.side_effect = slow_create
+        coalesced_before = self.client.cache_stats()['coalesced']
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.client.generate_script({'title': "동시 주제"})))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, ["스크립트"] * 4)
+        self.client.client.chat.completions.create.assert_called_once()
+        self.assertEqual(self.client.cache_stats()['coalesced'] - coalesced_before, 3)
+
+    def test_async_identical_requests_collapse(self):
+        """비동기 동시 요청도 하나의 API 호출로 합쳐지는지 테스트"""
+        completions = FakeAsyncCompletions(delay=0.1)
+        fake_client = MagicMock()
+        fake_client.chat.completions = completions
+
+        with patch('app.core.openai_client.get_async_client', return_value=fake_client), \
+                patch.object(completions, 'create', wraps=completions.create) as create:
+            results = asyncio.run(self.client.generate_scripts([{'title': "같은 주제"}] * 5))
+
+        self.assertEqual(results, ["스크립트: 같은 주제"] * 5)
+        self.assertEqual(create.call_count, 1)
+        self.assertEqual(self.client.cache_stats()['hits'], 0)
+        self.assertEqual(self.client.generate_script({'title': "같은 주제"}), "스크립트: 같은 주제")
+        self.assertEqual(self.client.cache_stats()['hits'], 1)
+
+    def test_leader_rechecks_cache_before_calling_api(self):
+        """캐시 확인과 리더 선출 사이에 저장된 응답이 있으면 리더가 API를 호출하지 않는지 테스트"""
+        key = self.client._script_cache_key(self.client._script_messages({'title': "방금 끝난 주제"}))
+        self.cache.put(key, "스크립트")
+        completions = FakeAsyncCompletions()
+        fake_client = MagicMock()
+        fake_client.chat.completions = completions
+
+        # 첫 캐시 확인은 다른 요청이 저장하기 직전에 일어난 것처럼 놓침
+        for generate in (
+            lambda: self.client.generate_script({'title': "방금 끝난 주제"}),
+            lambda: asyncio.run(self.client.agenerate_script({'title': "방금 끝난 주제"}))
+        ):
+            with patch.object(self.cache, 'get', side_effect=[None, "스크립트"]), \
+                    patch('app.core.openai_client.get_async_client', return_value=fake_client), \
+                    patch.object(completions, 'create', wraps=completions.create) as create:
+                self.assertEqual(generate(), "스크립트")
+            self.assertEqual(create.call_count, 0)
+        self.client.client.chat.completions.create.assert_not_called()
+
+PACKAGE_RESPONSE = {
+    'intro': "꿀은 상하지 않아요.",
+    'body': "3000년 된 꿀도 먹을 수 있었어요.",
+    'outro': "오늘도 하나 배웠어요.",
+    'hashtags': ["#꿀", "과학 상식", "#꿀", "  #쇼츠 "],
+    'title': "3000년 된 꿀의 비밀",
+    'description': "꿀이 상하지 않는 이유를 알아봐요."
+}
+
+class TestScriptPackage(unittest.TestCase):
+    """스크립트 패키지 구조화 응답 테스트 클래스"""
+
+    def setUp(self):
+        with patch('app.core.openai_client.get_sync_client'), \
+                patch('app.core.openai_client.get_rate_limits', return_value=(TokenBucket(0), TokenBucket(0))):
+            self.client = OpenAIClient()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.client.cache = ScriptCache(os.path.join(self.temp_dir.name, 'scripts.sqlite3'), ttl=0, max_entries=10)
+        self.addCleanup(self.client.cache.close)
+        self.create = self.client.client.chat.completions.create
+
+    def respond_with(self, content):
+        response = MagicMock()
+        response.choices[0].message.content = content
+        response.usage.total_tokens = 300
+        self.create.return_value = response
+
+    def test_from_json_normalizes_hashtags(self):
+        """JSON 응답을 파싱하고 해시태그를 정리하는지 테스트"""
+        package = ScriptPackage.from_json(json.dumps(PACKAGE_RESPONSE, ensure_ascii=False))
+
+        self.assertEqual(package.hashtags, ["#꿀", "#과학상식", "#쇼츠"])
+        self.assertEqual(package.title, "3000년 된 꿀의 비밀")
+        self.assertTrue(package.script.startswith("[INTRO]\n꿀은 상하지 않아요."))
+        self.assertIn("[OUTRO]\n오늘도 하나 배웠어요.", package.script)
+        self.assertNotIn("[", package.narration)
+
+    def test_from_json_rejects_invalid_responses(self):
+        """스키마와 맞지 않는 응답에 대한 예외 테스트"""
+        missing = dict(PACKAGE_RESPONSE)
+        del missing['title']
+        for content in ("not json", "[]", json.dumps(missing), json.dumps({**PACKAGE_RESPONSE, 'hashtags': "#꿀"}),
+                        json.dumps({**PACKAGE_RESPONSE, 'body': "  "})):
+            with self.assertRaises(ValueError):
+                ScriptPackage.from_json(content)
+
+    def test_generate_package_uses_one_json_mode_call(self):
+        """스크립트와 메타데이터가 JSON 모드 요청 한 번으로 생성되고 해시태그는 캐시에서 재사용되는지 테스트"""
+        self.respond_with(json.dumps(PACKAGE_RESPONSE, ensure_ascii=False))
+
+        package = self.client.generate_package({'title': "꿀", 'content': "꿀의 보존성", 'tags': ["과학"]})
+        hashtags = self.client.generate_hashtags({'title': "꿀", 'content': "꿀의 보존성", 'tags': ["과학"]})
+
+        self.create.assert_called_once()
+        kwargs = self.create.call_args.kwargs
+        self.assertEqual(kwargs['response_format'], {'type': 'json_object'})
+        self.assertIn('"hashtags"', kwargs['messages'][0]['content'])
+        self.assertIn("꿀의 보존성", kwargs['messages'][1]['content'])
+        self.assertEqual(package.body, "3000년 된 꿀도 먹을 수 있었어요.")
+        self.assertEqual(hashtags, package.hashtags)
+
+    def test_invalid_package_is_not_cached(self):
+        """스키마 검증에 실패한 응답은 캐시에 저장되지 않는지 테스트"""
+        self.respond_with('{"intro": "only"}')
+        with self.assertRaises(Exception):
+            self.client.generate_package({'title': "꿀"})
+
+        self.respond_with(json.dumps(PACKAGE_RESPONSE, ensure_ascii=False))
+        package = self.client.generate_package({'title': "꿀"})
+
+        self.assertEqual(self.create.call_count, 2)
+        self.assertEqual(package.title, "3000년 된 꿀의 비밀")
+
+class TestTokenBucket(unittest.TestCase):
+    """TokenBucket 속도 제한기 테스트 클래스"""
+
+    def test_burst_then_wait(self):
+        """버킷 크기만큼은 바로 통과하고 이후에는 채워질 때까지 기다리는지 테스트"""
+        bucket = TokenBucket(per_minute=600, capacity=2)  # 초당 10개
+
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        waited = bucket.acquire()
+
+        self.assertGreater(waited, 0.05)
+        self.assertLess(waited, 0.2)
+
+    def test_async_reservations_are_spaced(self):
+        """비동기 요청들이 분당 한도에 맞춰 순서대로 통과하는지 테스트"""
+        bucket = TokenBucket(per_minute=1200, capacity=1)  # 초당 20개
+
+        async def scenario():
+            started = time.perf_counter()
+            await asyncio.gather(*(bucket.acquire_async() for _ in range(5)))
+            return time.perf_counter() - started
+
+        elapsed = asyncio.run(scenario())
+        self.assertGreater(elapsed, 0.15)
+        self.assertLess(elapsed, 0.5)
+
+    def test_refund_and_unlimited(self):
+        """돌려준 토큰을 다시 쓸 수 있고 한도 0은 제한이 없는지 테스트"""
+        bucket = TokenBucket(per_minute=60, capacity=100)
+        bucket.acquire(100)
+        bucket.refund(50)
+        self.assertEqual(bucket.acquire(50), 0.0)
+
+        unlimited = TokenBucket(per_minute=0)
+        self.assertTrue(unlimited.unlimited)
+        self.assertEqual(unlimited.acquire(10 ** 9), 0.0)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,386 @@
+import asyncio
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from app.core.audio_cache import AudioCache
+from app.core.audio_concat import concat_audio
+from app.core.audio_metadata import get_audio_duration_us, mp3_duration_us
+from app.core.elevenlabs_client import ElevenLabsClient, VOICE_MODEL, VOICE_SETTINGS
+from app.core.voice_segments import VoiceSegmentStore
+
+class TestAudioCache(unittest.TestCase):
+    """AudioCache 테스트 클래스"""
+
+    def setUp(self):
+        """테스트를 위한 기본 설정"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = AudioCache(self.temp_dir.name, max_bytes=1024)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_make_key_is_stable(self):
+        """같은 요청은 같은 키, 설정이 다르면 다른 키를 만드는지 테스트"""
+        key = AudioCache.make_key("안녕하세요", "voice", VOICE_MODEL, VOICE_SETTINGS)
+
+        self.assertEqual(key, AudioCache.make_key("안녕하세요", "voice", VOICE_MODEL, dict(VOICE_SETTINGS)))
+        self.assertNotEqual(key, AudioCache.make_key("안녕하세요", "voice", VOICE_MODEL, {**VOICE_SETTINGS, 'speed': 1.0}))
+        self.assertNotEqual(key, AudioCache.make_key("안녕하세요", "other", VOICE_MODEL, VOICE_SETTINGS))
+
+    def test_put_and_get(self):
+        """저장한 오디오를 다시 가져오는지 테스트"""
+        self.assertIsNone(self.cache.get("ab" * 32))
+
+        path = self.cache.put("ab" * 32, b"audio")
+
+        self.assertEqual(self.cache.get("ab" * 32), path)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b"audio")
+
+    def test_writer_failure_leaves_no_entry(self):
+        """기록 중 실패하면 캐시 항목이나 임시 파일이 남지 않는지 테스트"""
+        with self.assertRaises(RuntimeError):
+            with self.cache.open_writer("cd" * 32) as f:
+                f.write(b"partial")
+                raise RuntimeError("connection lost")
+
+        self.assertIsNone(self.cache.get("cd" * 32))
+        self.assertEqual(os.listdir(os.path.join(self.temp_dir.name, "cd")), [])
+
+    def test_evicts_least_recently_used(self):
+        """상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제하는지 테스트"""
+        old_key, recent_key, new_key = "01" * 32, "02" * 32, "03" * 32
+        self.cache.put(old_key, b"x" * 400)
+        self.cache.put(recent_key, b"x" * 400)
+        past = time.time() - 100
+        os.utime(self.cache.path_for(old_key), (past, past))
+        os.utime(self.cache.path_for(recent_key), (past + 1, past + 1))
+
+        # recent_key를 사용하여 LRU 순서 갱신
+        self.cache.get(recent_key)
+        self.cache.put(new_key, b"x" * 400)
+
+        self.assertIsNone(self.cache.get(old_key))
+        self.assertIsNotNone(self.cache.get(recent_key))
+        self.assertIsNotNone(self.cache.get(new_key))
+
+    def test_writes_under_limit_do_not_scan_directory(self):
+        """누적 크기가 상한 아래이면 기록할 때마다 디렉토리를 훑지 않는지 테스트"""
+        cache = AudioCache(self.temp_dir.name, max_bytes=1024 * 1024)
+        cache.put("01" * 32, b"x" * 400)
+
+        with patch('app.core.audio_cache.os.walk', wraps=os.walk) as walk:
+            for index in range(2, 12):
+                cache.put(f"{index:02d}" * 32, b"x" * 400)
+            # 같은 키를 덮어쓰면 이전 크기를 빼고 누적
+            cache.put("02" * 32, b"x" * 100)
+        walk.assert_not_called()
+        self.assertEqual(cache._total_bytes, 10 * 400 + 100)
+
+        cache.max_bytes = 2000
+        cache.put("12" * 32, b"x" * 400)
+        self.assertLessEqual(cache._total_bytes, 2000 * 0.9)
+        self.assertEqual(cache._total_bytes, sum(size for _, size, _ in cache._scan()[0]))
+
+def mp3_frame(version_bits=0b11, bitrate_index=9, sample_rate_index=0, mono=False, length=417, tag=b''):
+    """테스트용 MPEG 레이어 3 프레임 (헤더 + tag가 들어간 0 채움)을 만듭니다."""
+    header = (
+        0xFFE00000 | version_bits << 19 | 0b01 << 17 | 1 << 16
+        | bitrate_index << 12 | sample_rate_index << 10 | (0b11 if mono else 0b00) << 6
+    )
+    body = tag.ljust(length - 4, b'\x00')
+    return struct.pack('>I', header) + body
+
+def id3v2_tag(body):
+    """테스트용 ID3v2 태그를 만듭니다."""
+    size = len(body)
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b'ID3\x03\x00\x00' + syncsafe + body
+
+class TestAudioMetadata(unittest.TestCase):
+    """MP3 재생 시간 계산 테스트 클래스"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, data, name="voice.mp3"):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_cbr_frames_scanned_after_id3v2(self):
+        """ID3v2 태그를 건너뛰고 모든 프레임을 세며 ID3v1 태그에서 멈추는지 테스트"""
+        tag = id3v2_tag(b'\xff\xfb\x90\x00' * 64)
+        path = self.write(tag + mp3_frame() * 100 + b'TAG' + b'\x00' * 125)
+
+        self.assertEqual(mp3_duration_us(path), 100 * 1152 * 1_000_000 // 44100)
+
+    def test_xing_and_vbri_frame_counts(self):
+        """Xing/VBRI 헤더가 있으면 프레임 수를 헤더에서 읽는지 테스트"""
+        xing = mp3_frame(tag=b'\x00' * 32 + b'Xing' + struct.pack('>II', 1, 1000))
+        vbri = mp3_frame(tag=b'\x00' * 32 + b'VBRI' + struct.pack('>HHHII', 1, 0, 75, 0, 500))
+
+        self.assertEqual(mp3_duration_us(self.write(xing + mp3_frame() * 3)), 1000 * 1152 * 1_000_000 // 44100)
+        self.assertEqual(mp3_duration_us(self.write(vbri + mp3_frame() * 3)), 500 * 1152 * 1_000_000 // 44100)
+
+    def test_mpeg2_mono_frames(self):
+        """MPEG-2 모노 프레임(576샘플, 22050Hz)을 계산하는지 테스트"""
+        frame = mp3_frame(version_bits=0b10, bitrate_index=8, mono=True, length=208)
+        path = self.write(frame * 50)
+
+        self.assertEqual(mp3_duration_us(path), 50 * 576 * 1_000_000 // 22050)
+
+    @patch('app.core.audio_metadata.ffmpeg.probe', return_value={'format': {'duration': '3.5'}})
+    def test_unknown_format_falls_back_to_ffprobe(self, mock_probe):
+        """MP3가 아닌 파일은 ffprobe로 조회하는지 테스트"""
+        wav = self.write(b'RIFF' + b'\x00' * 40 + mp3_frame() * 4, "voice.wav")
+        empty = self.write(b'', "empty.mp3")
+
+        self.assertIsNone(mp3_duration_us(wav))
+        self.assertEqual(get_audio_duration_us(wav), 3_500_000)
+        self.assertEqual(get_audio_duration_us(empty), 3_500_000)
+        self.assertEqual(mock_probe.call_count, 2)
+
+        mock_probe.reset_mock()
+        get_audio_duration_us(self.write(mp3_frame() * 10))
+        mock_probe.assert_not_called()
+
+class TestElevenLabsClientCache(unittest.TestCase):
+    """ElevenLabsClient 캐시 사용 테스트 클래스"""
+
+    def setUp(self):
+        """테스트를 위한 기본 설정"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.client = ElevenLabsClient()
+        self.client.cache = AudioCache(os.path.join(self.temp_dir.name, "cache"), max_bytes=1024 * 1024)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def _fake_generate(*chunks):
+        """stream 인자에 따라 청크 이터레이터 또는 전체 바이트를 반환하는 가짜 generate"""
+        def generate(**kwargs):
+            if kwargs.get('stream'):
+                return iter(chunks)
+            return b"".join(chunks)
+        return generate
+
+    @patch('app.core.elevenlabs_client.generate')
+    def test_identical_request_skips_api(self, mock_generate):
+        """같은 요청은 API를 다시 호출하지 않는지 테스트"""
+        mock_generate.side_effect = self._fake_generate(b"mp3-", b"bytes")
+        first = os.path.join(self.temp_dir.name, "first.mp3")
+        second = os.path.join(self.temp_dir.name, "second.mp3")
+
+        self.client.generate_audio("테스트 스크립트입니다.", first)
+        self.client.generate_audio("테스트 스크립트입니다.", second)
+
+        mock_generate.assert_called_once()
+        with open(second, 'rb') as f:
+            self.assertEqual(f.read(), b"mp3-bytes")
+
+    @patch('app.core.elevenlabs_client.generate')
+    def test_streaming_writes_chunks_to_cache(self, mock_generate):
+        """스트리밍 모드에서 청크가 캐시에 기록되는지 테스트"""
+        mock_generate.side_effect = self._fake_generate(b"a" * 10, b"b" * 10)
+        output_path = os.path.join(self.temp_dir.name, "voice.mp3")
+
+        self.client.generate_audio("스트리밍 테스트", output_path, stream=True)
+
+        self.assertTrue(mock_generate.call_args.kwargs['stream'])
+        with open(output_path, 'rb') as f:
+            self.assertEqual(f.read(), b"a" * 10 + b"b" * 10)
+
+    @patch('app.core.elevenlabs_client.generate')
+    def test_streaming_failure_leaves_no_cache_entry(self, mock_generate):
+        """스트리밍 도중 실패하면 불완전한 오디오가 캐시에 남지 않는지 테스트"""
+        def broken_stream(**kwargs):
+            yield b"partial"
+            raise ConnectionError("connection reset")
+
+        mock_generate.side_effect = broken_stream
+
+        with self.assertRaises(Exception):
+            self.client.generate_audio("실패 테스트", os.path.join(self.temp_dir.name, "voice.mp3"), stream=True)
+
+        self.assertIsNone(self.client.cache.get(self.client._cache_key("실패 테스트")))
+
+    @patch('app.core.elevenlabs_client.generate')
+    def test_astream_audio_yields_chunks(self, mock_generate):
+        """비동기 이터레이터가 모든 청크를 순서대로 반환하는지 테스트"""
+        chunks = [bytes([i]) * 100 for i in range(50)]
+        mock_generate.side_effect = self._fake_generate(*chunks)
+
+        async def collect():
+            return [chunk async for chunk in self.client.astream_audio("비동기 테스트")]
+
+        self.assertEqual(asyncio.run(collect()), chunks)
+        self.assertIsNotNone(self.client.cache.get(self.client._cache_key("비동기 테스트")))
+
+    @patch.object(ElevenLabsClient, 'generate_audio')
+    def test_generate_voice_does_not_block_event_loop(self, mock_generate_audio):
+        """블로킹 합성이 이벤트 루프 밖에서 실행되어 여러 음성 작업이 겹치는지 테스트"""
+        mock_generate_audio.side_effect = lambda *args, **kwargs: time.sleep(0.2)
+
+        async def synthesize_two():
+            started_at = time.perf_counter()
+            await asyncio.gather(self.client.generate_voice("첫 번째"), self.client.generate_voice("두 번째"))
+            return time.perf_counter() - started_at
+
+        self.assertLess(asyncio.run(synthesize_two()), 0.35)
+        self.assertEqual(mock_generate_audio.call_count, 2)
+
+class TestChunkedSynthesis(unittest.TestCase):
+    """문장 단위 병렬 합성 테스트 클래스"""
+
+    SCRIPT = "첫 번째 문장입니다. 두 번째 문장이에요!\n세 번째 문장은 조금 더 깁니다?"
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.client = ElevenLabsClient()
+        self.client.cache = AudioCache(os.path.join(self.temp_dir.name, "cache"), max_bytes=1024 * 1024)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.failing = set()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def fake_generate(self, text, **kwargs):
+        """문장 길이만큼의 MP3 프레임을 0.2초 뒤에 반환하는 가짜 generate"""
+        with self.lock:
+            self.calls.append(text)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(0.2)
+            if text in self.failing:
+                raise ConnectionError("connection reset")
+            frames = mp3_frame() * len(text)
+            return iter([frames]) if kwargs.get('stream') else frames
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    @patch('app.core.elevenlabs_client.concat_audio')
+    @patch('app.core.elevenlabs_client.generate')
+    def test_sentences_synthesized_concurrently_and_joined_in_order(self, mock_generate, mock_concat):
+        """문장들을 동시에 합성하고 순서대로 이어 붙이며 문장별 길이를 반환하는지 테스트"""
+        mock_generate.side_effect = self.fake_generate
+        output_path = os.path.join(self.temp_dir.name, "voice.mp3")
+
+        durations = self.client.generate_audio_chunked(self.SCRIPT, output_path)
+
+        sentences = ["첫 번째 문장입니다.", "두 번째 문장이에요!", "세 번째 문장은 조금 더 깁니다?"]
+        self.assertEqual(sorted(self.calls), sorted(sentences))
+        self.assertGreater(self.max_active, 1)
+        paths, target = mock_concat.call_args.args
+        self.assertEqual(paths, [self.client.cache.get(self.client._cache_key(sentence)) for sentence in sentences])
+        self.assertEqual(target, output_path)
+        self.assertEqual(durations, [len(sentence) * 1152 * 1_000_000 // 44100 for sentence in sentences])
+
+    @patch('app.core.elevenlabs_client.concat_audio')
+    @patch('app.core.elevenlabs_client.generate')
+    def test_retry_synthesizes_only_failed_sentence(self, mock_generate, mock_concat):
+        """한 문장이 실패하면 다시 시도할 때 그 문장만 합성하는지 테스트"""
+        mock_generate.side_effect = self.fake_generate
+        self.failing.add("두 번째 문장이에요!")
+        output_path = os.path.join(self.temp_dir.name, "voice.mp3")
+
+        with self.assertRaises(Exception):
+            self.client.generate_audio(self.SCRIPT, output_path, chunked=True)
+        mock_concat.assert_not_called()
+
+        self.failing.clear()
+        self.calls.clear()
+        self.client.generate_audio(self.SCRIPT, output_path, chunked=True)
+
+        self.assertEqual(self.calls, ["두 번째 문장이에요!"])
+        mock_concat.assert_called_once()
+
+    @patch('app.core.elevenlabs_client.concat_audio')
+    @patch('app.core.elevenlabs_client.generate')
+    def test_edited_script_resynthesizes_only_changed_sentence(self, mock_generate, mock_concat):
+        """스크립트의 한 문장을 고치면 그 문장만 다시 합성하고 주제 조각으로 다시 조립하는지 테스트"""
+        mock_generate.side_effect = self.fake_generate
+        topic_dir = os.path.join(self.temp_dir.name, "topic")
+        output_path = os.path.join(topic_dir, "voice.mp3")
+        # 기본 설정(TTS_CHUNKED=false)에서도 segment_dir를 주면 문장 조각을 사용
+        self.client.chunked = False
+        self.client.generate_audio(self.SCRIPT, output_path, segment_dir=topic_dir)
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(len(os.listdir(os.path.join(topic_dir, "segments"))), 3)
+
+        # 공유 캐시가 비워져도 주제 조각은 남아 있음
+        self.client.cache = AudioCache(os.path.join(self.temp_dir.name, "other_cache"), max_bytes=1024 * 1024)
+        self.calls.clear()
+        edited = self.SCRIPT.replace("두 번째 문장이에요!", "두 번째 문장을 고쳤어요!")
+        durations = self.client.generate_audio_chunked(edited, output_path, segment_dir=topic_dir)
+
+        sentences = ["첫 번째 문장입니다.", "두 번째 문장을 고쳤어요!", "세 번째 문장은 조금 더 깁니다?"]
+        self.assertEqual(self.calls, ["두 번째 문장을 고쳤어요!"])
+        store = VoiceSegmentStore(topic_dir)
+        keys = [self.client._cache_key(sentence) for sentence in sentences]
+        paths, target = mock_concat.call_args.args
+        self.assertEqual(paths, [store.path_for(key) for key in keys])
+        self.assertEqual(target, output_path)
+        self.assertEqual(durations, [len(sentence) * 1152 * 1_000_000 // 44100 for sentence in sentences])
+        self.assertEqual(list(store.load()), keys)
+        # 빠진 문장의 조각은 삭제됨
+        self.assertEqual(sorted(os.listdir(store.segments_dir)), sorted(f"{key}.mp3" for key in keys))
+
+    @patch('app.core.elevenlabs_client.concat_audio')
+    @patch('app.core.elevenlabs_client.generate')
+    def test_failed_resynthesis_keeps_previous_segments(self, mock_generate, mock_concat):
+        """다시 합성이 실패하면 이전 매니페스트와 조각이 그대로 남는지 테스트"""
+        mock_generate.side_effect = self.fake_generate
+        topic_dir = os.path.join(self.temp_dir.name, "topic")
+        output_path = os.path.join(topic_dir, "voice.mp3")
+        self.client.generate_audio_chunked(self.SCRIPT, output_path, segment_dir=topic_dir)
+        store = VoiceSegmentStore(topic_dir)
+        before = store.load()
+
+        self.failing.add("새 문장입니다.")
+        with self.assertRaises(Exception):
+            self.client.generate_audio_chunked(self.SCRIPT + " 새 문장입니다.", output_path, segment_dir=topic_dir)
+
+        self.assertEqual(store.load(), before)
+
+    def test_corrupt_manifest_is_ignored(self):
+        """손상된 매니페스트는 빈 저장소로 취급하는지 테스트"""
+        store = VoiceSegmentStore(self.temp_dir.name)
+        with open(store.manifest_path, 'w', encoding='utf-8') as f:
+            f.write("{not json")
+
+        self.assertEqual(store.load(), {})
+
+    @unittest.skipUnless(shutil.which('ffmpeg'), "ffmpeg가 필요합니다")
+    def test_concat_stream_copies_segments(self):
+        """ffmpeg concat 디먹서로 다시 인코딩 없이 조각을 이어 붙이는지 테스트"""
+        segments = []
+        for index, count in enumerate((20, 35, 10)):
+            path = os.path.join(self.temp_dir.name, f"it's segment {index}.mp3")
+            with open(path, 'wb') as f:
+                f.write(mp3_frame() * count)
+            segments.append(path)
+        output_path = os.path.join(self.temp_dir.name, "out", "voice.mp3")
+
+        concat_audio(segments, output_path)
+
+        self.assertEqual(mp3_duration_us(output_path), 65 * 1152 * 1_000_000 // 44100)
+        self.assertEqual(os.listdir(os.path.dirname(output_path)), ["voice.mp3"])
+
+if __name__ == '__main__':
+    unittest.main()
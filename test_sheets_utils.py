@@ -0,0 +1,351 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from app.utils.sheets_utils import SheetsUtils, TopicData
+from app.utils.sheets_write_buffer import SheetsFlushError, SheetsWriteBuffer, column_letter
+from app.utils.sheets_reader import SheetRowReader
+from app.utils import google_clients
+from app.utils.google_clients import get_authorized_http, get_credentials, get_google_service
+import json
+import re
+import threading
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from googleapiclient.errors import HttpError
+from googleapiclient import discovery
+
+HEADERS = ['Topic', 'Data', 'Script', 'Voice', 'Video', 'Video Link', 'Status']
+
+def make_sheets_utils(service, row_count=None):
+    """API 호출 없이 주어진 서비스 객체로 SheetsUtils를 생성합니다."""
+    properties = {'title': "Sheet1"}
+    if row_count is not None:
+        properties['gridProperties'] = {'rowCount': row_count}
+    with patch.object(SheetsUtils, '_initialize_service', return_value=service), \
+         patch.object(SheetsUtils, '_get_spreadsheet_id', return_value="spreadsheet-id"), \
+         patch.object(SheetsUtils, '_get_sheet_properties', return_value=properties):
+        return SheetsUtils()
+
+def make_paged_service(rows):
+    """A1 범위 요청에 맞춰 주어진 행을 잘라 반환하는 가짜 서비스 객체를 만듭니다."""
+    service = MagicMock()
+    requested = []
+
+    def get(spreadsheetId, range):
+        start, end = map(int, re.findall(r'(\d+)', range.split('!')[1]))
+        requested.append((start, end))
+        window = rows[start - 1:end]
+        # 실제 API처럼 뒤쪽의 빈 행은 잘라냄
+        while window and not window[-1]:
+            window = window[:-1]
+        request = MagicMock()
+        request.execute.return_value = {'values': window} if window else {}
+        return request
+
+    service.spreadsheets.return_value.values.return_value.get.side_effect = get
+    return service, requested
+
+class TestSheetsWriteBuffer(unittest.TestCase):
+    """SheetsWriteBuffer 테스트 클래스"""
+
+    def setUp(self):
+        """테스트를 위한 기본 설정"""
+        self.service = MagicMock()
+        self.batch_update = self.service.spreadsheets.return_value.values.return_value.batchUpdate
+        self.flushed = []
+        self.buffer = SheetsWriteBuffer(
+            self.service,
+            "spreadsheet-id",
+            "Sheet1",
+            on_flush=self.flushed.append
+        )
+
+    def _sent_data(self, call_index=0):
+        """batchUpdate 호출에 전달된 ValueRange 목록을 반환합니다."""
+        return self.batch_update.call_args_list[call_index].kwargs['body']['data']
+
+    def test_column_letter(self):
+        """열 인덱스 변환 테스트"""
+        self.assertEqual(column_letter(0), "A")
+        self.assertEqual(column_letter(6), "G")
+        self.assertEqual(column_letter(25), "Z")
+        self.assertEqual(column_letter(27), "AB")
+
+    def test_flush_coalesces_adjacent_cells(self):
+        """같은 행의 연속된 셀이 하나의 범위로 합쳐지는지 테스트"""
+        # Data(B), Script(C), Status(G) 열 변경
+        self.buffer.set_cells(2, {1: '✅', 2: "스크립트", 6: "Script generated"})
+        self.buffer.set_cells(3, {3: '', 6: "Voice generation pending"})
+
+        written = self.buffer.flush()
+
+        self.assertEqual(written, 5)
+        self.batch_update.assert_called_once()
+        self.assertEqual(self._sent_data(), [
+            {'range': 'Sheet1!B2:C2', 'values': [['✅', "스크립트"]]},
+            {'range': 'Sheet1!G2', 'values': [["Script generated"]]},
+            {'range': 'Sheet1!D3', 'values': [['']]},
+            {'range': 'Sheet1!G3', 'values': [["Voice generation pending"]]},
+        ])
+        self.assertEqual(self.buffer.pending_count, 0)
+        self.assertEqual(self.flushed[0][(2, 2)], "스크립트")
+
+    def test_flush_last_write_wins(self):
+        """같은 셀을 여러 번 변경하면 마지막 값만 기록되는지 테스트"""
+        self.buffer.set_cell(2, 6, "Voice generation pending")
+        self.buffer.set_cell(2, 6, "Voice generated")
+
+        self.buffer.flush()
+
+        self.assertEqual(self._sent_data(), [
+            {'range': 'Sheet1!G2', 'values': [["Voice generated"]]}
+        ])
+
+    def test_flush_splits_by_max_ranges(self):
+        """범위 수가 상한을 넘으면 여러 요청으로 나뉘는지 테스트"""
+        self.buffer.max_ranges = 2
+        for row in range(2, 7):
+            self.buffer.set_cell(row, 3, '✅')
+
+        written = self.buffer.flush()
+
+        self.assertEqual(written, 5)
+        self.assertEqual(self.batch_update.call_count, 3)
+        self.assertEqual(len(self._sent_data(2)), 1)
+
+    def test_flush_without_changes(self):
+        """변경이 없으면 API를 호출하지 않는지 테스트"""
+        self.assertEqual(self.buffer.flush(), 0)
+        self.batch_update.assert_not_called()
+
+    def test_flush_error_keeps_pending(self):
+        """기록 실패 시 변경이 버퍼에 남는지 테스트"""
+        self.batch_update.return_value.execute.side_effect = HttpError(MagicMock(), b"API Error")
+        self.buffer.set_cell(2, 3, '✅')
+
+        with self.assertRaises(ValueError) as context:
+            self.buffer.flush()
+
+        self.assertIn("Failed to flush sheet updates", str(context.exception))
+        self.assertEqual(self.buffer.pending_count, 1)
+        self.assertEqual(self.flushed, [])
+
+    def test_transport_error_keeps_unwritten_rows(self):
+        """연결 오류나 시간 초과에도 기록하지 못한 변경이 남고 행 번호가 보고되는지 테스트"""
+        self.buffer.max_ranges = 1
+        self.batch_update.return_value.execute.side_effect = [{}, TimeoutError("timed out")]
+        self.buffer.set_cell(2, 3, '✅')
+        self.buffer.set_cell(3, 3, '✅')
+
+        with self.assertRaises(SheetsFlushError) as context:
+            self.buffer.flush()
+
+        self.assertEqual(context.exception.rows, [3])
+        self.assertEqual(self.buffer.pending_count, 1)
+        self.assertEqual(self.flushed, [{(2, 3): '✅'}])
+
+class TestSheetSnapshot(unittest.TestCase):
+    """SheetsUtils 스냅샷 조회 테스트 클래스"""
+
+    def setUp(self):
+        """테스트를 위한 기본 설정"""
+        self.service = MagicMock()
+        self.values_api = self.service.spreadsheets.return_value.values.return_value
+        self.values_api.get.return_value.execute.return_value = {
+            'values': [
+                HEADERS,
+                ["주제 1", '✅', "스크립트 1", '✅'],
+                ["주제 2", '✅'],
+                ["주제 3", '❌'],
+            ]
+        }
+        self.sheets_utils = make_sheets_utils(self.service, row_count=4)
+
+    def test_pending_topics_read_once(self):
+        """여러 번 조회해도 시트를 한 번만 읽는지 테스트"""
+        first = self.sheets_utils.get_pending_topics()
+        second = self.sheets_utils.get_pending_topics()
+
+        self.assertEqual([topic.row for topic in first], [3, 4])
+        self.assertEqual(first, second)
+        self.values_api.get.assert_called_once()
+
+    def test_snapshot_reflects_flushed_writes(self):
+        """기록된 변경이 다시 읽지 않고 스냅샷에 반영되는지 테스트"""
+        # 음성 상태가 이미 ✅인 행은 대기 목록에 없음
+        pending_rows = [topic.row for topic in self.sheets_utils.get_pending_topics()]
+        self.assertNotIn(2, pending_rows)
+
+        # 음성 상태 초기화
+        topic_data = TopicData(
+            row=2,
+            topic="주제 1",
+            script="스크립트 1",
+            voice='✅',
+            video="",
+            video_link="",
+            data_status='✅',
+            status="",
+            column_indices={col: HEADERS.index(col) for col in HEADERS}
+        )
+        with self.sheets_utils.batch():
+            self.sheets_utils.reset_voice_status(topic_data)
+
+        pending = {topic.row: topic for topic in self.sheets_utils.get_pending_topics()}
+        self.assertIn(2, pending)
+        self.assertEqual(pending[2].status, "Voice generation pending")
+        self.values_api.get.assert_called_once()
+        self.values_api.batchUpdate.assert_called_once()
+
+    def test_append_row_uses_snapshot_headers(self):
+        """행 추가 시 헤더를 다시 읽지 않고 스냅샷에 새 행을 반영하는지 테스트"""
+        self.values_api.append.return_value.execute.return_value = {
+            'updates': {'updatedRange': 'Sheet1!A5:G5'}
+        }
+
+        self.sheets_utils.append_row("새로운 주제")
+
+        self.values_api.get.assert_called_once()
+        self.assertEqual(self.sheets_utils.snapshot.get_row(5)[:2], ["새로운 주제", '✅'])
+        self.assertIn(5, [topic.row for topic in self.sheets_utils.get_pending_topics()])
+
+class TestSheetRowReader(unittest.TestCase):
+    """SheetRowReader 테스트 클래스"""
+
+    def test_reads_in_windows_and_stops_after_last_row(self):
+        """고정 크기 창으로 읽고 마지막 데이터 행을 지나면 멈추는지 테스트"""
+        rows = [HEADERS] + [[f"주제 {i}"] for i in range(2, 26)] + [[]] * 1000
+        service, requested = make_paged_service(rows)
+        reader = SheetRowReader(service, "spreadsheet-id", "Sheet1", page_size=10)
+
+        result = list(reader.iter_rows())
+
+        self.assertEqual(len(result), 25)
+        self.assertEqual(result[-1], (25, ["주제 25"]))
+        self.assertEqual(requested, [(1, 10), (11, 20), (21, 30), (31, 40)])
+
+    def test_keeps_empty_rows_between_data(self):
+        """중간의 빈 행이 행 번호를 어긋나게 하지 않는지 테스트"""
+        rows = [HEADERS, ["주제 2"], [], ["주제 4"]]
+        service, _ = make_paged_service(rows)
+        reader = SheetRowReader(service, "spreadsheet-id", "Sheet1", page_size=2)
+
+        result = dict(reader.iter_rows())
+
+        self.assertEqual(result[4], ["주제 4"])
+        self.assertEqual(result[3], [])
+
+    def test_blank_row_at_window_boundary_does_not_end_reading(self):
+        """창의 마지막 행이 비어 잘려 와도 다음 창을 계속 읽는지 테스트"""
+        rows = [HEADERS, ["주제 2"], [], ["주제 4"]]
+        for row_count in (None, 1000):
+            service, _ = make_paged_service(rows)
+            reader = SheetRowReader(service, "spreadsheet-id", "Sheet1", page_size=3, row_count=row_count)
+
+            result = dict(reader.iter_rows())
+
+            self.assertEqual(result[2], ["주제 2"])
+            self.assertEqual(result[4], ["주제 4"])
+
+    def test_large_grid_stops_after_last_data_row(self):
+        """그리드가 커도 데이터가 끝난 뒤 빈 창 하나만 더 읽고 멈추는지 테스트"""
+        rows = [HEADERS] + [[f"주제 {i}"] for i in range(2, 6)] + [[]] * 1995
+        service, requested = make_paged_service(rows)
+        reader = SheetRowReader(service, "spreadsheet-id", "Sheet1", page_size=10, row_count=2000)
+
+        self.assertEqual(len(list(reader.iter_rows())), 5)
+        self.assertEqual(requested, [(1, 10), (11, 20)])
+
+    def test_respects_grid_row_count(self):
+        """그리드 행 수를 넘는 범위를 요청하지 않는지 테스트"""
+        rows = [HEADERS] + [[f"주제 {i}"] for i in range(2, 13)]
+        service, requested = make_paged_service(rows)
+        reader = SheetRowReader(service, "spreadsheet-id", "Sheet1", page_size=5, row_count=12)
+
+        self.assertEqual(len(list(reader.iter_rows())), 12)
+        self.assertEqual(requested, [(1, 5), (6, 10), (11, 12)])
+
+    def test_iter_topics_streams_lazily(self):
+        """스냅샷 없이 주제를 지연 스트리밍하는지 테스트"""
+        rows = [HEADERS] + [[f"주제 {i}", '✅'] for i in range(2, 102)]
+        service, requested = make_paged_service(rows)
+        sheets_utils = make_sheets_utils(service)
+        sheets_utils.row_reader.page_size = 10
+
+        topics = sheets_utils.iter_topics()
+        first = next(topics)
+
+        self.assertEqual(first.topic, "주제 2")
+        self.assertEqual(requested, [(1, 10)])
+        self.assertIsNone(sheets_utils._snapshot)
+
+def make_service_account_json():
+    """테스트용 서비스 계정 JSON 문자열을 만듭니다."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode('utf-8')
+    return json.dumps({
+        'type': 'service_account',
+        'project_id': 'test-project',
+        'private_key_id': 'key-id',
+        'private_key': pem,
+        'client_email': 'shorts@test-project.iam.gserviceaccount.com',
+        'client_id': '1',
+        'token_uri': 'https://oauth2.googleapis.com/token'
+    })
+
+class TestGoogleClients(unittest.TestCase):
+    """공유 Google API 클라이언트 팩토리 테스트 클래스"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.credentials_json = make_service_account_json()
+
+    def setUp(self):
+        for cached in (google_clients._load_credentials, get_credentials, get_authorized_http, get_google_service):
+            cached.cache_clear()
+
+    def test_credentials_parsed_once_and_services_shared(self):
+        """자격 증명은 한 번만 파싱하고, 같은 서비스와 HTTP 전송 계층을 재사용하는지 테스트"""
+        scopes = ('https://www.googleapis.com/auth/spreadsheets',)
+        with patch.object(google_clients.json, 'loads', wraps=json.loads) as loads, \
+                patch.object(discovery, 'build', wraps=discovery.build) as build:
+            sheets = get_google_service('sheets', 'v4', scopes, self.credentials_json)
+            self.assertIs(get_google_service('sheets', 'v4', scopes, self.credentials_json), sheets)
+            youtube = get_google_service(
+                'youtube', 'v3', ('https://www.googleapis.com/auth/youtube.upload',), self.credentials_json
+            )
+
+        parsed = [call for call in loads.call_args_list if call.args and call.args[0] == self.credentials_json]
+        self.assertEqual(len(parsed), 1)
+        self.assertEqual(build.call_count, 2)
+        self.assertTrue(all(call.kwargs['static_discovery'] for call in build.call_args_list))
+        self.assertIs(sheets._http, get_authorized_http(scopes, self.credentials_json))
+        self.assertEqual(youtube._http.credentials.scopes, ['https://www.googleapis.com/auth/youtube.upload'])
+
+    def test_http_is_per_thread_with_shared_credentials(self):
+        """HTTP 연결은 스레드마다 따로, 자격 증명(토큰)은 모든 스레드가 공유하는지 테스트"""
+        http = get_authorized_http(('https://www.googleapis.com/auth/spreadsheets',), self.credentials_json)
+        first = http._thread_http()
+        self.assertIs(http._thread_http(), first)
+
+        others = []
+        thread = threading.Thread(target=lambda: others.append(http._thread_http()))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(others[0], first)
+        self.assertIs(others[0].credentials, first.credentials)
+        self.assertNotIn(308, first.http.redirect_codes)
+
+    def test_invalid_credentials(self):
+        """자격 증명이 없거나 JSON이 아니면 ValueError가 발생하는지 테스트"""
+        with self.assertRaises(ValueError):
+            get_google_service('sheets', 'v4', ('scope',), '')
+        with self.assertRaises(ValueError):
+            get_google_service('sheets', 'v4', ('scope',), '{not json')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,364 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+from PIL import Image
+from app.core.backgrounds import render_gradient
+from app.core.captions import (
+    CaptionCue, CaptionStyle, cues_from_script, format_ass, format_srt, resolve_caption_font,
+    subtitles_filter_available
+)
+from app.core.encoding_profiles import ENCODING_PROFILES, get_profile
+from app.core.render_farm import RenderCancelledError, RenderFarm, RenderTimeoutError
+from app.core.video_assets import BACKGROUND_PALETTES, VideoAssetCache, get_font, job_scratch_dir
+from app.core.video_generator import VideoGenerator
+from app.utils.text_utils import split_sentences
+
+class TestBackgrounds(unittest.TestCase):
+    """그라데이션 배경 렌더링 테스트 클래스"""
+
+    def test_vertical_matches_row_interpolation(self):
+        """세로 그라데이션이 기존 행 단위 보간과 같은 값을 내는지 테스트"""
+        color1, color2 = (10, 200, 30), (250, 20, 130)
+        width, height = 64, 1920
+
+        pixels = np.asarray(render_gradient(width, height, [color1, color2]))
+
+        self.assertEqual(pixels.shape, (height, width, 3))
+        for y in (0, 1, 777, height - 1):
+            expected = [
+                int(color1[c] * (1 - y/height) + color2[c] * (y/height))
+                for c in range(3)
+            ]
+            self.assertEqual(pixels[y, 0].tolist(), expected)
+            self.assertEqual(pixels[y, -1].tolist(), expected)
+
+    def test_multi_stop_passes_through_middle_color(self):
+        """세 번째 정지점 색상이 중간 위치에 나타나는지 테스트"""
+        pixels = np.asarray(render_gradient(4, 300, [(0, 0, 0), (255, 255, 255), (0, 0, 0)]))
+
+        self.assertEqual(pixels[0, 0].tolist(), [0, 0, 0])
+        self.assertEqual(pixels[150, 0].tolist(), [255, 255, 255])
+
+    def test_diagonal_and_radial_styles(self):
+        """대각선·원형 그라데이션의 크기와 방향 테스트"""
+        black, white = (0, 0, 0), (255, 255, 255)
+
+        diagonal = np.asarray(render_gradient(108, 192, [black, white], style='diagonal'))
+        radial = np.asarray(render_gradient(108, 192, [black, white], style='radial'))
+
+        self.assertEqual(diagonal.shape, (192, 108, 3))
+        self.assertLess(diagonal[0, 0, 0], diagonal[-1, -1, 0])
+        self.assertLess(radial[96, 54, 0], radial[0, 0, 0])
+
+    def test_invalid_arguments(self):
+        """잘못된 스타일이나 색상 수에 대한 에러 테스트"""
+        with self.assertRaises(ValueError):
+            render_gradient(10, 10, [(0, 0, 0)])
+        with self.assertRaises(ValueError):
+            render_gradient(10, 10, [(0, 0, 0), (1, 1, 1)], style='spiral')
+
+class TestVideoAssetCache(unittest.TestCase):
+    """VideoAssetCache 테스트 클래스"""
+
+    def setUp(self):
+        """테스트를 위한 기본 설정"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.assets = VideoAssetCache(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_background_rendered_once_per_palette(self):
+        """같은 (크기, 색상, 스타일)의 배경은 한 번만 렌더링되는지 테스트"""
+        palette = BACKGROUND_PALETTES[0]
+
+        first = self.assets.background_path(108, 192, palette)
+        second = self.assets.background_path(108, 192, [list(color) for color in palette])
+        other = self.assets.background_path(108, 192, BACKGROUND_PALETTES[1])
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        with Image.open(first) as image:
+            self.assertEqual(image.size, (108, 192))
+
+    def test_overlay_memoized_by_title(self):
+        """같은 제목의 오버레이는 다시 렌더링하지 않는지 테스트"""
+        render = MagicMock(return_value=Image.new('RGBA', (10, 10)))
+
+        first = self.assets.overlay_path("제목", 10, 10, "Arial", 60, render)
+        second = self.assets.overlay_path("제목", 10, 10, "Arial", 60, render)
+        self.assets.overlay_path("다른 제목", 10, 10, "Arial", 60, render)
+
+        self.assertEqual(first, second)
+        self.assertEqual(render.call_count, 2)
+
+    def test_least_recently_used_assets_are_evicted(self):
+        """자산 수가 상한을 넘으면 가장 오래 사용하지 않은 파일과 메모리 항목을 삭제하는지 테스트"""
+        assets = VideoAssetCache(self.temp_dir.name, max_entries=2)
+        render = MagicMock(return_value=Image.new('RGBA', (10, 10)))
+
+        first = assets.overlay_path("첫 번째", 10, 10, "Arial", 60, render)
+        second = assets.overlay_path("두 번째", 10, 10, "Arial", 60, render)
+        assets.overlay_path("첫 번째", 10, 10, "Arial", 60, render)
+        third = assets.overlay_path("세 번째", 10, 10, "Arial", 60, render)
+
+        self.assertTrue(os.path.exists(first))
+        self.assertFalse(os.path.exists(second))
+        self.assertTrue(os.path.exists(third))
+        self.assertEqual(len(assets._paths), 2)
+        self.assertEqual(len(assets._locks), 2)
+
+        # 다시 시작한 프로세스도 남은 파일을 상한에 포함
+        restarted = VideoAssetCache(self.temp_dir.name, max_entries=1)
+        self.assertEqual(list(restarted._paths.values()), [third])
+        self.assertFalse(os.path.exists(first))
+
+    def test_job_scratch_dir_is_isolated_and_removed(self):
+        """작업별 임시 디렉토리가 서로 다르고 종료 시 삭제되는지 테스트"""
+        with job_scratch_dir() as first, job_scratch_dir() as second:
+            self.assertNotEqual(first, second)
+            open(os.path.join(first, "background.png"), 'wb').close()
+
+        self.assertFalse(os.path.exists(first))
+        self.assertFalse(os.path.exists(second))
+
+    def test_font_loaded_once(self):
+        """같은 폰트는 프로세스 안에서 한 번만 로드되는지 테스트"""
+        self.assertIs(get_font("Arial", 60), get_font("Arial", 60))
+class TestEncodingProfiles(unittest.TestCase):
+    """인코딩 프로필 테스트 클래스"""
+
+    def setUp(self):
+        self.generator = VideoGenerator()
+
+    def compile(self, profile_name):
+        stream = self.generator._build_stream(
+            'background.png', 'text.png', 'voice.mp3', 12.5, 'output.mp4', get_profile(profile_name)
+        )
+        return stream.compile()
+
+    def test_still_image_graph_has_no_redundant_filters(self):
+        """정지 이미지 경로에 scale/fps 필터가 없고 stillimage 튜닝이 적용되는지 테스트"""
+        args = self.compile('publish')
+        graph = args[args.index('-filter_complex') + 1]
+
+        self.assertNotIn('scale', graph)
+        self.assertNotIn('fps=', graph)
+        self.assertIn('loop=', graph)
+        self.assertNotIn('-loop', args)
+        self.assertEqual(args[args.index('-framerate') + 1], str(self.generator.fps))
+        self.assertEqual(args[args.index('-tune') + 1], 'stillimage')
+        self.assertNotIn('-b:v', args)
+
+    def test_profiles_differ_in_preset_and_keyframe_interval(self):
+        """프로필마다 프리셋, CRF, 키프레임 간격이 적용되는지 테스트"""
+        fps = self.generator.fps
+        for name, profile in ENCODING_PROFILES.items():
+            args = self.compile(name)
+            self.assertEqual(args[args.index('-preset') + 1], profile.preset)
+            self.assertEqual(args[args.index('-crf') + 1], str(profile.crf))
+            self.assertEqual(args[args.index('-g') + 1], str(round(fps * profile.gop_seconds)))
+
+        self.assertIn('-maxrate', self.compile('publish'))
+        self.assertNotIn('-maxrate', self.compile('draft'))
+
+    def test_single_pass_muxes_voice_with_fades_timed_to_audio(self):
+        """음성을 입력으로 받아 한 번의 인코딩으로 다중화하고 페이드가 음성 길이에 맞춰지는지 테스트"""
+        args = self.compile('publish')
+        graph = args[args.index('-filter_complex') + 1]
+        inputs = [args[index + 1] for index, arg in enumerate(args) if arg == '-i']
+
+        self.assertEqual(inputs, ['background.png', 'text.png', 'voice.mp3'])
+        self.assertEqual(args.count('-map'), 2)
+        self.assertIn('2:a', args)
+        self.assertIn('-shortest', args)
+        self.assertEqual(args[args.index('-movflags') + 1], 'faststart')
+        self.assertEqual(args[args.index('-acodec') + 1], 'aac')
+        self.assertIn('fade=alpha=1:duration=0.5:start_time=0:type=in', graph)
+        self.assertIn('fade=alpha=1:duration=0.5:start_time=12.0:type=out', graph)
+
+    def test_unknown_profile(self):
+        """알 수 없는 프로필 이름에 대한 예외 테스트"""
+        with self.assertRaises(ValueError):
+            get_profile('lossless')
+
+class TestCaptions(unittest.TestCase):
+    """스크립트 자막 테스트 클래스"""
+
+    SCRIPT = "오늘은 우주에 대해 알아봅시다. 별은 얼마나 뜨거울까요?\n정답은 약 6000도입니다!"
+
+    def test_split_sentences(self):
+        """문장 부호와 줄바꿈에서 문장을 나누고 소수점은 나누지 않는지 테스트"""
+        self.assertEqual(
+            split_sentences(self.SCRIPT),
+            ["오늘은 우주에 대해 알아봅시다.", "별은 얼마나 뜨거울까요?", "정답은 약 6000도입니다!"]
+        )
+        self.assertEqual(split_sentences("온도는 3.5도입니다.  \n\n"), ["온도는 3.5도입니다."])
+
+    def test_script_timings_cover_audio_in_order(self):
+        """자막 조각이 빈틈없이 음성 길이 전체를 덮고 최대 글자 수를 지키는지 테스트"""
+        cues = cues_from_script(self.SCRIPT, 9_000_000, max_chars=10)
+
+        self.assertEqual(cues[0].start_us, 0)
+        self.assertEqual(cues[-1].end_us, 9_000_000)
+        for previous, cue in zip(cues, cues[1:]):
+            self.assertEqual(previous.end_us, cue.start_us)
+        self.assertTrue(all(len(cue.text) <= 10 for cue in cues))
+        self.assertEqual(' '.join(cue.text for cue in cues), self.SCRIPT.replace('\n', ' '))
+
+    def test_ass_and_srt_output(self):
+        """ASS/SRT 시각 형식과 ASS 재정의 태그 이스케이프를 테스트"""
+        cues = [CaptionCue(0, 1_234_567, "첫 {자막}"), CaptionCue(1_234_567, 3_723_000_000, "둘째")]
+
+        ass = format_ass(cues, CaptionStyle(font="Noto Sans CJK KR", font_size=72, width=1080, height=1920))
+        srt = format_srt(cues)
+
+        self.assertIn("PlayResY: 1920", ass)
+        self.assertIn("Style: Default,Noto Sans CJK KR,72,", ass)
+        self.assertIn("Dialogue: 0,0:00:00.00,0:00:01.23,Default,,0,0,0,,첫 \\{자막\\}", ass)
+        self.assertIn("Dialogue: 0,0:00:01.23,1:02:03.00,Default", ass)
+        self.assertTrue(srt.startswith("1\n00:00:00,000 --> 00:00:01,234\n첫 {자막}\n\n2\n"))
+
+    def test_captions_burned_in_during_encode(self):
+        """자막이 같은 필터 그래프의 subtitles 필터로 들어가고 폰트 이름이 그대로 쓰이는지 테스트"""
+        generator = VideoGenerator()
+        self.assertFalse(generator.captions_enabled)
+        self.assertEqual(generator._caption_cues({'script': '한 문장.'}, 5.0), [])
+
+        generator.captions_enabled = True
+        generator.caption_fonts_dir = '/fonts'
+        args = generator._build_stream(
+            'background.png', 'text.png', 'voice.mp3', 5.0, 'output.mp4', get_profile('draft'), '/tmp/captions.ass'
+        ).compile()
+
+        self.assertIn('subtitles=/tmp/captions.ass:fontsdir=/fonts', args[args.index('-filter_complex') + 1])
+        self.assertEqual(resolve_caption_font("Noto Sans CJK KR"), ("Noto Sans CJK KR", None))
+        self.assertEqual(generator._caption_cues({'title': '제목'}, 5.0), [])
+        self.assertEqual(generator._caption_cues({'script': '한 문장.'}, 5.0), [CaptionCue(0, 5_000_000, '한 문장.')])
+
+    def test_caption_timings_follow_sentence_durations(self):
+        """문장 단위 합성의 문장별 재생 시간이 있으면 그 경계에 맞춰 자막을 나누는지 테스트"""
+        generator = VideoGenerator()
+        generator.captions_enabled = True
+        content_data = {'script': "짧아요. 이 문장은 훨씬 더 깁니다.", 'sentence_durations': [3_000_000, 1_000_000]}
+
+        cues = generator._caption_cues(content_data, 4.0)
+
+        self.assertEqual(cues[0], CaptionCue(0, 3_000_000, "짧아요."))
+        self.assertEqual((cues[1].start_us, cues[-1].end_us), (3_000_000, 4_000_000))
+        # 문장 수가 맞지 않으면 글자 수 비율로 추정
+        content_data['sentence_durations'] = [4_000_000]
+        self.assertNotEqual(generator._caption_cues(content_data, 4.0)[0].end_us, 3_000_000)
+
+    def test_captions_off_without_subtitles_filter(self):
+        """ffmpeg에 subtitles 필터가 없거나 실행할 수 없으면 자막을 끄는지 테스트"""
+        with_libass = MagicMock(stdout=" ... subtitles         V->V       Render text subtitles onto input video.\n")
+        without_libass = MagicMock(stdout=" ... scale             V->V       Scale the input video size.\n")
+        self.addCleanup(subtitles_filter_available.cache_clear)
+
+        with patch('app.core.captions.subprocess.run', side_effect=[with_libass, without_libass, OSError("missing")]):
+            self.assertTrue(subtitles_filter_available('ffmpeg-with-libass'))
+            self.assertFalse(subtitles_filter_available('ffmpeg-without-libass'))
+            self.assertFalse(subtitles_filter_available('ffmpeg-missing'))
+            self.assertTrue(subtitles_filter_available('ffmpeg-with-libass'))
+
+def python_command(code):
+    """ffmpeg 대신 실행할 파이썬 명령어"""
+    return [sys.executable, '-c', code]
+
+class TestRenderFarm(unittest.TestCase):
+    """렌더링 팜 테스트 클래스"""
+
+    def test_run_success_and_failure(self):
+        """정상 종료와 실패한 명령어의 결과를 테스트"""
+        async def scenario():
+            farm = RenderFarm(workers=2, max_queue=4)
+            try:
+                await farm.run(python_command('pass'))
+                with self.assertRaises(Exception) as context:
+                    await farm.run(python_command('import sys; sys.stderr.write("boom"); sys.exit(3)'))
+                self.assertIn("code 3", str(context.exception))
+                self.assertIn("boom", str(context.exception))
+            finally:
+                await farm.shutdown()
+
+        asyncio.run(scenario())
+
+    def test_timeout_kills_process(self):
+        """제한 시간을 넘긴 작업이 종료되는지 테스트"""
+        async def scenario():
+            farm = RenderFarm(workers=1)
+            try:
+                started = time.monotonic()
+                with self.assertRaises(RenderTimeoutError):
+                    await farm.run(python_command('import time; time.sleep(30)'), timeout=0.5)
+                self.assertLess(time.monotonic() - started, 10)
+                self.assertEqual(farm.stats['running'], 0)
+            finally:
+                await farm.shutdown()
+
+        asyncio.run(scenario())
+
+    def test_cancel_running_and_queued_jobs(self):
+        """실행 중인 작업과 대기 중인 작업을 취소할 수 있는지 테스트"""
+        async def scenario():
+            farm = RenderFarm(workers=1, max_queue=4)
+            try:
+                running = await farm.submit(python_command('import time; time.sleep(30)'))
+                queued = await farm.submit(python_command('pass'))
+                await asyncio.sleep(0.2)
+
+                self.assertTrue(farm.cancel(queued))
+                self.assertTrue(farm.cancel(running))
+                with self.assertRaises(RenderCancelledError):
+                    await farm.wait(running)
+                self.assertFalse(farm.cancel(running))
+            finally:
+                await farm.shutdown()
+
+        asyncio.run(scenario())
+
+    def test_cancelling_waiter_cancels_job(self):
+        """기다리던 코루틴이 취소되면 작업도 취소되는지 테스트"""
+        async def scenario():
+            farm = RenderFarm(workers=1)
+            try:
+                task = asyncio.create_task(farm.run(python_command('import time; time.sleep(30)')))
+                await asyncio.sleep(0.5)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                await asyncio.wait_for(farm._queue.join(), timeout=10)
+                self.assertEqual(farm.stats, {'workers': 1, 'queued': 0, 'running': 0})
+            finally:
+                await farm.shutdown()
+
+        asyncio.run(scenario())
+
+    def test_full_queue_applies_back_pressure(self):
+        """대기열이 가득 차면 submit이 자리가 날 때까지 기다리는지 테스트"""
+        async def scenario():
+            farm = RenderFarm(workers=1, max_queue=1)
+            try:
+                first = await farm.submit(python_command('import time; time.sleep(30)'))
+                await asyncio.sleep(0.2)
+                await farm.submit(python_command('pass'))
+
+                blocked = asyncio.create_task(farm.submit(python_command('pass')))
+                await asyncio.sleep(0.2)
+                self.assertFalse(blocked.done())
+
+                farm.cancel(first)
+                await asyncio.wait_for(blocked, timeout=10)
+            finally:
+                await farm.shutdown()
+
+        asyncio.run(scenario())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,399 @@
+import asyncio
+import json
+from email.parser import Parser
+import os
+import re
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+from urllib.parse import urlparse
+import httplib2
+from googleapiclient.discovery import build
+from app.config import get_settings
+from app.core.upload_scheduler import UploadScheduler, UploadTask, parse_publish_window
+from app.core.youtube_client import YouTubeClient
+from app.core.youtube_quota import QUOTA_COSTS, QuotaExceededError, QuotaLedger
+from app.core.youtube_upload import CHUNK_GRANULARITY, UploadSessionStore, normalize_chunk_size
+
+class LocalUploadServer:
+    """YouTube 재개 가능한 업로드 프로토콜을 흉내 내는 로컬 가짜 업로드 서버 (httplib2.Http 대용)
+
+    faults에 넣은 값은 청크 PUT 요청마다 하나씩 꺼내 적용됩니다.
+    정수이면 그 상태 코드로 응답하고, 예외이면 연결 오류처럼 그 예외를 던집니다.
+    """
+
+    def __init__(self, faults=(), quota_exceeded=False):
+        self.faults = list(faults)
+        self.quota_exceeded = quota_exceeded
+        self.sessions = {}
+        self.chunk_offsets = []
+        self.initiated = 0
+        self.playlist_items = []
+        self.batches = []
+
+    def _response(self, status, content=b'', **headers):
+        return httplib2.Response({'status': status, **headers}), content
+
+    def _committed(self, session):
+        received = len(session['data'])
+        headers = {'range': f"bytes=0-{received - 1}"} if received else {}
+        return self._response(308, **headers)
+
+    def _batch(self, body, content_type):
+        """multipart/mixed 배치 요청의 각 playlistItems.insert 호출에 응답합니다."""
+        message = Parser().parsestr(f"Content-Type: {content_type}\r\n\r\n{body}")
+        boundary = 'batch_response'
+        parts = []
+        for part in message.get_payload():
+            payload = part.get_payload()
+            request_body = re.split(r'\r?\n\r?\n', payload, maxsplit=1)[1]
+            self.playlist_items.append(json.loads(request_body))
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{part['Content-ID'].strip('<>')}>\r\n\r\n"
+                f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n{{}}\r\n"
+            )
+        self.batches.append(len(parts))
+        content = ''.join(parts) + f"--{boundary}--"
+        return self._response(200, content.encode('utf-8'), **{'content-type': f"multipart/mixed; boundary={boundary}"})
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        path = urlparse(uri).path
+        if method == 'POST' and path == '/batch':
+            return self._batch(body, headers['content-type'])
+        if method == 'POST' and path.endswith('/upload/youtube/v3/videos') and self.quota_exceeded:
+            return self._response(403, json.dumps({'error': {
+                'code': 403, 'message': 'quota', 'errors': [{'reason': 'quotaExceeded'}]
+            }}).encode('utf-8'))
+        if method == 'POST' and path.endswith('/upload/youtube/v3/videos'):
+            self.initiated += 1
+            session_id = f"session-{self.initiated}"
+            self.sessions[session_id] = {'data': b'', 'size': int(headers['x-upload-content-length'])}
+            return self._response(200, location=f"https://upload.local/upload/{session_id}")
+        if method == 'POST' and path.endswith('/playlistItems'):
+            self.playlist_items.append(json.loads(body))
+            return self._response(200, b'{}')
+        if method == 'PUT' and path.startswith('/upload/'):
+            session = self.sessions.get(path[len('/upload/'):])
+            if session is None:
+                return self._response(404, b'{"error": {"message": "session expired"}}')
+            content_range = headers.get('content-range', '')
+            if content_range.startswith('bytes */'):
+                return self._committed(session)
+
+            start = int(re.match(r'bytes (\d+)-', content_range).group(1))
+            if self.faults:
+                fault = self.faults.pop(0)
+                if isinstance(fault, Exception):
+                    raise fault
+                return self._response(fault, b'{"error": {"message": "server error"}}')
+            if start != len(session['data']):
+                return self._committed(session)
+            self.chunk_offsets.append(start)
+            session['data'] += body.read() if hasattr(body, 'read') else body
+            if len(session['data']) >= session['size']:
+                return self._response(200, json.dumps({'id': f"video-{path[len('/upload/'):]}"}).encode('utf-8'))
+            return self._committed(session)
+        return self._response(404, b'{}')
+
+class TestYouTubeUpload(unittest.TestCase):
+    """YouTube 청크 업로드 테스트 클래스"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.session_dir = os.path.join(self.temp_dir.name, 'uploads')
+        self.video_file = os.path.join(self.temp_dir.name, 'video.mp4')
+        self.content = os.urandom(CHUNK_GRANULARITY * 4 + 1000)
+        with open(self.video_file, 'wb') as f:
+            f.write(self.content)
+
+        self.sleeps = []
+        settings = get_settings()
+        for name, value in (
+            ('youtube_upload_chunk_size', CHUNK_GRANULARITY),
+            ('youtube_upload_session_dir', self.session_dir),
+            ('youtube_playlist_id', ''),
+        ):
+            patcher = patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def make_client(self, server, quota=None):
+        """가짜 서버로 요청을 보내는 YouTubeClient를 만듭니다."""
+        youtube = build('youtube', 'v3', http=server, static_discovery=True)
+        quota = quota or QuotaLedger(os.path.join(self.temp_dir.name, 'quota.sqlite3'), 10000)
+        self.addCleanup(quota.close)
+        client = YouTubeClient(youtube=youtube, quota=quota)
+        client.uploader.sleep = self.sleeps.append
+        return client
+
+    def upload(self, client, progress=None):
+        return asyncio.run(client.upload_video(self.video_file, title="꿀의 비밀", progress=progress))
+
+    def session_files(self):
+        return os.listdir(self.session_dir) if os.path.isdir(self.session_dir) else []
+
+    def test_chunked_upload_reports_progress(self):
+        """파일을 청크 단위로 올리며 진행 상황을 알리는지 테스트"""
+        server = LocalUploadServer()
+        progress = []
+
+        url = self.upload(self.make_client(server), lambda sent, total: progress.append((sent, total)))
+
+        self.assertEqual(url, "https://youtube.com/watch?v=video-session-1")
+        self.assertEqual(server.sessions['session-1']['data'], self.content)
+        self.assertEqual(server.chunk_offsets, [CHUNK_GRANULARITY * index for index in range(5)])
+        self.assertEqual(progress[-1], (len(self.content), len(self.content)))
+        self.assertEqual([sent for sent, _ in progress], sorted(sent for sent, _ in progress))
+        self.assertEqual(len(progress), 5)
+        self.assertEqual(self.session_files(), [])
+
+    def test_retries_server_errors_and_dropped_connections(self):
+        """5xx/429 응답과 끊긴 연결을 백오프 후 받은 범위부터 재시도하는지 테스트"""
+        server = LocalUploadServer(faults=[503, ConnectionResetError("reset"), 429])
+
+        self.upload(self.make_client(server))
+
+        self.assertEqual(server.sessions['session-1']['data'], self.content)
+        self.assertEqual(server.initiated, 1)
+        self.assertEqual(server.chunk_offsets.count(0), 1)
+        self.assertEqual(len(self.sleeps), 3)
+        self.assertLess(self.sleeps[0], self.sleeps[2])
+
+    def test_non_retryable_error_and_retry_limit(self):
+        """재시도할 수 없는 응답과 재시도 횟수 초과는 실패로 끝나는지 테스트"""
+        with self.assertRaises(Exception) as context:
+            self.upload(self.make_client(LocalUploadServer(faults=[403])))
+        self.assertIn("Failed to upload video to YouTube", str(context.exception))
+
+        client = self.make_client(LocalUploadServer(faults=[503] * 20))
+        client.uploader.max_retries = 2
+        with self.assertRaises(Exception):
+            self.upload(client)
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_resume_after_crash_from_saved_session(self):
+        """프로세스가 죽어도 저장된 세션 URI로 이어서 올리는지 테스트"""
+        server = LocalUploadServer()
+        crashing = self.make_client(server)
+        sent = []
+
+        def crash_after_two_chunks(done, total):
+            sent.append(done)
+            if len(sent) == 2:
+                raise RuntimeError("process crashed")
+
+        with self.assertRaises(Exception):
+            self.upload(crashing, crash_after_two_chunks)
+        self.assertEqual(len(self.session_files()), 1)
+
+        self.upload(self.make_client(server))
+
+        self.assertEqual(server.initiated, 1)
+        self.assertEqual(server.chunk_offsets, [CHUNK_GRANULARITY * index for index in range(5)])
+        self.assertEqual(server.sessions['session-1']['data'], self.content)
+        self.assertEqual(self.session_files(), [])
+
+    def test_resume_queries_progress_and_retries_status_query(self):
+        """재개할 때 받은 범위를 직접 조회하고, 조회가 일시적으로 실패하면 다시 조회하는지 테스트"""
+        server = LocalUploadServer()
+
+        def crash(done, total):
+            raise RuntimeError("process crashed")
+
+        with self.assertRaises(Exception):
+            self.upload(self.make_client(server), crash)
+        original_request = server.request
+        queries = []
+
+        def flaky_status_query(uri, method='GET', body=None, headers=None, **kwargs):
+            if method == 'PUT' and (headers or {}).get('Content-Range', '').startswith('bytes */'):
+                queries.append(headers['Content-Range'])
+                if len(queries) == 1:
+                    return server._response(503, b'{}')
+            return original_request(uri, method, body, headers, **kwargs)
+
+        server.request = flaky_status_query
+        self.upload(self.make_client(server))
+
+        self.assertEqual(queries, [f"bytes */{len(self.content)}"] * 2)
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertEqual(server.initiated, 1)
+        self.assertEqual(server.chunk_offsets, [CHUNK_GRANULARITY * index for index in range(5)])
+        self.assertEqual(server.sessions['session-1']['data'], self.content)
+
+    def test_expired_session_restarts_upload(self):
+        """저장된 세션이 만료되었으면 처음부터 새 세션으로 올리는지 테스트"""
+        server = LocalUploadServer()
+        client = self.make_client(server)
+        body_key = UploadSessionStore.make_key(self.video_file, {
+            'snippet': {
+                'title': "꿀의 비밀",
+                'description': 'Generated using AI Shorts Generator',
+                'tags': [],
+                'categoryId': '22'
+            },
+            'status': {'privacyStatus': 'public', 'selfDeclaredMadeForKids': False}
+        })
+        client.uploader.sessions.save(body_key, "https://upload.local/upload/session-gone")
+
+        self.upload(client)
+
+        self.assertEqual(server.initiated, 1)
+        self.assertEqual(server.sessions['session-1']['data'], self.content)
+        # 처음부터 다시 올린 업로드는 새 videos.insert 호출이므로 할당량을 차감
+        self.assertEqual(client.quota.remaining(), 10000 - QUOTA_COSTS['videos.insert'])
+
+    def test_chunk_size_is_rounded_to_granularity(self):
+        """청크 크기를 256KiB 배수로 맞추는지 테스트"""
+        self.assertEqual(normalize_chunk_size(1000), CHUNK_GRANULARITY)
+        self.assertEqual(normalize_chunk_size(CHUNK_GRANULARITY * 3 + 10), CHUNK_GRANULARITY * 3)
+
+# 2024-06-03 08:00 PDT
+START_TIME = 1717426800.0
+
+class TestQuotaLedger(unittest.TestCase):
+    """YouTube 할당량 장부 테스트 클래스"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.now = START_TIME
+        self.ledger = QuotaLedger(os.path.join(self.temp_dir.name, 'quota.sqlite3'), 5000, clock=lambda: self.now)
+        self.addCleanup(self.ledger.close)
+
+    def test_reserve_refund_and_limit(self):
+        """비용을 먼저 차감하고, 한도를 넘는 호출은 거부하는지 테스트"""
+        self.ledger.reserve('videos.insert', 3)
+        self.ledger.reserve('playlistItems.insert', 2)
+        self.assertEqual(self.ledger.remaining(), 5000 - 4800 - 100)
+
+        with self.assertRaises(QuotaExceededError):
+            self.ledger.reserve('videos.insert')
+        self.ledger.refund('playlistItems.insert')
+        self.assertEqual(self.ledger.usage(), {'videos.insert': 4800, 'playlistItems.insert': 50})
+
+    def test_day_rolls_over_at_pacific_midnight(self):
+        """할당량이 태평양 시간 자정에 초기화되는지 테스트"""
+        self.ledger.exhaust()
+        self.assertEqual(self.ledger.remaining(), 0)
+        self.assertEqual(self.ledger.today(), '2024-06-03')
+        self.assertEqual(self.ledger.seconds_until_reset(), 16 * 3600)
+
+        self.now += 16 * 3600
+        self.assertEqual(self.ledger.today(), '2024-06-04')
+        self.assertEqual(self.ledger.remaining(), 5000)
+
+class TestUploadScheduler(unittest.TestCase):
+    """할당량과 게시 시간대를 지키는 업로드 스케줄러 테스트 클래스"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.now = START_TIME
+        self.sleeps = []
+        self.video_file = os.path.join(self.temp_dir.name, 'video.mp4')
+        with open(self.video_file, 'wb') as f:
+            f.write(os.urandom(1000))
+
+        settings = get_settings()
+        for name, value in (
+            ('youtube_upload_session_dir', os.path.join(self.temp_dir.name, 'uploads')),
+            ('youtube_playlist_id', 'PL123'),
+        ):
+            patcher = patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.ledger = QuotaLedger(os.path.join(self.temp_dir.name, 'quota.sqlite3'), 10000, clock=lambda: self.now)
+        self.addCleanup(self.ledger.close)
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def make_scheduler(self, server, batch_size=4):
+        youtube = build('youtube', 'v3', http=server, static_discovery=True)
+        client = YouTubeClient(youtube=youtube, quota=self.ledger)
+        return UploadScheduler(
+            client, self.ledger, window=(9, 21), timezone='America/Los_Angeles',
+            playlist_batch_size=batch_size, clock=lambda: self.now, sleep=self.sleep
+        )
+
+    def tasks(self, count):
+        return [UploadTask(self.video_file, title=f"영상 {index}") for index in range(count)]
+
+    def test_drains_backlog_within_quota_and_window(self):
+        """시간대가 열리길 기다렸다가 할당량이 허락하는 만큼만 나누어 올리는지 테스트"""
+        server = LocalUploadServer()
+
+        results = asyncio.run(self.make_scheduler(server).run(self.tasks(8)))
+
+        # 10000 단위로는 영상 6개(1600 + 플레이리스트 50)까지만 올릴 수 있음
+        self.assertEqual(sum(isinstance(result, str) for result in results), 6)
+        self.assertTrue(all(isinstance(result, QuotaExceededError) for result in results[6:]))
+        self.assertEqual(server.initiated, 6)
+        self.assertEqual(self.ledger.usage(), {'videos.insert': 9600, 'playlistItems.insert': 300})
+
+        # 09:00까지 1시간 대기 후 12시간 시간대를 업로드 가능한 6개로 나눔
+        self.assertEqual(self.sleeps[0], 3600)
+        self.assertEqual(self.sleeps[1:], [12 * 3600 / 6] * 5)
+
+        # 플레이리스트 추가는 4개, 2개씩 배치로 전송
+        self.assertEqual(server.batches, [4, 2])
+        self.assertEqual(
+            [item['snippet']['resourceId']['videoId'] for item in server.playlist_items],
+            [f"video-session-{index}" for index in range(1, 7)]
+        )
+
+    def test_small_backlog_is_spread_across_window(self):
+        """대기 목록이 적으면 남은 시간대에 고르게 나누는지 테스트"""
+        self.now = START_TIME + 3 * 3600  # 11:00 PDT
+        server = LocalUploadServer()
+
+        results = asyncio.run(self.make_scheduler(server).run(self.tasks(3)))
+
+        self.assertTrue(all(isinstance(result, str) for result in results))
+        self.assertEqual(self.sleeps, [10 * 3600 / 3] * 2)
+
+    def test_stops_when_api_reports_quota_exceeded(self):
+        """API가 quotaExceeded를 반환하면 장부를 소진 처리하고 멈추는지 테스트"""
+        self.now = START_TIME + 3600
+        server = LocalUploadServer(quota_exceeded=True)
+
+        results = asyncio.run(self.make_scheduler(server).run(self.tasks(3)))
+
+        self.assertNotIsInstance(results[0], str)
+        self.assertTrue(all(isinstance(result, QuotaExceededError) for result in results[1:]))
+        self.assertEqual(server.initiated, 0)
+        self.assertEqual(self.ledger.remaining(), 0)
+
+    def test_report_surfaces_playlist_failures_and_deferred_videos(self):
+        """플레이리스트 추가 실패와 할당량 부족으로 미룬 영상이 결과 보고에 드러나는지 테스트"""
+        self.now = START_TIME + 3600
+        self.ledger.reserve('videos.insert', 4)  # 남은 할당량 3600: 영상 2개까지
+        server = LocalUploadServer()
+        scheduler = self.make_scheduler(server)
+        scheduler.client.add_to_playlist = AsyncMock(return_value={'video-session-2': "playlistNotFound"})
+        tasks = self.tasks(3)
+
+        results = asyncio.run(scheduler.run(tasks))
+        report = scheduler.report(tasks, results)
+
+        self.assertEqual([upload['status'] for upload in report], ['uploaded', 'uploaded', 'deferred'])
+        self.assertEqual(report[0]['video_url'], "https://youtube.com/watch?v=video-session-1")
+        self.assertIsNone(report[0]['playlist_error'])
+        self.assertEqual(report[1]['playlist_error'], "playlistNotFound")
+        self.assertIn("quota exhausted", report[2]['error'])
+
+    def test_parse_publish_window(self):
+        """게시 시간대 설정값을 해석하는지 테스트"""
+        self.assertEqual(parse_publish_window('09-21'), (9, 21))
+        self.assertEqual(parse_publish_window('22-02'), (22, 2))
+        with self.assertRaises(ValueError):
+            parse_publish_window('9pm')
+
+if __name__ == '__main__':
+    unittest.main()